@@ -0,0 +1,184 @@
+"""
+Atualização em segundo plano das consultas mais buscadas
+
+O agendador lê do VagasStore as consultas (keyword, localização) mais
+populares e as rebusca em intervalos escalonados, dentro de um orçamento de
+requisições, gravando o resultado de volta no store. A busca do app vira uma
+leitura local, e o dado servido nunca tem mais que `intervalo` segundos.
+
+Roda em uma thread do próprio app (`iniciar`) ou como worker separado:
+
+    python cli.py agendador --intervalo 900 --consultas 20
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+from http_client import TokenBucket
+from instrumentacao import get_logger
+
+logger = get_logger('agendador')
+
+INTERVALO_PADRAO = 15 * 60
+
+
+class AgendadorAtualizacao:
+    """
+    Mantém atualizadas as consultas mais buscadas
+
+    `requisicoes_por_minuto` limita só o agendador (cada consulta custa uma
+    requisição por página), deixando folga para as buscas ao vivo. As
+    atualizações são espaçadas ao longo do intervalo em vez de dispararem
+    todas juntas; a consulta há mais tempo sem atualizar vai primeiro.
+    Consultas com mais de `max_paginas` páginas ficam de fora: atualizá-las
+    com menos páginas rebaixaria o resultado salvo e a busca ao vivo teria
+    de buscá-las de novo.
+    """
+
+    def __init__(self, scraper, store, intervalo: float = INTERVALO_PADRAO, max_consultas: int = 20,
+                 requisicoes_por_minuto: float = 30.0, max_paginas: int = 5,
+                 janela_popularidade: Optional[float] = 7 * 24 * 3600, espera_maxima: float = 60.0,
+                 margem: float = 0.2):
+        self.scraper = scraper
+        self.store = store
+        self.intervalo = intervalo
+        self.max_consultas = max_consultas
+        self.max_paginas = max_paginas
+        self.janela_popularidade = janela_popularidade
+        self.espera_maxima = espera_maxima
+        # Atualiza com `margem` de antecedência para o resultado não vencer enquanto espera na fila
+        self.vencimento = intervalo * (1 - margem)
+        self.orcamento = TokenBucket(requisicoes_por_minuto / 60.0, capacidade=max_paginas)
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._avisou_orcamento = False
+        # Consultas que falharam ou vieram vazias só são tentadas de novo após um intervalo
+        self._falhas: Dict[tuple, float] = {}
+
+    def atualizar(self, keyword: str, localizacao: str = '', paginas: int = 1) -> Optional[int]:
+        """
+        Rebusca uma consulta nas fontes e grava o resultado no store
+
+        Resultados vazios ou parciais não são gravados, nem consultas com
+        mais páginas que `max_paginas`. Retorna quantas vagas foram
+        gravadas, ou None se nada foi gravado.
+        """
+        if paginas > self.max_paginas:
+            logger.debug("'%s' pede %d páginas (máximo %d); fica para a busca ao vivo", keyword, paginas,
+                         self.max_paginas, extra={'keyword': keyword, 'localizacao': localizacao, 'paginas': paginas})
+            return None
+        self.orcamento.adquirir(paginas)
+
+        with self.scraper.metricas.cronometro('atualizacao'):
+            vagas, erros = [], []
+            for bloco in self.scraper.iterar_vagas(keyword, localizacao, paginas, erros=erros):
+                vagas.extend(bloco)
+
+            # Resultado vazio ou parcial não substitui o anterior
+            if not vagas or erros:
+                self._falhas[(keyword, localizacao)] = time.time()
+                logger.info("Atualização de '%s' em '%s' %s; resultado anterior mantido", keyword, localizacao,
+                            'parcial' if erros else 'sem vagas',
+                            extra={'keyword': keyword, 'localizacao': localizacao, 'erros': erros})
+                return None
+
+            novas = self.store.salvar_resultado(keyword, localizacao, vagas, paginas)
+            self._falhas.pop((keyword, localizacao), None)
+
+        logger.info("Atualizada '%s' em '%s': %d vagas (%d novas)", keyword, localizacao, len(vagas), len(novas),
+                    extra={'keyword': keyword, 'localizacao': localizacao, 'vagas': len(vagas), 'novas': len(novas)})
+        return len(vagas)
+
+    def _populares(self) -> List[Dict]:
+        """Consultas mais buscadas que cabem no orçamento de páginas"""
+        populares = self.store.consultas_populares(self.max_consultas, self.janela_popularidade)
+        return [consulta for consulta in populares if consulta['paginas'] <= self.max_paginas]
+
+    def pendentes(self, populares: Optional[List[Dict]] = None) -> List[Dict]:
+        """Consultas populares cujo resultado venceu, as mais antigas primeiro"""
+        agora = time.time()
+        vencidas = [
+            consulta for consulta in (populares if populares is not None else self._populares())
+            if (consulta['atualizada_em'] is None or agora - consulta['atualizada_em'] >= self.vencimento)
+            and agora - self._falhas.get((consulta['keyword'], consulta['localizacao']), 0.0) >= self.vencimento
+        ]
+        return sorted(vencidas, key=lambda consulta: consulta['atualizada_em'] or 0.0)
+
+    def _espacamento(self, populares: List[Dict]) -> float:
+        """Tempo entre duas atualizações: espalha as consultas pelo intervalo"""
+        requisicoes = sum(consulta['paginas'] for consulta in populares)
+        if requisicoes / self.orcamento.taxa > self.vencimento and not self._avisou_orcamento:
+            self._avisou_orcamento = True
+            logger.warning("Orçamento de requisições não cobre %d consultas a cada %.0fs", len(populares), self.intervalo,
+                           extra={'consultas': len(populares), 'requisicoes': requisicoes, 'intervalo': self.intervalo})
+        return min(self.vencimento / max(1, len(populares)), self.espera_maxima)
+
+    def _proxima_espera(self, populares: List[Dict]) -> float:
+        """Segundos até a próxima consulta vencer (limitado para notar consultas novas)"""
+        agora = time.time()
+        vencimentos = [
+            max(c['atualizada_em'] or 0.0, self._falhas.get((c['keyword'], c['localizacao']), 0.0)) + self.vencimento - agora
+            for c in populares
+        ]
+        return max(0.0, min(vencimentos + [self.espera_maxima]))
+
+    def executar(self):
+        """Laço do agendador; roda até `parar()` (bloqueia a thread atual)"""
+        logger.info("Agendador iniciado: até %d consultas a cada %.0fs", self.max_consultas, self.intervalo,
+                    extra={'consultas': self.max_consultas, 'intervalo': self.intervalo})
+
+        while not self._parar.is_set():
+            populares = self._populares()
+            pendentes = self.pendentes(populares)
+            if not pendentes:
+                self._parar.wait(self._proxima_espera(populares))
+                continue
+
+            consulta = pendentes[0]
+            try:
+                self.atualizar(consulta['keyword'], consulta['localizacao'], consulta['paginas'])
+            except Exception as e:
+                self._falhas[(consulta['keyword'], consulta['localizacao'])] = time.time()
+                logger.warning("Falha ao atualizar '%s': %s", consulta['keyword'], e,
+                               extra={'keyword': consulta['keyword'], 'localizacao': consulta['localizacao']})
+
+            # Uma vencida de cada vez: após a primeira rodada, os vencimentos ficam escalonados
+            self._parar.wait(self._espacamento(populares))
+
+        logger.info("Agendador parado")
+
+    def iniciar(self) -> 'AgendadorAtualizacao':
+        """Roda o laço numa thread daemon (chamar de novo não cria outra)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._parar.clear()
+            self._thread = threading.Thread(target=self.executar, name='agendador-vagas', daemon=True)
+            self._thread.start()
+        return self
+
+    def parar(self, timeout: Optional[float] = None):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def criar_agendador(store, indice=None, arquivo=None, base_dedup=None, **opcoes) -> AgendadorAtualizacao:
+    """
+    Agendador com um scraper próprio (limitador e métricas separados das buscas ao vivo)
+
+    O cache do scraper do agendador não serve entradas sem revalidar: cada
+    atualização vai à rede (um 304 quando nada mudou) e grava a resposta
+    nova no cache compartilhado, que as buscas ao vivo também leem. Com
+    `indice`, as vagas atualizadas também entram no IndiceVagas; com
+    `arquivo`, as respostas novas vão para o ArquivoRespostas. A
+    deduplicação aproximada compara com as vagas do store (`base_dedup`,
+    criada a partir do store se não for informada).
+    """
+    from cache import RespostaCache
+    from dedup import DeduplicadorVagas
+    from scraper import VagasScraper
+
+    if base_dedup is None:
+        base_dedup = DeduplicadorVagas.from_store(store)
+    scraper = VagasScraper(cache=RespostaCache(ttl=0), deduplicacao_aproximada=True, indice=indice,
+                           arquivo=arquivo, base_dedup=base_dedup)
+    return AgendadorAtualizacao(scraper, store, **opcoes)
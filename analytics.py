@@ -0,0 +1,182 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class SkillAnalytics:
+    """
+    Agregados incrementais de skills: coocorrência, lift/PMI e tendências no tempo
+
+    Cada lote adicionado atualiza os contadores em O(tamanho do lote), sem
+    reprocessar o histórico. Vagas com 'chave' já vista substituem a versão
+    anterior: a contribuição antiga é descontada antes de somar a nova.
+    """
+
+    def __init__(self, freq: str = 'M'):
+        self.freq = freq
+        self.skills: List[str] = []
+        self._indice: Dict[str, int] = {}
+        self.total = 0
+        self.contagem = np.zeros(0, dtype=np.int64)
+        self.coocorrencia = np.zeros((0, 0), dtype=np.int64)
+        self.tendencias: Dict[str, np.ndarray] = {}
+        self.total_por_periodo: Dict[str, int] = {}
+        # chave → (posições das skills, período) da versão contada de cada vaga
+        self._por_chave: Dict[str, Tuple[Tuple[int, ...], str]] = {}
+
+    @classmethod
+    def from_analyzer(cls, analyzer, freq: str = 'M') -> 'SkillAnalytics':
+        """Cria os agregados a partir do DataFrame de um VagasAnalyzer"""
+        analytics = cls(freq)
+        df = analyzer.get_dataframe()
+        if not df.empty:
+            matriz, skills = analyzer._matriz_skills()
+            chaves = df['chave'].to_numpy() if 'chave' in df.columns else None
+            analytics._adicionar_matriz(matriz, list(skills), analytics._periodos(df), chaves)
+        return analytics
+
+    def adicionar(self, vagas) -> 'SkillAnalytics':
+        """Atualiza os agregados com um lote de vagas (lista de dicts ou DataFrame)"""
+        df = vagas if isinstance(vagas, pd.DataFrame) else pd.DataFrame(list(vagas))
+        if df.empty:
+            return self
+
+        chaves = None
+        if 'chave' in df.columns:
+            df = df.drop_duplicates('chave', keep='last')
+            chaves = df['chave'].to_numpy()
+            self._remover(chaves)
+
+        skills_lote = sorted({s for lista in df['skills'] for s in lista})
+        posicao = {skill: i for i, skill in enumerate(skills_lote)}
+        matriz = np.zeros((len(df), len(skills_lote)), dtype=np.uint8)
+        for linha, lista in enumerate(df['skills']):
+            for skill in lista:
+                matriz[linha, posicao[skill]] = 1
+
+        self._adicionar_matriz(matriz, skills_lote, self._periodos(df), chaves)
+        return self
+
+    def _remover(self, chaves: Sequence[str]):
+        """Desconta dos agregados a versão já contada das vagas com estas chaves"""
+        anteriores = [self._por_chave.pop(chave) for chave in chaves if chave in self._por_chave]
+        if not anteriores:
+            return
+
+        matriz = np.zeros((len(anteriores), len(self.skills)), dtype=np.uint8)
+        for linha, (colunas, _) in enumerate(anteriores):
+            matriz[linha, list(colunas)] = 1
+        periodos = np.array([periodo for _, periodo in anteriores], dtype=object)
+        self._adicionar_matriz(matriz, list(self.skills), periodos, sinal=-1)
+
+    def _periodos(self, df: pd.DataFrame) -> np.ndarray:
+        """Período (ex.: '2025-03') de cada vaga, pela data de publicação ou primeira coleta"""
+        if 'data_publicacao' in df.columns:
+            datas = pd.to_datetime(df['data_publicacao'], errors='coerce', utc=True)
+        elif 'primeira_vez' in df.columns:
+            datas = pd.to_datetime(df['primeira_vez'], unit='s', errors='coerce', utc=True)
+        else:
+            datas = pd.Series(pd.Timestamp(time.time(), unit='s', tz='UTC'), index=df.index)
+
+        datas = datas.fillna(pd.Timestamp(time.time(), unit='s', tz='UTC'))
+        return datas.dt.tz_localize(None).dt.to_period(self.freq).astype(str).to_numpy()
+
+    def _garantir_skills(self, skills: Sequence[str]) -> np.ndarray:
+        """Registra skills novas, aumentando os arrays, e retorna suas posições"""
+        novas = [s for s in skills if s not in self._indice]
+        if novas:
+            for skill in novas:
+                self._indice[skill] = len(self.skills)
+                self.skills.append(skill)
+            k = len(self.skills)
+            extra = k - len(self.contagem)
+            self.contagem = np.pad(self.contagem, (0, extra))
+            self.coocorrencia = np.pad(self.coocorrencia, ((0, extra), (0, extra)))
+            for periodo, valores in self.tendencias.items():
+                self.tendencias[periodo] = np.pad(valores, (0, extra))
+        return np.array([self._indice[s] for s in skills], dtype=np.intp)
+
+    def _adicionar_matriz(self, matriz: np.ndarray, skills: Sequence[str], periodos: np.ndarray,
+                          chaves: Optional[Sequence[str]] = None, sinal: int = 1):
+        """Soma (ou, com `sinal` -1, subtrai) um lote vaga × skill dos agregados"""
+        colunas = self._garantir_skills(skills)
+        lote = matriz.astype(np.int64)
+
+        self.total += sinal * len(lote)
+        self.contagem[colunas] += sinal * lote.sum(axis=0)
+        self.coocorrencia[np.ix_(colunas, colunas)] += sinal * (lote.T @ lote)
+
+        for periodo in np.unique(periodos):
+            mascara = periodos == periodo
+            if periodo not in self.tendencias:
+                self.tendencias[periodo] = np.zeros(len(self.skills), dtype=np.int64)
+                self.total_por_periodo[periodo] = 0
+            self.tendencias[periodo][colunas] += sinal * lote[mascara].sum(axis=0)
+            self.total_por_periodo[periodo] += sinal * int(mascara.sum())
+
+        if chaves is not None:
+            por_linha = [[] for _ in range(len(lote))]
+            linhas, posicoes = np.nonzero(lote)
+            for linha, coluna in zip(linhas.tolist(), colunas[posicoes].tolist()):
+                por_linha[linha].append(coluna)
+            for chave, posicoes_vaga, periodo in zip(chaves, por_linha, periodos):
+                self._por_chave[chave] = (tuple(posicoes_vaga), periodo)
+
+    def get_coocorrencia(self, top_n: Optional[int] = None) -> pd.DataFrame:
+        """Matriz de coocorrência entre as skills (opcionalmente só as top-N)"""
+        df = pd.DataFrame(self.coocorrencia, index=self.skills, columns=self.skills)
+        if top_n is not None:
+            top = pd.Series(self.contagem, index=self.skills).nlargest(top_n).index
+            df = df.loc[top, top]
+        return df
+
+    def get_lift(self) -> pd.DataFrame:
+        """Lift entre pares de skills: P(a, b) / (P(a) · P(b))"""
+        esperado = np.outer(self.contagem, self.contagem).astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lift = np.where(esperado > 0, self.coocorrencia * self.total / esperado, 0.0)
+        return pd.DataFrame(lift, index=self.skills, columns=self.skills)
+
+    def get_pmi(self) -> pd.DataFrame:
+        """PMI (log2 do lift) entre pares de skills; -inf quando nunca coocorrem"""
+        with np.errstate(divide='ignore'):
+            return np.log2(self.get_lift())
+
+    def get_skills_relacionadas(self, skill: str, top_n: int = 10, min_coocorrencias: int = 2) -> pd.DataFrame:
+        """Skills que mais aparecem junto com `skill`, ordenadas por lift"""
+        colunas = ['Skill', 'Coocorrencias', 'Lift', 'PMI']
+        if skill not in self._indice:
+            return pd.DataFrame(columns=colunas)
+
+        i = self._indice[skill]
+        juntas = self.coocorrencia[i]
+        esperado = self.contagem[i] * self.contagem.astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lift = np.where(esperado > 0, juntas * self.total / esperado, 0.0)
+
+        df = pd.DataFrame({'Skill': self.skills, 'Coocorrencias': juntas, 'Lift': lift})
+        df = df[(df.index != i) & (df['Coocorrencias'] >= min_coocorrencias)]
+        df = df.assign(PMI=np.log2(df['Lift']))
+        return df.sort_values(['Lift', 'Coocorrencias'], ascending=False).head(top_n).reset_index(drop=True)
+
+    def get_tendencia(self, skills: Optional[List[str]] = None, normalizar: bool = True) -> pd.DataFrame:
+        """
+        Demanda por skill em cada período
+
+        Com `normalizar`, os valores são a fração das vagas do período que
+        pedem a skill; caso contrário, a contagem absoluta.
+        """
+        if not self.tendencias:
+            return pd.DataFrame()
+
+        periodos = sorted(self.tendencias)
+        dados = np.vstack([self.tendencias[p] for p in periodos])
+        df = pd.DataFrame(dados, index=pd.Index(periodos, name='Periodo'), columns=self.skills)
+
+        if normalizar:
+            totais = np.array([self.total_por_periodo[p] for p in periodos], dtype=float)
+            df = df.div(totais, axis=0)
+        if skills is not None:
+            df = df[[s for s in skills if s in self._indice]]
+        return df
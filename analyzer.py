@@ -1,86 +1,333 @@
-import pandas as pd
-from typing import List, Dict
-from collections import Counter
+from __future__ import annotations
+
+from typing import List, Dict, Optional, Tuple, Union
+import exportar
+from importacao import importar_preguicoso
+from locais import normalizar_local
+from registro import CodificadorSkills, VagaRegistro, get_codificador
+
+# numpy/pandas só são carregados quando um analisador é usado
+np = importar_preguicoso('numpy')
+pd = importar_preguicoso('pandas')
+
+# Colunas com poucos valores distintos, guardadas como categóricas
+COLUNAS_CATEGORICAS = ['empresa', 'local', 'fonte']
 
 class VagasAnalyzer:
-    """Analisa dados das vagas coletadas"""
+    """
+    Analisa dados das vagas coletadas
+    
+    Aceita dicts de vaga ou VagaRegistro. Internamente as skills ficam numa
+    coluna `skills_mask` (bitmask sobre o vocabulário do CodificadorSkills) em
+    vez de listas de strings; `get_dataframe()` devolve a coluna `skills`
+    decodificada.
+    
+    Os agregados do dashboard ficam em cache até a próxima mudança nos
+    dados; `versao` é incrementada a cada mudança.
+    """
     
-    def __init__(self, vagas: List[Dict]):
+    def __init__(self, vagas: List[Union[Dict, VagaRegistro]], codificador: Optional[CodificadorSkills] = None):
         self.vagas = vagas
+        self.codificador = codificador or get_codificador()
         self.df = self._criar_dataframe()
+        self.versao = 0
+        self._skills: Optional[Tuple[np.ndarray, pd.Index]] = None
+        self._agregados: Optional[Dict] = None
+        self._titulos: Optional[pd.Series] = None
     
     def _criar_dataframe(self) -> pd.DataFrame:
         """Converte lista de vagas em DataFrame"""
         if not self.vagas:
             return pd.DataFrame()
         
-        df = pd.DataFrame(self.vagas)
+        return self._para_dataframe(self.vagas)
+    
+    def _para_dataframe(self, vagas: List[Union[Dict, VagaRegistro]]) -> pd.DataFrame:
+        """DataFrame compacto: skills como bitmask e colunas repetitivas categóricas"""
+        if isinstance(vagas[0], VagaRegistro):
+            df = pd.DataFrame({campo: [getattr(v, campo) for v in vagas] for campo in VagaRegistro.__slots__})
+        else:
+            df = pd.DataFrame(vagas)
+            posicao = df.columns.get_loc('skills') if 'skills' in df.columns else len(df.columns)
+            skills = df.pop('skills') if 'skills' in df.columns else [[]] * len(df)
+            df.insert(posicao, 'skills_mask', [self.codificador.codificar(s) for s in skills])
+        
+        if self.codificador.cabe_em_64_bits:
+            df['skills_mask'] = df['skills_mask'].astype(np.uint64)
+        for coluna in COLUNAS_CATEGORICAS:
+            if coluna in df.columns:
+                df[coluna] = df[coluna].astype('category')
         return df
     
+    @classmethod
+    def from_store(cls, store, **filtros) -> 'VagasAnalyzer':
+        """Cria um analisador a partir das vagas de um VagasStore"""
+        return cls(store.listar(**filtros))
+    
+    def adicionar(self, vagas: List[Dict]):
+        """
+        Adiciona vagas novas ou alteradas sem reconstruir o DataFrame inteiro
+        
+        Vagas com 'chave' já presente substituem a versão anterior. Apenas
+        o DataFrame é atualizado; `self.vagas` continua sendo a carga inicial.
+        """
+        if not vagas:
+            return
+        
+        novas = self._para_dataframe(vagas)
+        if not self.df.empty and 'chave' in self.df.columns and 'chave' in novas.columns:
+            self.df = self.df[~self.df['chave'].isin(novas['chave'])]
+        
+        self.df = pd.concat([self.df, novas], ignore_index=True)
+        for coluna in COLUNAS_CATEGORICAS:
+            if coluna in self.df.columns:
+                self.df[coluna] = self.df[coluna].astype('category')
+        self._invalidar()
+    
+    def _invalidar(self):
+        """Descarta os caches derivados do DataFrame e avança a versão"""
+        self.versao += 1
+        self._skills = None
+        self._agregados = None
+        self._titulos = None
+    
+    def _calcular_agregados(self) -> Dict:
+        """
+        Calcula de uma vez todos os agregados do dashboard
+        
+        Reaproveitado por get_estatisticas, get_top_skills, get_vagas_por_local
+        e get_vagas_por_empresa até a próxima mudança nos dados.
+        """
+        if self._agregados is None:
+            contagem_skills = self._contagem_skills()
+            
+            # Conta por valor bruto e normaliza só os valores distintos
+            contagem = self.df['local'].value_counts()
+            contagem = contagem[contagem > 0]
+            vagas_local = contagem.groupby(contagem.index.map(self._normalizar_local), sort=False).sum()
+            vagas_local = vagas_local.sort_values(ascending=False, kind='stable')
+            
+            vagas_empresa = self.df['empresa'].value_counts()
+            vagas_empresa = vagas_empresa[vagas_empresa > 0]
+            
+            vagas_fonte = self.df['fonte'].value_counts() if 'fonte' in self.df.columns else pd.Series(dtype=np.int64)
+            vagas_fonte = vagas_fonte[vagas_fonte > 0]
+            
+            self._agregados = {
+                'skills': contagem_skills,
+                'locais': vagas_local,
+                'empresas': vagas_empresa,
+                'fontes': vagas_fonte,
+                'estatisticas': {
+                    'total_vagas': len(self.df),
+                    'total_empresas': len(vagas_empresa),
+                    'total_locais': len(contagem),
+                    'skill_mais_demandada': contagem_skills.index[0] if not contagem_skills.empty else 'N/A'
+                }
+            }
+        
+        return self._agregados
+    
+    def _matriz_skills(self) -> Tuple[np.ndarray, pd.Index]:
+        """
+        Matriz indicadora vaga × skill (uint8), construída uma vez por versão do DataFrame
+        
+        Retorna (matriz, skills), onde matriz[i, j] == 1 se a i-ésima vaga pede skills[j].
+        """
+        if self._skills is None:
+            if self.df.empty or 'skills_mask' not in self.df.columns:
+                self._skills = (np.zeros((len(self.df), 0), dtype=np.uint8), pd.Index([]))
+                return self._skills
+            
+            # Expande só as máscaras distintas e indexa pelos códigos
+            codigos, mascaras = pd.factorize(self.df['skills_mask'])
+            k = len(self.codificador.skills)
+            if self.codificador.cabe_em_64_bits:
+                bits = np.arange(k, dtype=np.uint64)
+                distintas = ((np.asarray(mascaras, dtype=np.uint64)[:, None] >> bits) & np.uint64(1)).astype(np.uint8)
+            else:
+                distintas = np.array([[int(m) >> i & 1 for i in range(k)] for m in mascaras], dtype=np.uint8).reshape(-1, k)
+            
+            matriz = distintas[codigos]
+            presentes = np.flatnonzero(matriz.any(axis=0))
+            self._skills = (np.ascontiguousarray(matriz[:, presentes]), pd.Index(self.codificador.skills)[presentes])
+        
+        return self._skills
+    
+    def _skills_decodificadas(self, juntar: Optional[str] = None) -> pd.Series:
+        """Coluna de skills decodificada (listas, ou texto unido por `juntar`), por máscara distinta"""
+        return self._decodificar_mascaras(self.df['skills_mask'], juntar)
+    
+    def _decodificar_mascaras(self, mascaras_vagas: pd.Series, juntar: Optional[str] = None) -> pd.Series:
+        """Decodifica uma série de máscaras (ou um pedaço dela), uma vez por máscara distinta"""
+        codigos, mascaras = pd.factorize(mascaras_vagas)
+        decodificadas = [self.codificador.decodificar(m) for m in mascaras]
+        if juntar is not None:
+            decodificadas = [juntar.join(d) for d in decodificadas]
+        valores = np.empty(len(decodificadas), dtype=object)
+        valores[:] = decodificadas
+        return pd.Series(valores[codigos], index=mascaras_vagas.index, name='skills')
+    
+    def mascara_filtros(self, skills: Optional[List[str]] = None, empresas: Optional[List[str]] = None,
+                        locais: Optional[List[str]] = None, fontes: Optional[List[str]] = None,
+                        texto: str = "") -> np.ndarray:
+        """
+        Máscara booleana das vagas que passam nos filtros (None = sem filtro)
+        
+        `skills` exige todas as skills listadas; `locais` compara com a
+        localização normalizada; `texto` busca no título (sem diferenciar
+        maiúsculas).
+        """
+        mascara = np.ones(len(self.df), dtype=bool)
+        if self.df.empty:
+            return mascara
+        
+        if skills:
+            exigida = self.codificador.codificar(skills)
+            if self.codificador.cabe_em_64_bits:
+                exigida = np.uint64(exigida)
+                mascara &= (self.df['skills_mask'].to_numpy() & exigida) == exigida
+            else:
+                mascara &= np.array([int(m) & exigida == exigida for m in self.df['skills_mask']], dtype=bool)
+        if empresas:
+            mascara &= self.df['empresa'].isin(empresas).to_numpy()
+        if locais:
+            mascara &= self._locais_normalizados().isin(locais).to_numpy()
+        if fontes:
+            mascara &= self.df['fonte'].isin(fontes).to_numpy()
+        if texto:
+            if self._titulos is None:
+                self._titulos = self.df['titulo'].fillna('').astype(str).str.lower()
+            mascara &= self._titulos.str.contains(texto.lower(), regex=False).to_numpy()
+        return mascara
+    
+    def consultar(self, pagina: int = 1, por_pagina: int = 50, ordenar_por: Optional[str] = None,
+                  crescente: bool = True, max_skills: Optional[int] = None,
+                  mascara: Optional[np.ndarray] = None, **filtros) -> Tuple[pd.DataFrame, int]:
+        """
+        Filtra, ordena e pagina as vagas, materializando só a página pedida
+        
+        Os filtros são os de `mascara_filtros` (ou uma `mascara` já pronta).
+        Retorna (página, total de vagas filtradas); na página, `skills` vem
+        como texto, limitado a `max_skills` skills por vaga.
+        """
+        if self.df.empty:
+            return self.df, 0
+        
+        if mascara is None:
+            mascara = self.mascara_filtros(**filtros)
+        posicoes = np.flatnonzero(mascara)
+        if ordenar_por is not None and len(posicoes):
+            valores = self.df[ordenar_por].iloc[posicoes].reset_index(drop=True)
+            ordem = valores.sort_values(ascending=crescente, kind='stable', na_position='last').index.to_numpy()
+            posicoes = posicoes[ordem]
+        
+        inicio = (max(1, pagina) - 1) * por_pagina
+        df = self.df.iloc[posicoes[inicio:inicio + por_pagina]]
+        mascaras = df['skills_mask']
+        if max_skills is not None:
+            skills = self._decodificar_mascaras(mascaras).map(lambda s: ', '.join(s[:max_skills]))
+        else:
+            skills = self._decodificar_mascaras(mascaras, ', ')
+        df = df.drop(columns='skills_mask')
+        df.insert(self.df.columns.get_loc('skills_mask'), 'skills', skills)
+        return df, len(posicoes)
+    
+    def _contagem_skills(self) -> pd.Series:
+        """Quantidade de vagas por skill, em ordem decrescente"""
+        matriz, skills = self._matriz_skills()
+        contagem = pd.Series(matriz.sum(axis=0, dtype=np.int64), index=skills)
+        return contagem.sort_values(ascending=False, kind='stable')
+    
     def get_top_skills(self, top_n: int = 15) -> pd.DataFrame:
         """Retorna as skills mais demandadas"""
         if self.df.empty:
             return pd.DataFrame(columns=['Skill', 'Quantidade'])
         
-        # Flatten all skills into a single list
-        todas_skills = []
-        for skills_list in self.df['skills']:
-            todas_skills.extend(skills_list)
+        top_skills = self._calcular_agregados()['skills'].head(top_n)
+        return pd.DataFrame({'Skill': top_skills.index, 'Quantidade': top_skills.to_numpy()})
+    
+    def _skills_por_grupo(self, grupos: pd.Series, nome_grupo: str, top_n: int) -> pd.DataFrame:
+        """Top-N skills dentro de cada grupo (local, empresa...)"""
+        matriz, skills = self._matriz_skills()
+        if self.df.empty or not len(skills):
+            return pd.DataFrame(columns=[nome_grupo, 'Skill', 'Quantidade'])
         
-        # Count occurrences
-        skill_counts = Counter(todas_skills)
-        top_skills = skill_counts.most_common(top_n)
+        por_grupo = pd.DataFrame(matriz, columns=skills).groupby(grupos.to_numpy()).sum()
+        longo = por_grupo.stack()
+        longo = longo[longo > 0].rename('Quantidade').reset_index()
+        longo.columns = [nome_grupo, 'Skill', 'Quantidade']
         
-        df_skills = pd.DataFrame(top_skills, columns=['Skill', 'Quantidade'])
-        return df_skills
+        longo = longo.sort_values([nome_grupo, 'Quantidade'], ascending=[True, False], kind='stable')
+        return longo.groupby(nome_grupo, sort=False).head(top_n).reset_index(drop=True)
+    
+    def get_skills_por_local(self, top_n: int = 5) -> pd.DataFrame:
+        """Retorna as skills mais pedidas em cada localização (normalizada)"""
+        if self.df.empty:
+            return pd.DataFrame(columns=['Local', 'Skill', 'Quantidade'])
+        return self._skills_por_grupo(self._locais_normalizados(), 'Local', top_n)
+    
+    def get_skills_por_empresa(self, top_n: int = 5) -> pd.DataFrame:
+        """Retorna as skills mais pedidas por cada empresa"""
+        if self.df.empty:
+            return pd.DataFrame(columns=['Empresa', 'Skill', 'Quantidade'])
+        return self._skills_por_grupo(self.df['empresa'], 'Empresa', top_n)
+    
+    def get_coocorrencia_skills(self, top_n: int = 15) -> pd.DataFrame:
+        """Matriz de coocorrência (vagas que pedem ambas) entre as top-N skills"""
+        if self.df.empty:
+            return pd.DataFrame()
+        
+        matriz, skills = self._matriz_skills()
+        top = self._calcular_agregados()['skills'].head(top_n).index
+        colunas = skills.get_indexer(top)
+        
+        sub = matriz[:, colunas].astype(np.int32)
+        return pd.DataFrame(sub.T @ sub, index=top, columns=top)
     
     def get_vagas_por_local(self) -> pd.DataFrame:
         """Retorna quantidade de vagas por localização"""
         if self.df.empty:
             return pd.DataFrame(columns=['Local', 'Quantidade'])
         
-        # Normaliza localizações
-        df_local = self.df.copy()
-        df_local['local_normalizado'] = df_local['local'].apply(self._normalizar_local)
-        
-        vagas_local = df_local['local_normalizado'].value_counts().reset_index()
+        vagas_local = self._calcular_agregados()['locais'].head(10).reset_index()
         vagas_local.columns = ['Local', 'Quantidade']
         
-        return vagas_local.head(10)
+        return vagas_local
+    
+    def _locais_normalizados(self) -> pd.Series:
+        """Localização normalizada de cada vaga, calculada uma vez por valor distinto"""
+        locais = self.df['local'].astype('category')
+        # Código -1 (local ausente) cai no último elemento
+        normalizados = np.append(np.asarray(locais.cat.categories.map(self._normalizar_local), dtype=object), normalizar_local(''))
+        return pd.Series(normalizados[locais.cat.codes.to_numpy()], index=self.df.index)
     
     def _normalizar_local(self, local: str) -> str:
         """Normaliza nomes de localização"""
-        local = local.lower()
-        
-        # Mapeamento de normalizações
-        if 'remoto' in local or 'remote' in local or 'home office' in local:
-            return 'Remoto'
-        elif 'são paulo' in local or 'sp' in local:
-            return 'São Paulo'
-        elif 'rio de janeiro' in local or 'rj' in local:
-            return 'Rio de Janeiro'
-        elif 'belo horizonte' in local or 'bh' in local:
-            return 'Belo Horizonte'
-        elif 'brasília' in local or 'df' in local:
-            return 'Brasília'
-        elif 'curitiba' in local:
-            return 'Curitiba'
-        elif 'porto alegre' in local:
-            return 'Porto Alegre'
-        elif 'florianópolis' in local:
-            return 'Florianópolis'
-        else:
-            return local.title()
+        return normalizar_local(local)
     
     def get_vagas_por_empresa(self, top_n: int = 10) -> pd.DataFrame:
         """Retorna empresas com mais vagas"""
         if self.df.empty:
             return pd.DataFrame(columns=['Empresa', 'Quantidade'])
         
-        vagas_empresa = self.df['empresa'].value_counts().reset_index()
+        vagas_empresa = self._calcular_agregados()['empresas'].head(top_n).reset_index()
         vagas_empresa.columns = ['Empresa', 'Quantidade']
         
-        return vagas_empresa.head(top_n)
+        return vagas_empresa
+    
+    def get_opcoes_filtros(self) -> Dict[str, List[str]]:
+        """Valores disponíveis para os filtros de `mascara_filtros`, dos mais frequentes aos menos"""
+        if self.df.empty:
+            return {'skills': [], 'empresas': [], 'locais': [], 'fontes': []}
+        
+        agregados = self._calcular_agregados()
+        return {
+            'skills': agregados['skills'].index.tolist(),
+            'empresas': agregados['empresas'].index.tolist(),
+            'locais': agregados['locais'].index.tolist(),
+            'fontes': agregados['fontes'].index.tolist(),
+        }
     
     def get_estatisticas(self) -> Dict:
         """Retorna estatísticas gerais"""
@@ -92,32 +339,43 @@ class VagasAnalyzer:
                 'skill_mais_demandada': 'N/A'
             }
         
-        top_skills = self.get_top_skills(1)
-        skill_top = top_skills.iloc[0]['Skill'] if not top_skills.empty else 'N/A'
+        return dict(self._calcular_agregados()['estatisticas'])
+    
+    def exportar_csv(self, caminho: str = "vagas_tech.csv", **filtros):
+        """Exporta dados para CSV (em blocos, sem copiar o DataFrame)"""
+        if self.df.empty:
+            print("⚠️ Nenhuma vaga para exportar")
+            return
         
-        return {
-            'total_vagas': len(self.df),
-            'total_empresas': self.df['empresa'].nunique(),
-            'total_locais': self.df['local'].nunique(),
-            'skill_mais_demandada': skill_top
-        }
+        exportar.exportar_csv(self, caminho, self.mascara_filtros(**filtros) if filtros else None)
+        print(f"✅ Dados exportados para {caminho}")
     
-    def exportar_csv(self, caminho: str = "vagas_tech.csv"):
-        """Exporta dados para CSV"""
+    def exportar_parquet(self, caminho: str = "vagas_tech.parquet", **filtros):
+        """Exporta dados para Parquet, com `skills` como lista (requer pyarrow)"""
         if self.df.empty:
             print("⚠️ Nenhuma vaga para exportar")
             return
         
-        # Converte lista de skills para string
-        df_export = self.df.copy()
-        df_export['skills'] = df_export['skills'].apply(lambda x: ', '.join(x))
+        exportar.exportar_parquet(self, caminho, self.mascara_filtros(**filtros) if filtros else None)
+        print(f"✅ Dados exportados para {caminho}")
+    
+    def exportar_feather(self, caminho: str = "vagas_tech.feather", **filtros):
+        """Exporta dados para Feather, com `skills` como lista (requer pyarrow)"""
+        if self.df.empty:
+            print("⚠️ Nenhuma vaga para exportar")
+            return
         
-        df_export.to_csv(caminho, index=False, encoding='utf-8-sig')
+        exportar.exportar_feather(self, caminho, self.mascara_filtros(**filtros) if filtros else None)
         print(f"✅ Dados exportados para {caminho}")
     
     def get_dataframe(self) -> pd.DataFrame:
-        """Retorna o DataFrame completo"""
-        return self.df
+        """Retorna o DataFrame completo, com a coluna `skills` como listas"""
+        if self.df.empty:
+            return self.df
+        
+        df = self.df.copy()
+        df.insert(df.columns.get_loc('skills_mask'), 'skills', self._skills_decodificadas())
+        return df.drop(columns='skills_mask')
 
 
 # Teste rápido
@@ -1,8 +1,18 @@
+import os
+import time
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-from scraper import VagasScraper
+from scraper import VagasScraper, carregar_env
 from analyzer import VagasAnalyzer
+from analytics import SkillAnalytics
+from cache import RespostaCache
+from store import VagasStore
+from agendador import INTERVALO_PADRAO, criar_agendador
+from indice import IndiceVagas
+from arquivo import ArquivoRespostas
+from dedup import DeduplicadorVagas
+import exportar
 import pandas as pd
 
 # Configuração da página
@@ -12,6 +22,53 @@ st.set_page_config(
     layout="wide"
 )
 
+# Variáveis do .env (RAPIDAPI_KEY, caminhos do cache/store)
+carregar_env()
+
+@st.cache_resource
+def get_store() -> VagasStore:
+    """Base local com o histórico de vagas coletadas"""
+    return VagasStore()
+
+@st.cache_resource
+def get_indice() -> IndiceVagas:
+    """Índice de busca sobre o histórico, atualizado a cada bloco coletado"""
+    return IndiceVagas.from_store(get_store())
+
+@st.cache_resource
+def get_arquivo():
+    """Arquivo bruto das respostas da API (VAGAS_ARQUIVO=0 desliga)"""
+    if os.getenv('VAGAS_ARQUIVO', '1') == '0':
+        return None
+    return ArquivoRespostas()
+
+@st.cache_resource
+def get_base_dedup() -> DeduplicadorVagas:
+    """Vagas do histórico para a deduplicação aproximada (compartilhada com o agendador)"""
+    return DeduplicadorVagas.from_store(get_store())
+
+@st.cache_resource
+def get_scraper() -> VagasScraper:
+    """Scraper compartilhado entre execuções, com cache de respostas em disco"""
+    return VagasScraper(cache=RespostaCache(), deduplicacao_aproximada=True, indice=get_indice(),
+                        arquivo=get_arquivo(), base_dedup=get_base_dedup())
+
+# Idade máxima de um resultado salvo para a busca ser servida direto do store
+INTERVALO_ATUALIZACAO = float(os.getenv('VAGAS_INTERVALO_ATUALIZACAO', INTERVALO_PADRAO))
+
+@st.cache_resource
+def get_agendador():
+    """
+    Atualiza as consultas mais buscadas em segundo plano (uma thread por servidor)
+
+    VAGAS_AGENDADOR=0 desliga, por exemplo quando `python cli.py agendador`
+    roda como worker separado apontando para o mesmo store.
+    """
+    if os.getenv('VAGAS_AGENDADOR', '1') == '0':
+        return None
+    return criar_agendador(get_store(), get_indice(), get_arquivo(), get_base_dedup(),
+                           intervalo=INTERVALO_ATUALIZACAO).iniciar()
+
 # Título e descrição
 st.title("💼 Agregador de Vagas Tech")
 st.markdown("""
@@ -33,29 +90,147 @@ localizacao = st.sidebar.text_input(
     help="Ex: São Paulo, Remoto, Rio de Janeiro"
 )
 
+paginas = st.sidebar.slider(
+    "Páginas de resultados",
+    min_value=1,
+    max_value=10,
+    value=1,
+    help="Cada página traz até 10 vagas do JSearch"
+)
+
+historico = st.sidebar.checkbox(
+    "📚 Analisar histórico salvo",
+    value=False,
+    help="Analisa todas as vagas já coletadas, não só a última busca"
+)
+
 buscar_btn = st.sidebar.button("🚀 Buscar Vagas", type="primary", use_container_width=True)
 
+st.sidebar.markdown("---")
+consulta_local = st.sidebar.text_input(
+    "🔎 Buscar no histórico",
+    value="",
+    help="Busca local, sem chamar a API. Ex: python django, react OR vue, desenvolv*, skill:aws -estagio"
+)
+
 # Inicializa session state
 if 'vagas' not in st.session_state:
     st.session_state.vagas = []
 if 'analyzer' not in st.session_state:
     st.session_state.analyzer = None
+if 'analyzer_historico' not in st.session_state:
+    st.session_state.analyzer_historico = None
+if 'analytics' not in st.session_state:
+    st.session_state.analytics = None
+if 'analytics_historico' not in st.session_state:
+    st.session_state.analytics_historico = None
+
+store = get_store()
+get_agendador()
+
+def atualizar_analises(vagas, novas, mensagem):
+    """Atualiza o histórico com as vagas novas e recria as análises da busca"""
+    st.session_state.vagas = vagas
+    if st.session_state.analyzer_historico is not None:
+        st.session_state.analyzer_historico.adicionar(novas)
+    if st.session_state.analytics_historico is not None:
+        st.session_state.analytics_historico.adicionar(novas)
+    
+    if vagas:
+        st.session_state.analyzer = VagasAnalyzer(vagas)
+        st.session_state.analytics = SkillAnalytics.from_analyzer(st.session_state.analyzer)
+        st.success(mensagem)
+    else:
+        st.warning("⚠️ Nenhuma vaga encontrada. Tente outros termos de busca.")
 
 # Lógica de busca
+salvas = None
 if buscar_btn:
+    # Conta a busca (popularidade para o agendador) e tenta o resultado já salvo
+    store.registrar_busca(keyword, localizacao, paginas)
+    inicio = time.perf_counter()
+    salvas = store.resultado(keyword, localizacao, paginas, max_idade=INTERVALO_ATUALIZACAO)
+    if salvas:
+        idade = store.idade_resultado(keyword, localizacao) or 0
+        atualizar_analises(salvas, [], (
+            f"⚡ {len(salvas)} vagas do histórico em {(time.perf_counter() - inicio) * 1000:.0f} ms "
+            f"(atualizadas há {idade / 60:.0f} min)"
+        ))
+
+if buscar_btn and not salvas:
     with st.spinner("🔎 Buscando vagas..."):
-        scraper = VagasScraper()
-        st.session_state.vagas = scraper.buscar_vagas(keyword, localizacao)
+        scraper = get_scraper()
         
-        if st.session_state.vagas:
-            st.session_state.analyzer = VagasAnalyzer(st.session_state.vagas)
-            st.success(f"✅ {len(st.session_state.vagas)} vagas encontradas!")
+        # Mostra resultados parciais enquanto as fontes ainda respondem
+        parcial = st.empty()
+        recebidas = []
+        
+        def mostrar_parcial(bloco):
+            recebidas.extend(bloco)
+            with parcial.container():
+                st.info(f"📥 {len(recebidas)} vagas recebidas até agora...")
+                st.dataframe(
+                    pd.DataFrame(recebidas[-10:])[['titulo', 'empresa', 'local', 'fonte']],
+                    use_container_width=True,
+                    hide_index=True
+                )
+        
+        vagas = scraper.buscar_vagas(keyword, localizacao, paginas, ao_receber=mostrar_parcial)
+        parcial.empty()
+        
+        # Só vagas reais vão para o histórico; apenas novas/alteradas são reprocessadas.
+        # Um resultado parcial entra no histórico, mas não vira o resultado salvo da consulta
+        reais = [v for v in vagas if v['fonte'] != 'Demonstração']
+        if vagas.parcial:
+            novas = store.upsert(reais)
         else:
-            st.warning("⚠️ Nenhuma vaga encontrada. Tente outros termos de busca.")
+            novas = store.salvar_resultado(keyword, localizacao, reais, paginas) if reais else []
+        atualizar_analises(vagas, novas, f"✅ {len(vagas)} vagas encontradas ({len(novas)} novas no histórico)!")
+        
+        if vagas.parcial:
+            st.warning(f"⚠️ Resultado parcial: {len(vagas.erros)} página(s) ou fonte(s) falharam mesmo após novas tentativas.")
+            with st.expander("Detalhes das falhas"):
+                st.dataframe(pd.DataFrame(vagas.erros), use_container_width=True, hide_index=True)
+
+# Tempos por etapa, requisições por fonte e acertos do cache desde o início do servidor
+with st.sidebar.expander("⏱️ Métricas da coleta"):
+    st.json(get_scraper().metricas.resumo(), expanded=False)
+    if get_agendador() is not None:
+        st.caption("🔄 Atualizações em segundo plano")
+        st.json(get_agendador().scraper.metricas.resumo(), expanded=False)
+
+# Busca no índice local (título, empresa, local, descrição e skills), ordenada por relevância
+if consulta_local.strip():
+    indice = get_indice()
+    indice.sincronizar(store)
+    inicio = time.perf_counter()
+    encontradas = indice.buscar(consulta_local, limite=50)
+    st.subheader("🔎 Resultados no histórico")
+    st.caption(f"{indice.contar(consulta_local)} vagas em {(time.perf_counter() - inicio) * 1000:.0f} ms "
+               f"(mostrando as {len(encontradas)} mais relevantes de {len(indice)} indexadas)")
+    if encontradas:
+        df_encontradas = pd.DataFrame(encontradas)
+        df_encontradas['skills'] = df_encontradas['skills'].map(lambda s: ', '.join(s[:5]))
+        st.dataframe(
+            df_encontradas[['titulo', 'empresa', 'local', 'skills', 'fonte', 'pontuacao', 'link']],
+            column_config={'link': st.column_config.LinkColumn("Link", display_text="Ver vaga")},
+            use_container_width=True,
+            hide_index=True
+        )
+
+if historico:
+    if st.session_state.analyzer_historico is None:
+        st.session_state.analyzer_historico = VagasAnalyzer.from_store(store)
+        st.session_state.analytics_historico = SkillAnalytics.from_analyzer(st.session_state.analyzer_historico)
+    analyzer_ativo = st.session_state.analyzer_historico
+    analytics = st.session_state.analytics_historico
+else:
+    analyzer_ativo = st.session_state.analyzer
+    analytics = st.session_state.analytics
 
 # Exibe resultados se houver vagas
-if st.session_state.vagas and st.session_state.analyzer:
-    analyzer = st.session_state.analyzer
+if analyzer_ativo is not None and not analyzer_ativo.df.empty:
+    analyzer = analyzer_ativo
     
     # Métricas principais
     st.markdown("---")
@@ -142,38 +317,127 @@ if st.session_state.vagas and st.session_state.analyzer:
         )
         st.plotly_chart(fig_empresas, use_container_width=True)
     
+    # Skills relacionadas e tendência
+    st.markdown("---")
+    st.subheader("🔗 Skills Relacionadas")
+    
+    skill_escolhida = st.selectbox(
+        "Escolha uma skill",
+        analyzer.get_top_skills(30)['Skill'].tolist(),
+        help="Mostra as skills que mais aparecem junto com ela"
+    )
+    
+    col_rel1, col_rel2 = st.columns(2)
+    
+    with col_rel1:
+        df_relacionadas = analytics.get_skills_relacionadas(skill_escolhida, min_coocorrencias=1)
+        if not df_relacionadas.empty:
+            st.dataframe(df_relacionadas, use_container_width=True, hide_index=True)
+        else:
+            st.info("Nenhuma skill relacionada")
+    
+    with col_rel2:
+        df_tendencia = analytics.get_tendencia([skill_escolhida])
+        if len(df_tendencia) > 1:
+            fig_tendencia = px.line(
+                df_tendencia.reset_index(),
+                x='Periodo',
+                y=skill_escolhida,
+                markers=True,
+                labels={skill_escolhida: 'Fração das vagas'}
+            )
+            fig_tendencia.update_layout(height=350)
+            st.plotly_chart(fig_tendencia, use_container_width=True)
+        else:
+            st.info("Histórico insuficiente para mostrar tendência")
+    
     # Tabela de vagas
     st.markdown("---")
     st.subheader("📋 Todas as Vagas Encontradas")
     
-    df_display = analyzer.get_dataframe().copy()
-    df_display['skills'] = df_display['skills'].apply(lambda x: ', '.join(x[:5]))  # Mostra até 5 skills
-    df_display['link'] = df_display['link'].apply(lambda x: f'<a href="{x}" target="_blank">Ver vaga</a>')
+    opcoes = analyzer.get_opcoes_filtros()
+    col_filtro1, col_filtro2, col_filtro3, col_filtro4 = st.columns(4)
+    
+    with col_filtro1:
+        filtro_skills = st.multiselect("Skills", opcoes['skills'])
+    with col_filtro2:
+        filtro_empresas = st.multiselect("Empresas", opcoes['empresas'])
+    with col_filtro3:
+        filtro_locais = st.multiselect("Localização", opcoes['locais'])
+    with col_filtro4:
+        filtro_fontes = st.multiselect("Fontes", opcoes['fontes'])
+    
+    col_busca, col_ordem, col_pagina = st.columns([2, 1, 1])
+    
+    with col_busca:
+        filtro_texto = st.text_input("Buscar no título", value="")
+    with col_ordem:
+        ordenar_por = st.selectbox(
+            "Ordenar por",
+            ['titulo', 'empresa', 'local', 'fonte'],
+            format_func=lambda coluna: coluna.capitalize()
+        )
+    
+    filtros = {
+        'skills': filtro_skills,
+        'empresas': filtro_empresas,
+        'locais': filtro_locais,
+        'fontes': filtro_fontes,
+        'texto': filtro_texto,
+    }
+    
+    # Só a página visível é materializada e enviada ao navegador
+    mascara = analyzer.mascara_filtros(**filtros)
+    total_filtrado = int(mascara.sum())
+    por_pagina = 50
+    total_paginas = max(1, -(-total_filtrado // por_pagina))
+    
+    with col_pagina:
+        pagina = st.number_input("Página", min_value=1, max_value=total_paginas, value=1, step=1)
+    
+    df_display, _ = analyzer.consultar(
+        pagina=pagina,
+        por_pagina=por_pagina,
+        ordenar_por=ordenar_por,
+        max_skills=5,  # Mostra até 5 skills
+        mascara=mascara
+    )
+    
+    st.caption(f"{total_filtrado} vagas · página {pagina} de {total_paginas}")
     
     # Exibe tabela
     st.dataframe(
-        df_display[['titulo', 'empresa', 'local', 'skills', 'fonte']],
+        df_display[['titulo', 'empresa', 'local', 'skills', 'fonte', 'link']],
+        column_config={'link': st.column_config.LinkColumn("Link", display_text="Ver vaga")},
         use_container_width=True,
+        hide_index=True,
         height=400
     )
     
     # Botão de download
     st.markdown("---")
-    col_download1, col_download2 = st.columns([3, 1])
+    col_download1, col_download2, col_download3 = st.columns([2, 1, 1])
     
+    # Os arquivos só são gerados no clique, em blocos, sem copiar o DataFrame,
+    # e respeitam os filtros da tabela
     with col_download2:
-        # Prepara CSV para download
-        df_export = analyzer.get_dataframe().copy()
-        df_export['skills'] = df_export['skills'].apply(lambda x: ', '.join(x))
-        csv = df_export.to_csv(index=False, encoding='utf-8-sig')
-        
         st.download_button(
             label="📥 Baixar CSV",
-            data=csv,
+            data=lambda: exportar.csv_em_bytes(analyzer, mascara),
             file_name=f"vagas_{keyword}.csv",
             mime="text/csv",
             use_container_width=True
         )
+    
+    with col_download3:
+        if exportar.ARROW_DISPONIVEL:
+            st.download_button(
+                label="📥 Baixar Parquet",
+                data=lambda: exportar.parquet_em_bytes(analyzer, mascara),
+                file_name=f"vagas_{keyword}.parquet",
+                mime="application/vnd.apache.parquet",
+                use_container_width=True
+            )
 
 else:
     # Mensagem inicial
@@ -0,0 +1,215 @@
+"""
+Arquivo bruto (append-only) das respostas da API, com reprocessamento offline
+
+A extração guarda só seis campos de cada vaga do JSearch; a resposta
+completa (descrição, data de publicação, salário, tipo de contrato...) fica
+aqui. Cada resposta vira uma linha JSON comprimida como um frame
+independente (gzip, ou zstd se o pacote `zstandard` estiver instalado),
+anexada ao segmento atual. Um índice SQLite guarda (segmento, offset,
+tamanho) de cada frame, então uma resposta é lida com um seek, e os
+segmentos continuam legíveis com `zcat`/`zstdcat`.
+
+Mudar a lista de skills ou extrair um campo novo vira um reprocessamento
+em disco, sem nenhuma chamada à API:
+
+    python cli.py backfill --arquivo --store .cache/vagas.sqlite --skills skills.json
+"""
+import gzip
+import importlib.util
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+from instrumentacao import get_logger
+
+logger = get_logger('arquivo')
+
+CAMINHO_PADRAO = os.path.join('.cache', 'arquivo')
+TAMANHO_SEGMENTO = 64 * 2 ** 20
+
+# zstandard é opcional: comprime melhor e mais rápido que o gzip
+ZSTD_DISPONIVEL = importlib.util.find_spec('zstandard') is not None
+
+EXTENSOES = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}
+
+
+def comprimir(dados: bytes, compressao: str) -> bytes:
+    if compressao == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(dados)
+    return gzip.compress(dados, compresslevel=6, mtime=0)
+
+
+def descomprimir(dados: bytes, compressao: str) -> bytes:
+    if compressao == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(dados)
+    return gzip.decompress(dados)
+
+
+def _compressao_segmento(segmento: str) -> str:
+    return 'zstd' if segmento.endswith(EXTENSOES['zstd']) else 'gzip'
+
+
+class ArquivoRespostas:
+    """
+    Respostas brutas em segmentos comprimidos, com índice de offsets
+
+    Cada processo escreve no seu próprio segmento (o nome leva o pid), então
+    o app, o agendador e a CLI podem arquivar no mesmo diretório. O frame é
+    escrito antes da linha do índice: se o processo morrer entre os dois, o
+    frame fica órfão e é ignorado na leitura.
+    """
+
+    def __init__(self, caminho: Optional[str] = None, compressao: Optional[str] = None,
+                 tamanho_segmento: int = TAMANHO_SEGMENTO):
+        self.caminho = caminho or os.getenv('VAGAS_ARQUIVO_PATH', CAMINHO_PADRAO)
+        self.compressao = compressao or ('zstd' if ZSTD_DISPONIVEL else 'gzip')
+        if self.compressao not in EXTENSOES:
+            raise ValueError(f"Compressão desconhecida: {self.compressao} (use 'gzip' ou 'zstd')")
+        if self.compressao == 'zstd' and not ZSTD_DISPONIVEL:
+            raise ImportError("Compressão zstd requer o pacote 'zstandard' (pip install zstandard)")
+        self.tamanho_segmento = tamanho_segmento
+        self._lock = threading.Lock()
+        self._segmento: Optional[str] = None
+        self._saida = None
+
+        os.makedirs(self.caminho, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(self.caminho, 'indice.sqlite'), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS respostas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                segmento TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                tamanho INTEGER NOT NULL,
+                bytes_originais INTEGER NOT NULL,
+                fonte TEXT NOT NULL,
+                query TEXT NOT NULL,
+                pagina INTEGER NOT NULL,
+                jobs INTEGER NOT NULL,
+                salvo_em REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_arquivo_salvo_em ON respostas (salvo_em)')
+        self._conn.commit()
+
+    def _abrir_segmento(self):
+        """Fecha o segmento atual e abre um novo (nome ordenável pelo tempo)"""
+        if self._saida is not None:
+            self._saida.close()
+        nome = f"{int(time.time() * 1000):013d}-{os.getpid()}{EXTENSOES[self.compressao]}"
+        self._segmento = nome
+        self._saida = open(os.path.join(self.caminho, nome), 'ab')
+
+    def salvar(self, fonte: str, query: str, pagina: int, resposta: Dict) -> int:
+        """Anexa uma resposta ao arquivo; retorna o tamanho comprimido"""
+        salvo_em = time.time()
+        linha = json.dumps({
+            'fonte': fonte, 'query': query, 'pagina': pagina, 'salvo_em': salvo_em, 'resposta': resposta,
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        frame = comprimir(linha, self.compressao)
+
+        with self._lock:
+            if self._saida is None or self._saida.tell() >= self.tamanho_segmento:
+                self._abrir_segmento()
+            offset = self._saida.tell()
+            self._saida.write(frame)
+            self._saida.flush()
+
+            self._conn.execute(
+                'INSERT INTO respostas (segmento, offset, tamanho, bytes_originais, fonte, query, pagina, jobs, salvo_em) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (self._segmento, offset, len(frame), len(linha), fonte, query, int(pagina),
+                 len(resposta.get('data') or []), salvo_em)
+            )
+            self._conn.commit()
+
+        logger.debug("Arquivada '%s' (página %d): %d → %d bytes", query, pagina, len(linha), len(frame),
+                     extra={'fonte': fonte, 'query': query, 'pagina': pagina, 'segmento': self._segmento})
+        return len(frame)
+
+    def _entradas(self, fonte: Optional[str] = None, desde: Optional[float] = None,
+                  query: Optional[str] = None) -> list:
+        condicoes, parametros = [], []
+        if fonte:
+            condicoes.append('fonte = ?')
+            parametros.append(fonte)
+        if desde is not None:
+            condicoes.append('salvo_em >= ?')
+            parametros.append(desde)
+        if query:
+            condicoes.append('query = ?')
+            parametros.append(query)
+        onde = f"WHERE {' AND '.join(condicoes)}" if condicoes else ''
+        with self._lock:
+            if self._saida is not None:
+                self._saida.flush()
+            return self._conn.execute(
+                f'SELECT segmento, offset, tamanho FROM respostas {onde} ORDER BY id', parametros
+            ).fetchall()
+
+    def frames(self, fonte: Optional[str] = 'JSearch', desde: Optional[float] = None,
+               query: Optional[str] = None) -> Iterator[tuple]:
+        """Gera (compressão, frame comprimido) na ordem em que foram arquivados"""
+        abertos = {}
+        try:
+            for segmento, offset, tamanho in self._entradas(fonte, desde, query):
+                arquivo = abertos.get(segmento)
+                if arquivo is None:
+                    caminho = os.path.join(self.caminho, segmento)
+                    if not os.path.exists(caminho):
+                        logger.warning("Segmento ausente: %s", segmento, extra={'segmento': segmento})
+                        abertos[segmento] = arquivo = False
+                    else:
+                        abertos[segmento] = arquivo = open(caminho, 'rb')
+                if arquivo is False:
+                    continue
+                arquivo.seek(offset)
+                yield _compressao_segmento(segmento), arquivo.read(tamanho)
+        finally:
+            for arquivo in abertos.values():
+                if arquivo:
+                    arquivo.close()
+
+    def respostas(self, fonte: Optional[str] = 'JSearch', desde: Optional[float] = None,
+                  query: Optional[str] = None) -> Iterator[Dict]:
+        """Gera as linhas arquivadas ({fonte, query, pagina, salvo_em, resposta}), descomprimidas"""
+        for compressao, frame in self.frames(fonte, desde, query):
+            yield json.loads(descomprimir(frame, compressao))
+
+    def reprocessar(self, store=None, processos: Optional[int] = None, skills=None,
+                    desde: Optional[float] = None, query: Optional[str] = None, **opcoes) -> Dict:
+        """Passa as respostas arquivadas pela extração (ver backfill.backfill), sem chamar a API"""
+        from backfill import backfill, registros_arquivo
+        return backfill(registros_arquivo(self, desde, query), store, processos, skills=skills, **opcoes)
+
+    def resumo(self) -> Dict:
+        with self._lock:
+            respostas, jobs, comprimidos, originais, segmentos = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(jobs), 0), COALESCE(SUM(tamanho), 0), '
+                'COALESCE(SUM(bytes_originais), 0), COUNT(DISTINCT segmento) FROM respostas'
+            ).fetchone()
+        return {
+            'caminho': self.caminho,
+            'compressao': self.compressao,
+            'segmentos': segmentos,
+            'respostas': respostas,
+            'jobs': jobs,
+            'bytes_comprimidos': comprimidos,
+            'taxa_compressao': round(originais / comprimidos, 2) if comprimidos else None,
+        }
+
+    def fechar(self):
+        with self._lock:
+            if self._saida is not None:
+                self._saida.close()
+                self._saida = None
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM respostas').fetchone()[0]
@@ -0,0 +1,247 @@
+"""
+Reprocessamento em lote (backfill) de respostas brutas em vários processos
+
+Lê payloads brutos (respostas do JSearch no arquivo bruto ou no cache,
+vagas em JSON Lines, HTML do Programathor...), divide-os em lotes e extrai vagas e skills num
+ProcessPoolExecutor. Os lotes viajam como bytes (o JSON é decodificado no
+processo de trabalho) e os resultados voltam na ordem da entrada, então a
+saída é a mesma com 1 ou N processos.
+
+    python cli.py backfill --arquivo --store .cache/vagas.sqlite --skills skills.json
+    python cli.py backfill --cache --store .cache/vagas.sqlite --skills skills.json
+    python cli.py backfill --jsonl corpus.jsonl --processos 8 --parquet vagas.parquet
+"""
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from instrumentacao import get_logger
+
+logger = get_logger('backfill')
+
+TAMANHO_LOTE = 500
+
+# Registro bruto: (formato, conteúdo em bytes)
+Registro = Tuple[str, bytes]
+
+
+def _jobs_resposta(conteudo: bytes) -> List[Dict]:
+    return json.loads(conteudo).get('data') or []
+
+
+def _jobs_arquivo(compressao: str):
+    def decodificar(conteudo: bytes) -> List[Dict]:
+        from arquivo import descomprimir
+        return json.loads(descomprimir(conteudo, compressao))['resposta'].get('data') or []
+    return decodificar
+
+
+# Formato → função que transforma o conteúdo bruto em jobs do JSearch
+FORMATOS_JSEARCH = {
+    'job': lambda conteudo: [json.loads(conteudo)],
+    'resposta': _jobs_resposta,
+    'resposta_zlib': lambda conteudo: _jobs_resposta(zlib.decompress(conteudo)),
+    # Frames do ArquivoRespostas: descomprimidos no processo de trabalho
+    'arquivo_gzip': _jobs_arquivo('gzip'),
+    'arquivo_zstd': _jobs_arquivo('zstd'),
+}
+FORMATOS_HTML = {'html_programathor'}
+
+
+def registros_jsonl(caminho: str) -> Iterator[Registro]:
+    """Uma vaga do JSearch por linha (ex.: corpus de benchmarks/corpus.py)"""
+    with open(caminho, 'rb') as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield 'job', linha
+
+
+def registros_cache(caminho: Optional[str] = None) -> Iterator[Registro]:
+    """Respostas do JSearch guardadas no RespostaCache, em ordem de chave"""
+    from cache import CAMINHO_PADRAO
+    caminho = caminho or os.getenv('VAGAS_CACHE_PATH', CAMINHO_PADRAO)
+    conn = sqlite3.connect(caminho)
+    try:
+        for (payload,) in conn.execute('SELECT payload FROM respostas ORDER BY chave'):
+            yield 'resposta_zlib', payload
+    finally:
+        conn.close()
+
+
+def registros_arquivo(arquivo=None, desde: Optional[float] = None, query: Optional[str] = None) -> Iterator[Registro]:
+    """Respostas do JSearch no ArquivoRespostas (ou no diretório `arquivo`), na ordem em que chegaram"""
+    from arquivo import ArquivoRespostas
+    if not isinstance(arquivo, ArquivoRespostas):
+        arquivo = ArquivoRespostas(arquivo)
+    for compressao, frame in arquivo.frames('JSearch', desde, query):
+        yield f'arquivo_{compressao}', frame
+
+
+def _lotes(registros: Iterable[Registro], tamanho_lote: int) -> Iterator[Tuple[str, List[bytes]]]:
+    """Agrupa registros consecutivos do mesmo formato em lotes"""
+    formato_atual, lote = None, []
+    for formato, conteudo in registros:
+        if lote and (formato != formato_atual or len(lote) >= tamanho_lote):
+            yield formato_atual, lote
+            lote = []
+        formato_atual = formato
+        lote.append(conteudo)
+    if lote:
+        yield formato_atual, lote
+
+
+# Estado de cada processo de trabalho, criado uma vez em `_inicializar`
+_scraper = None
+_programathor = None
+
+
+def _inicializar(skills: Optional[Dict[str, List[str]]]):
+    global _scraper, _programathor
+    from scraper import VagasScraper
+    from skills import SkillMatcher, get_skill_matcher
+
+    matcher = SkillMatcher(skills) if skills is not None else get_skill_matcher()
+    _scraper = VagasScraper(skill_matcher=matcher, fontes=[])
+    _programathor = None
+
+
+def _processar_lote(formato: str, conteudos: List[bytes], localizacao: str = '',
+                    com_descricao: bool = False) -> Tuple[int, List[Dict]]:
+    """
+    Extrai as vagas de um lote (roda no processo de trabalho); retorna (jobs lidos, vagas)
+
+    A descrição só volta ao processo principal com `com_descricao` (para a
+    deduplicação aproximada); sem ela, o IPC carrega só os campos da vaga.
+    """
+    global _programathor
+    if formato in FORMATOS_HTML:
+        if _programathor is None:
+            from fontes import ProgramathorFonte
+            _programathor = ProgramathorFonte(_scraper)
+        vagas = _programathor.parsear_paginas(conteudos, localizacao)
+        return len(vagas), vagas
+
+    decodificar = FORMATOS_JSEARCH[formato]
+    extrair = _scraper._extrair_dados_jsearch
+    lidos, vagas = 0, []
+    for conteudo in conteudos:
+        for job in decodificar(conteudo):
+            lidos += 1
+            try:
+                vaga = extrair(job, localizacao)
+            except Exception as e:
+                logger.warning("Erro ao processar vaga: %s", e, extra={'formato': formato})
+                continue
+            if vaga:
+                if not com_descricao:
+                    vaga.pop('descricao', None)
+                vagas.append(vaga)
+    return lidos, vagas
+
+
+def processar(registros: Iterable[Registro], processos: Optional[int] = None, tamanho_lote: int = TAMANHO_LOTE,
+              skills: Optional[Dict[str, List[str]]] = None, localizacao: str = '',
+              contadores: Optional[Dict] = None, com_descricao: bool = False) -> Iterator[List[Dict]]:
+    """
+    Gera as vagas extraídas de cada lote, na ordem dos registros
+
+    Com `processos` > 1, os lotes são distribuídos num pool de processos
+    (no máximo 2 lotes por processo em voo, para a memória não crescer com
+    a entrada). `skills` ({skill: [aliases]}) substitui o dicionário padrão.
+    `contadores`, se informado, recebe 'registros', 'jobs' e 'lotes'. Com
+    `com_descricao`, as vagas do JSearch mantêm o campo 'descricao'.
+    """
+    processos = processos or os.cpu_count() or 1
+    contadores = contadores if contadores is not None else {}
+    contadores.update(registros=0, jobs=0, lotes=0)
+
+    def contar(lote):
+        contadores['registros'] += len(lote[1])
+        contadores['lotes'] += 1
+        return lote
+
+    lotes = (contar(lote) for lote in _lotes(registros, tamanho_lote))
+
+    if processos == 1:
+        _inicializar(skills)
+        for formato, conteudos in lotes:
+            lidos, vagas = _processar_lote(formato, conteudos, localizacao, com_descricao)
+            contadores['jobs'] += lidos
+            yield vagas
+        return
+
+    # spawn: processos limpos, sem herdar threads (Streamlit, agendador) do pai
+    import multiprocessing
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(processos, mp_context=contexto, initializer=_inicializar, initargs=(skills,)) as executor:
+        em_voo = deque()
+        for formato, conteudos in lotes:
+            em_voo.append(executor.submit(_processar_lote, formato, conteudos, localizacao, com_descricao))
+            # Entrega na ordem de envio: o resultado não depende de qual processo termina antes
+            while len(em_voo) >= 2 * processos:
+                lidos, vagas = em_voo.popleft().result()
+                contadores['jobs'] += lidos
+                yield vagas
+        while em_voo:
+            lidos, vagas = em_voo.popleft().result()
+            contadores['jobs'] += lidos
+            yield vagas
+
+
+def backfill(registros: Iterable[Registro], store=None, processos: Optional[int] = None,
+             tamanho_lote: int = TAMANHO_LOTE, skills: Optional[Dict[str, List[str]]] = None,
+             deduplicacao_aproximada: bool = False, consumidores: Optional[List] = None) -> Dict:
+    """
+    Reprocessa os registros e grava as vagas únicas no store (se houver)
+
+    A deduplicação roda no processo principal, sobre os blocos já em ordem,
+    então o resultado é determinístico. A aproximada usa as descrições e,
+    com `store`, também compara com as vagas já guardadas. `consumidores` recebem cada bloco
+    de vagas únicas (`adicionar`), como em `pipeline.alimentar`.
+    Retorna um resumo com contagens e vazão.
+    """
+    from scraper import VagasScraper
+
+    base_dedup = None
+    if deduplicacao_aproximada and store is not None:
+        from dedup import DeduplicadorVagas
+        base_dedup = DeduplicadorVagas.from_store(store)
+    # Só para a deduplicação: a mesma regra da coleta (`_remover_duplicatas`)
+    deduplicador = VagasScraper(fontes=[], deduplicacao_aproximada=deduplicacao_aproximada, base_dedup=base_dedup)
+    vistas = deduplicador._criar_vistas()
+
+    inicio = time.perf_counter()
+    contadores = {}
+    vagas_total = unicas_total = novas = 0
+    for bloco in processar(registros, processos, tamanho_lote, skills, contadores=contadores,
+                           com_descricao=deduplicacao_aproximada):
+        vagas_total += len(bloco)
+        unicas = deduplicador._remover_duplicatas(bloco, vistas)
+        if deduplicacao_aproximada:
+            for vaga in bloco:
+                vaga.pop('descricao', None)
+
+        unicas_total += len(unicas)
+        if store is not None and unicas:
+            novas += len(store.upsert(unicas))
+        for consumidor in consumidores or []:
+            consumidor.adicionar(unicas)
+
+    segundos = time.perf_counter() - inicio
+    resumo = {
+        **contadores,
+        'vagas': vagas_total,
+        'unicas': unicas_total,
+        'novas_no_store': novas if store is not None else None,
+        'processos': processos or os.cpu_count() or 1,
+        'segundos': round(segundos, 3),
+        'jobs_por_s': round(contadores['jobs'] / segundos, 1) if segundos else None,
+    }
+    logger.info("Backfill: %d jobs → %d vagas únicas em %.1fs", contadores['jobs'], unicas_total, segundos,
+                extra=resumo)
+    return resumo
@@ -0,0 +1,216 @@
+"""
+Gerador determinístico de vagas no formato do JSearch
+
+Produz payloads realistas (descrições longas, localizações variadas,
+vagas sindicadas quase duplicadas) a partir de uma semente, em qualquer
+escala: as vagas são geradas sob demanda, nada é guardado além de uma
+pequena janela para criar as duplicatas.
+
+    python benchmarks/corpus.py --n 100000 --saida corpus.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from locais import CIDADES, ESTADOS  # noqa: E402
+from skills import SKILLS_PADRAO  # noqa: E402
+
+CARGOS = [
+    'Desenvolvedor', 'Desenvolvedora', 'Engenheiro de Software', 'Engenheira de Software',
+    'Analista de Dados', 'Cientista de Dados', 'Engenheiro de Dados', 'Desenvolvedor Full Stack',
+    'Desenvolvedor Back-end', 'Desenvolvedor Front-end', 'SRE', 'DevOps Engineer',
+    'Software Engineer', 'Data Engineer', 'Backend Developer', 'Frontend Developer',
+    'Machine Learning Engineer', 'Tech Lead', 'Arquiteto de Software', 'QA Engineer',
+]
+NIVEIS = ['Jr', 'Júnior', 'Pleno', 'Sênior', 'Senior', 'Sr.', 'Especialista', 'Estágio', '', '']
+EMPRESAS = [
+    'Nubank', 'iFood', 'Stone', 'PicPay', 'Itaú Unibanco', 'Mercado Livre', 'Totvs', 'CI&T',
+    'Globo', 'Magazine Luiza', 'QuintoAndar', 'Creditas', 'Loft', 'VTEX', 'Hotmart', 'RD Station',
+    'Zup Innovation', 'Olist', 'Ambev Tech', 'Banco Inter', 'Localiza', 'Natura &Co', 'Petrobras',
+    'Accenture', 'ThoughtWorks', 'Serasa Experian', 'B3', 'XP Inc.', 'BTG Pactual', 'Cielo',
+]
+PUBLICADORES = ['LinkedIn', 'Indeed', 'Glassdoor', 'Gupy', 'ZipRecruiter', 'Vagas.com', 'Catho']
+
+FRASES = [
+    "Buscamos uma pessoa apaixonada por tecnologia para fazer parte do nosso time.",
+    "Você vai trabalhar em um ambiente ágil, com entregas frequentes e muita autonomia.",
+    "Nosso produto atende milhões de clientes em todo o Brasil.",
+    "Valorizamos diversidade, colaboração e aprendizado contínuo.",
+    "Oferecemos plano de saúde, vale refeição, auxílio home office e PLR.",
+    "Participe de decisões de arquitetura e da evolução da plataforma.",
+    "Você irá colaborar com as áreas de produto, design e negócios.",
+    "Processo seletivo: conversa com RH, desafio técnico e entrevista com o time.",
+    "We are looking for engineers who care about quality and ownership.",
+    "You will design, build and operate services at scale.",
+    "Horário flexível e possibilidade de trabalho híbrido.",
+    "Experiência com metodologias ágeis como Scrum ou Kanban é um diferencial.",
+    "Boa comunicação e capacidade de trabalhar em equipe.",
+    "Inglês intermediário para leitura de documentação técnica.",
+]
+MODELOS_SKILL = [
+    "Experiência com {}.",
+    "Conhecimento sólido em {} e {}.",
+    "Vivência com {} em produção.",
+    "Desejável: {}, {} ou {}.",
+    "Strong experience with {} and {}.",
+    "Nossa stack inclui {}, {} e {}.",
+]
+
+_SKILLS = list(SKILLS_PADRAO.items())
+# Skills do início do dicionário (linguagens e frameworks populares) aparecem mais
+_PESOS_SKILLS = [1.0 / (1 + i * 0.15) for i in range(len(_SKILLS))]
+_PESOS_CIDADES = [1.0 / (1 + i * 0.3) for i in range(len(CIDADES))]
+
+
+class GeradorCorpus:
+    """Gera vagas JSearch uma a uma a partir de uma semente (mesma semente → mesmas vagas)"""
+
+    def __init__(self, semente=42, taxa_duplicatas: float = 0.1, empresas: int = 2000, janela: int = 500):
+        self.rng = random.Random(semente)
+        self.taxa_duplicatas = taxa_duplicatas
+        self.empresas = EMPRESAS + [f"Empresa {i}" for i in range(max(0, empresas - len(EMPRESAS)))]
+        self.recentes = deque(maxlen=janela)
+        self.contador = 0
+        self.base_data = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def _descricao(self, skills: List[str]) -> str:
+        rng = self.rng
+        aliases = [rng.choice(SKILLS_PADRAO[skill]) for skill in skills]
+        rng.shuffle(aliases)
+
+        frases = []
+        while aliases:
+            modelo = rng.choice(MODELOS_SKILL)
+            n = modelo.count('{}')
+            frases.append(modelo.format(*(aliases[:n] + [rng.choice(aliases)] * n)[:n]))
+            aliases = aliases[n:]
+        frases.extend(rng.choices(FRASES, k=rng.randint(8, 40)))
+        rng.shuffle(frases)
+
+        # Parágrafos de 3 a 6 frases
+        paragrafos, i = [], 0
+        while i < len(frases):
+            passo = rng.randint(3, 6)
+            paragrafos.append(' '.join(frases[i:i + passo]))
+            i += passo
+        return '\n\n'.join(paragrafos)
+
+    def _local(self) -> Dict:
+        rng = self.rng
+        if rng.random() < 0.15:
+            return {'job_city': None, 'job_state': None, 'job_country': rng.choice(['BR', 'Brazil']), 'job_is_remote': True}
+
+        cidade, uf, aliases = rng.choices(CIDADES, weights=_PESOS_CIDADES)[0]
+        if aliases and rng.random() < 0.3:
+            cidade = rng.choice(aliases)
+        elif rng.random() < 0.1:
+            cidade = cidade.upper()
+        estado = rng.choice([uf, uf, ESTADOS.get(uf, uf), None])
+        return {'job_city': cidade, 'job_state': estado, 'job_country': rng.choice(['BR', 'BR', 'Brazil', None]),
+                'job_is_remote': rng.random() < 0.05}
+
+    def _nova(self) -> Dict:
+        rng = self.rng
+        skills = list(dict.fromkeys(s for s, _ in rng.choices(_SKILLS, weights=_PESOS_SKILLS, k=rng.randint(2, 10))))
+        nivel = rng.choice(NIVEIS)
+        titulo = f"{rng.choice(CARGOS)} {rng.choice(skills)} {nivel}".strip()
+        postado = self.base_data + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+
+        job = {
+            'job_id': f"job-{self.contador}",
+            'job_title': titulo,
+            'employer_name': rng.choice(self.empresas),
+            'job_publisher': rng.choice(PUBLICADORES),
+            'job_description': self._descricao(skills),
+            'job_apply_link': f"https://vagas.exemplo.com/{self.contador}",
+            'job_google_link': f"https://www.google.com/search?q=job-{self.contador}",
+            'job_posted_at_datetime_utc': postado.isoformat().replace('+00:00', 'Z'),
+        }
+        job.update(self._local())
+        return job
+
+    def _sindicada(self, original: Dict) -> Dict:
+        """Mesma vaga republicada por outro agregador, com pequenas variações"""
+        rng = self.rng
+        titulo = original['job_title']
+        variacao = rng.randrange(4)
+        if variacao == 0:
+            titulo = titulo.replace('Sênior', 'Senior').replace('Júnior', 'Junior')
+        elif variacao == 1:
+            titulo = f"{titulo} - Remoto" if original.get('job_is_remote') else f"{titulo} (Híbrido)"
+        elif variacao == 2:
+            titulo = titulo.upper() if rng.random() < 0.3 else titulo.lower()
+
+        job = dict(original)
+        job.update({
+            'job_id': f"job-{self.contador}",
+            'job_title': titulo,
+            'job_publisher': rng.choice(PUBLICADORES),
+            'job_apply_link': f"https://{job['job_publisher'].lower().replace(' ', '')}.exemplo.com/{self.contador}",
+            'job_google_link': f"https://www.google.com/search?q=job-{self.contador}",
+        })
+        if rng.random() < 0.5:
+            job['job_description'] = original['job_description'] + "\n\n" + rng.choice(FRASES)
+        return job
+
+    def vaga(self) -> Dict:
+        if self.recentes and self.rng.random() < self.taxa_duplicatas:
+            job = self._sindicada(self.rng.choice(self.recentes))
+        else:
+            job = self._nova()
+            self.recentes.append(job)
+        self.contador += 1
+        return job
+
+
+def gerar_jobs(n: int, semente=42, taxa_duplicatas: float = 0.1) -> Iterator[Dict]:
+    """Gera `n` vagas JSearch determinísticas"""
+    gerador = GeradorCorpus(semente, taxa_duplicatas)
+    for _ in range(n):
+        yield gerador.vaga()
+
+
+def gerar_pagina(query: str, pagina: int, por_pagina: int = 10, semente=42) -> List[Dict]:
+    """Página determinística de resultados para (query, página), como o stub do JSearch serve"""
+    gerador = GeradorCorpus(f"{semente}|{query}|{pagina}")
+    gerador.contador = (pagina - 1) * por_pagina
+    return [gerador.vaga() for _ in range(por_pagina)]
+
+
+def salvar_jsonl(caminho: str, jobs) -> int:
+    """Grava as vagas em JSON Lines e retorna quantas foram gravadas"""
+    total = 0
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        for job in jobs:
+            arquivo.write(json.dumps(job, ensure_ascii=False) + '\n')
+            total += 1
+    return total
+
+
+def ler_jsonl(caminho: str, limite: Optional[int] = None) -> Iterator[Dict]:
+    with open(caminho, encoding='utf-8') as arquivo:
+        for i, linha in enumerate(arquivo):
+            if limite is not None and i >= limite:
+                break
+            yield json.loads(linha)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um corpus sintético de vagas JSearch")
+    parser.add_argument('--n', type=int, default=10_000)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--duplicatas', type=float, default=0.1, help="Fração de vagas sindicadas")
+    parser.add_argument('--saida', default='corpus.jsonl')
+    args = parser.parse_args()
+
+    total = salvar_jsonl(args.saida, gerar_jobs(args.n, args.semente, args.duplicatas))
+    print(f"✅ {total} vagas gravadas em {args.saida}")
@@ -0,0 +1,381 @@
+"""
+Benchmarks reproduzíveis do pipeline de vagas (offline)
+
+Mede vazão (itens/s) e pico de memória (tracemalloc) da extração, skills,
+deduplicação, normalização de locais, agregados do VagasAnalyzer, do
+backfill/arquivo bruto e da coleta ponta a ponta contra o stub local do JSearch. Cada execução é
+anexada a benchmarks/resultados.jsonl e comparada com a anterior.
+
+    python benchmarks/executar.py --n 10000
+    python benchmarks/executar.py --n 100000 --casos extrair_skills remover_duplicatas
+    python benchmarks/executar.py --listar
+
+O corpus fica todo em memória (~3 KB por vaga): 1M vagas pedem ~3 GB.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(AQUI)
+for caminho in (RAIZ, AQUI):
+    if caminho not in sys.path:
+        sys.path.insert(0, caminho)
+
+from corpus import gerar_jobs  # noqa: E402
+
+RESULTADOS = os.path.join(AQUI, 'resultados.jsonl')
+
+# Agregados do VagasAnalyzer medidos com o cache invalidado (custo após cada mudança nos dados)
+AGREGADOS = [
+    ('get_estatisticas', ()),
+    ('get_top_skills', (15,)),
+    ('get_vagas_por_local', ()),
+    ('get_vagas_por_empresa', (10,)),
+    ('get_skills_por_local', (5,)),
+    ('get_skills_por_empresa', (5,)),
+    ('get_coocorrencia_skills', (15,)),
+    ('get_opcoes_filtros', ()),
+    ('get_dataframe', ()),
+]
+
+
+class Contexto:
+    """Corpus e objetos compartilhados pelos casos, criados sob demanda"""
+
+    def __init__(self, n: int, semente: int, duplicatas: float):
+        self.n = n
+        self.semente = semente
+        self.duplicatas = duplicatas
+        self._jobs = None
+        self._vagas = None
+        self._scraper = None
+        self._analyzer = None
+        self._indice = None
+        self._arquivo = None
+
+    @property
+    def jobs(self) -> List[Dict]:
+        if self._jobs is None:
+            self._jobs = list(gerar_jobs(self.n, self.semente, self.duplicatas))
+        return self._jobs
+
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            from scraper import VagasScraper
+            self._scraper = VagasScraper(fontes=['jsearch'])
+        return self._scraper
+
+    @property
+    def vagas(self) -> List[Dict]:
+        if self._vagas is None:
+            extrair = self.scraper._extrair_dados_jsearch
+            self._vagas = [vaga for vaga in map(extrair, self.jobs) if vaga]
+            for vaga in self._vagas:
+                vaga.pop('descricao', None)
+        return self._vagas
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            from analyzer import VagasAnalyzer
+            self._analyzer = VagasAnalyzer(self.vagas)
+        return self._analyzer
+
+
+    @property
+    def indice(self):
+        if self._indice is None:
+            from indice import IndiceVagas
+            self._indice = IndiceVagas()
+            self._indice.adicionar(self._vagas_com_descricao())
+            self._indice.contar('python')  # importa o numpy fora da medição
+        return self._indice
+
+    @property
+    def arquivo(self):
+        """Corpus arquivado em páginas de 10 vagas, num diretório temporário"""
+        if self._arquivo is None:
+            import tempfile
+            from arquivo import ArquivoRespostas
+            self._arquivo = ArquivoRespostas(tempfile.mkdtemp(prefix='vagas-arquivo-'))
+            for inicio in range(0, len(self.jobs), 10):
+                resposta = {'status': 'OK', 'data': self.jobs[inicio:inicio + 10]}
+                self._arquivo.salvar('JSearch', 'python', inicio // 10 + 1, resposta)
+        return self._arquivo
+
+    def _vagas_com_descricao(self) -> List[Dict]:
+        return [{**vaga, 'descricao': job['job_description']} for vaga, job in zip(self.vagas, self.jobs)]
+
+
+CASOS: Dict[str, Callable[[Contexto], int]] = {}
+# Recursos do Contexto que cada caso usa, preparados antes de começar a medir
+REQUISITOS: Dict[str, tuple] = {}
+
+
+def caso(nome: str, requer: tuple = ('jobs', 'scraper')):
+    """Registra um caso; a função roda o trabalho e retorna quantos itens processou"""
+    def decorador(funcao):
+        CASOS[nome] = funcao
+        REQUISITOS[nome] = requer
+        return funcao
+    return decorador
+
+
+@caso('extrair_skills')
+def _extrair_skills(ctx: Contexto) -> int:
+    extrair = ctx.scraper._extrair_skills
+    for job in ctx.jobs:
+        extrair(job['job_description'])
+    return len(ctx.jobs)
+
+
+# Laço de substrings que o SkillMatcher substituiu: referência para comparar com extrair_skills
+SKILLS_SUBSTRING = [
+    'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
+    'node', 'django', 'flask', 'fastapi', 'spring', 'sql', 'postgresql',
+    'mysql', 'mongodb', 'redis', 'docker', 'kubernetes', 'aws', 'azure',
+    'gcp', 'git', 'api', 'rest', 'graphql', 'machine learning', 'data science',
+    'pandas', 'numpy', 'tensorflow', 'pytorch', 'spark', 'hadoop', 'airflow',
+    'ci/cd', 'devops', 'agile', 'scrum', 'html', 'css', 'bootstrap', 'tailwind',
+]
+
+
+@caso('extrair_skills.substring', requer=('jobs',))
+def _extrair_skills_substring(ctx: Contexto) -> int:
+    for job in ctx.jobs:
+        texto = job['job_description'].lower()
+        list({skill.title() for skill in SKILLS_SUBSTRING if skill in texto})
+    return len(ctx.jobs)
+
+
+@caso('extrair_dados_jsearch')
+def _extrair_dados_jsearch(ctx: Contexto) -> int:
+    extrair = ctx.scraper._extrair_dados_jsearch
+    for job in ctx.jobs:
+        extrair(job)
+    return len(ctx.jobs)
+
+
+@caso('remover_duplicatas', requer=('vagas',))
+def _remover_duplicatas(ctx: Contexto) -> int:
+    ctx.scraper._remover_duplicatas(ctx.vagas, set())
+    return len(ctx.vagas)
+
+
+def _remover_duplicatas_aproximada(ctx: Contexto, fracao: int = 1) -> int:
+    from dedup import DeduplicadorVagas
+    vagas = ctx._vagas_com_descricao()[:ctx.n // fracao]
+    ctx.scraper._remover_duplicatas(vagas, DeduplicadorVagas())
+    return len(vagas)
+
+
+# Com n/4, n/2 e n vagas: itens/s estável indica custo linear no tamanho da entrada
+for _fracao in (4, 2):
+    caso(f'remover_duplicatas_aproximada.n/{_fracao}', requer=('jobs', 'vagas'))(
+        lambda ctx, fracao=_fracao: _remover_duplicatas_aproximada(ctx, fracao)
+    )
+caso('remover_duplicatas_aproximada', requer=('jobs', 'vagas'))(_remover_duplicatas_aproximada)
+
+
+@caso('normalizar_local', requer=('vagas', 'analyzer'))
+def _normalizar_local(ctx: Contexto) -> int:
+    from locais import normalizar_local
+    normalizar_local.cache_clear()
+    normalizar = ctx.analyzer._normalizar_local
+    for vaga in ctx.vagas:
+        normalizar(vaga['local'])
+    return len(ctx.vagas)
+
+
+@caso('analyzer.construcao', requer=('vagas',))
+def _analyzer_construcao(ctx: Contexto) -> int:
+    from analyzer import VagasAnalyzer
+    VagasAnalyzer(ctx.vagas)
+    return len(ctx.vagas)
+
+
+def _caso_agregado(metodo: str, argumentos: tuple):
+    def executar(ctx: Contexto) -> int:
+        analyzer = ctx.analyzer
+        analyzer._invalidar()
+        getattr(analyzer, metodo)(*argumentos)
+        return len(analyzer.df)
+    return executar
+
+
+for _metodo, _argumentos in AGREGADOS:
+    caso(f'analyzer.{_metodo}', requer=('analyzer',))(_caso_agregado(_metodo, _argumentos))
+
+
+# Consultas típicas do índice: AND, OR, prefixo, skill e exclusão
+CONSULTAS_INDICE = [
+    'python django', 'react OR vue OR angular', 'desenvolv* senior', 'skill:python skill:aws -estagio',
+    'engenheir* NOT junior', 'nubank', 'experiencia', 'skill:py*',
+]
+
+
+@caso('indice.adicionar', requer=('jobs', 'vagas'))
+def _indice_adicionar(ctx: Contexto) -> int:
+    from indice import IndiceVagas
+    IndiceVagas().adicionar(ctx._vagas_com_descricao())
+    return len(ctx.vagas)
+
+
+@caso('indice.buscar', requer=('indice',))
+def _indice_buscar(ctx: Contexto) -> int:
+    """Itens = consultas respondidas (top 20 por BM25)"""
+    for consulta in CONSULTAS_INDICE:
+        ctx.indice.buscar(consulta, 20)
+    return len(CONSULTAS_INDICE)
+
+
+def _backfill(ctx: Contexto, processos: int) -> int:
+    """Extração + skills + dedup a partir de payloads brutos (bytes), em `processos` processos"""
+    from backfill import backfill
+    registros = [('job', json.dumps(job).encode()) for job in ctx.jobs]
+    return backfill(registros, processos=processos)['jobs']
+
+
+caso('backfill.1_processo', requer=('jobs',))(lambda ctx: _backfill(ctx, 1))
+# Um processo por CPU: compare com backfill.1_processo para ver a escala
+caso('backfill.n_processos', requer=('jobs',))(lambda ctx: _backfill(ctx, os.cpu_count() or 1))
+
+
+@caso('arquivo.reprocessar', requer=('arquivo',))
+def _arquivo_reprocessar(ctx: Contexto) -> int:
+    """Leitura dos segmentos + descompressão + extração, sem rede"""
+    return ctx.arquivo.reprocessar(processos=1)['jobs']
+
+
+def _coleta_stub(ctx: Contexto, **falhas) -> int:
+    """Coleta ponta a ponta (HTTP → JSON → extração → dedup) contra o stub local"""
+    from scraper import VagasScraper
+    from stub_jsearch import iniciar_stub
+
+    paginas = max(1, min(ctx.n // 10, 200))
+    stub = iniciar_stub(paginas=paginas, semente=ctx.semente, **falhas)
+    try:
+        scraper = VagasScraper(fontes=['jsearch'], max_workers=8, requisicoes_por_segundo=1000,
+                               jsearch_url=stub.url)
+        scraper.rapidapi_key = scraper.rapidapi_key or 'stub'
+        return sum(len(bloco) for bloco in scraper.iterar_vagas('python', '', paginas))
+    finally:
+        stub.shutdown()
+        stub.server_close()
+
+
+caso('coleta_stub', requer=())(_coleta_stub)
+# 10% das requisições com 429 (Retry-After de 50 ms) ou 503: mede a degradação com retentativas
+caso('coleta_stub_falhas', requer=())(
+    lambda ctx: _coleta_stub(ctx, falhas=0.1, status_falhas=(429, 503), retry_after=0.05)
+)
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir(nome: str, ctx: Contexto, memoria: bool = True) -> Dict:
+    """Roda o caso uma vez para o tempo e, se pedido, outra sob tracemalloc para o pico de memória"""
+    funcao = CASOS[nome]
+    for recurso in REQUISITOS[nome]:
+        getattr(ctx, recurso)
+
+    inicio = time.perf_counter()
+    itens = funcao(ctx)
+    segundos = time.perf_counter() - inicio
+
+    pico_mb = None
+    if memoria:
+        tracemalloc.start()
+        try:
+            funcao(ctx)
+            pico_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'caso': nome,
+        'itens': itens,
+        'segundos': round(segundos, 6),
+        'itens_por_s': round(itens / segundos, 1) if segundos else None,
+        'pico_mb': round(pico_mb, 2) if pico_mb is not None else None,
+    }
+
+
+def _anteriores(caminho: str, n: int) -> Dict[str, Dict]:
+    """Último resultado de cada caso com o mesmo n, para comparação"""
+    anteriores = {}
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                registro = json.loads(linha)
+                if registro.get('n') == n:
+                    anteriores[registro['caso']] = registro
+    return anteriores
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=10_000, help="Tamanho do corpus (10k a 1M)")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--duplicatas', type=float, default=0.1, help="Fração de vagas sindicadas")
+    parser.add_argument('--casos', nargs='+', help="Casos a rodar (padrão: todos)")
+    parser.add_argument('--sem-memoria', action='store_true', help="Não mede o pico de memória (mais rápido)")
+    parser.add_argument('--saida', default=RESULTADOS, help="Arquivo JSONL onde os resultados são anexados")
+    parser.add_argument('--listar', action='store_true', help="Lista os casos e sai")
+    args = parser.parse_args()
+
+    if args.listar:
+        print('\n'.join(CASOS))
+        return 0
+
+    casos = args.casos or list(CASOS)
+    desconhecidos = [nome for nome in casos if nome not in CASOS]
+    if desconhecidos:
+        parser.error(f"casos desconhecidos: {', '.join(desconhecidos)}")
+
+    ctx = Contexto(args.n, args.semente, args.duplicatas)
+    anteriores = _anteriores(args.saida, args.n)
+    base = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'n': args.n,
+        'semente': args.semente,
+    }
+
+    print(f"{'caso':<36} {'itens/s':>12} {'segundos':>10} {'pico MB':>9}  vs anterior")
+    with open(args.saida, 'a', encoding='utf-8') as saida:
+        for nome in casos:
+            resultado = {**base, **medir(nome, ctx, not args.sem_memoria)}
+            saida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+            saida.flush()
+
+            comparacao = ''
+            anterior = anteriores.get(nome)
+            if anterior and anterior.get('itens_por_s') and resultado['itens_por_s']:
+                variacao = resultado['itens_por_s'] / anterior['itens_por_s'] - 1
+                comparacao = f"{variacao:+.1%} ({anterior.get('commit') or '?'})"
+
+            pico = f"{resultado['pico_mb']:.1f}" if resultado['pico_mb'] is not None else '-'
+            print(f"{nome:<36} {resultado['itens_por_s'] or 0:>12,.0f} {resultado['segundos']:>10.3f} {pico:>9}  {comparacao}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
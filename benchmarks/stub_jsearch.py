@@ -0,0 +1,149 @@
+"""
+Stub local do endpoint /search do JSearch, para rodar tudo offline
+
+Serve páginas determinísticas do corpus sintético. Aponte o scraper para
+ele com a variável JSEARCH_URL:
+
+    python benchmarks/stub_jsearch.py --porta 8765 --paginas 50
+    JSEARCH_URL=http://127.0.0.1:8765/search RAPIDAPI_KEY=stub python cli.py coletar -k python -p 5
+
+Também injeta falhas, para exercitar retentativas e o disjuntor:
+
+    python benchmarks/stub_jsearch.py --falhas 0.3 --status-falhas 429 503 --retry-after 1
+    python benchmarks/stub_jsearch.py --paginas-com-falha 3 4
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Optional
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import gerar_pagina  # noqa: E402
+
+
+class StubJSearch(ThreadingHTTPServer):
+    """
+    Servidor HTTP do stub; `url` é o endereço a usar como JSEARCH_URL
+
+    Falhas injetadas: cada requisição falha com probabilidade `falhas`, com
+    um status sorteado de `status_falhas` (429 vem com Retry-After quando
+    `retry_after` é informado); páginas em `paginas_com_falha` sempre
+    respondem 500.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, porta: int = 0, paginas: int = 100, por_pagina: int = 10,
+                 latencia: float = 0.0, semente: int = 42, host: str = '127.0.0.1',
+                 falhas: float = 0.0, status_falhas: Iterable[int] = (429, 503),
+                 retry_after: Optional[float] = None, paginas_com_falha: Iterable[int] = ()):
+        super().__init__((host, porta), _Handler)
+        self.paginas = paginas
+        self.por_pagina = por_pagina
+        self.latencia = latencia
+        self.semente = semente
+        self.falhas = falhas
+        self.status_falhas = list(status_falhas)
+        self.retry_after = retry_after
+        self.paginas_com_falha = set(paginas_com_falha)
+        self.requisicoes = 0
+        self.falhas_injetadas = 0
+        self._rng = random.Random(semente)
+        self._lock = threading.Lock()
+
+    def sortear_falha(self, pagina: int) -> Optional[int]:
+        """Status de erro a responder para esta requisição, ou None"""
+        if pagina in self.paginas_com_falha:
+            status = 500
+        else:
+            with self._lock:
+                if not self.falhas or self._rng.random() >= self.falhas:
+                    return None
+                status = self._rng.choice(self.status_falhas)
+        with self._lock:
+            self.falhas_injetadas += 1
+        return status
+
+    @property
+    def url(self) -> str:
+        host, porta = self.server_address[:2]
+        return f"http://{host}:{porta}/search"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubJSearch
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/search':
+            self.send_error(404)
+            return
+
+        stub = self.server
+        with stub._lock:
+            stub.requisicoes += 1
+        params = parse_qs(url.query)
+        query = params.get('query', [''])[0]
+        pagina = int(params.get('page', ['1'])[0])
+
+        if stub.latencia:
+            time.sleep(stub.latencia)
+
+        status = stub.sortear_falha(pagina)
+        if status is not None:
+            cabecalhos = {'Retry-After': f"{stub.retry_after:g}"} if status == 429 and stub.retry_after is not None else {}
+            self._responder(status, {'message': f"falha injetada ({status})"}, cabecalhos)
+            return
+
+        data = gerar_pagina(query, pagina, stub.por_pagina, stub.semente) if pagina <= stub.paginas else []
+        self._responder(200, {'status': 'OK', 'request_id': f"stub-{stub.requisicoes}", 'data': data})
+
+    def _responder(self, status: int, corpo: dict, cabecalhos: Optional[dict] = None):
+        conteudo = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(conteudo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def iniciar_stub(**opcoes) -> StubJSearch:
+    """Sobe o stub numa thread daemon (porta 0 = porta livre qualquer)"""
+    stub = StubJSearch(**opcoes)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    return stub
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub local do JSearch")
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--paginas', type=int, default=100, help="Páginas com resultados por consulta")
+    parser.add_argument('--por-pagina', type=int, default=10)
+    parser.add_argument('--latencia', type=float, default=0.0, help="Atraso por requisição, em segundos")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--falhas', type=float, default=0.0, help="Probabilidade de cada requisição falhar")
+    parser.add_argument('--status-falhas', type=int, nargs='+', default=[429, 503], help="Status sorteados nas falhas")
+    parser.add_argument('--retry-after', type=float, help="Retry-After (s) enviado com os 429")
+    parser.add_argument('--paginas-com-falha', type=int, nargs='+', default=[], help="Páginas que sempre respondem 500")
+    args = parser.parse_args()
+
+    stub = StubJSearch(args.porta, args.paginas, args.por_pagina, args.latencia, args.semente,
+                       falhas=args.falhas, status_falhas=args.status_falhas, retry_after=args.retry_after,
+                       paginas_com_falha=args.paginas_com_falha)
+    print(f"🧪 Stub do JSearch em {stub.url}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,70 @@
+"""
+Guarda do tempo de importação
+
+Importa cada módulo num processo novo e falha (código 1) se ele carregar
+dependências pesadas que não usa ou passar do orçamento de tempo.
+
+    python benchmarks/tempo_importacao.py
+    python benchmarks/tempo_importacao.py --repeticoes 10 --fator 2
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# módulo → (dependências que não podem ser carregadas, orçamento em segundos)
+ORCAMENTOS = {
+    'scraper': (['bs4', 'soupsieve', 'pandas', 'numpy', 'dotenv'], 0.5),
+    'analyzer': (['pandas', 'numpy', 'pyarrow'], 0.2),
+    'fontes': (['bs4', 'soupsieve', 'lxml'], 0.5),
+    'skills': (['requests', 'pandas', 'numpy'], 0.1),
+    'cli': (['requests', 'pandas', 'numpy', 'streamlit', 'plotly'], 0.1),
+}
+
+_SONDA = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+segundos = time.perf_counter() - inicio
+print(json.dumps({{'segundos': segundos, 'carregados': [m for m in {proibidos!r} if m in sys.modules]}}))
+"""
+
+
+def medir(modulo: str, proibidos, repeticoes: int):
+    """Mediana do tempo de importação e dependências proibidas que foram carregadas"""
+    tempos, carregados = [], set()
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, '-c', _SONDA.format(modulo=modulo, proibidos=list(proibidos))],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout
+        resultado = json.loads(saida.strip().splitlines()[-1])
+        tempos.append(resultado['segundos'])
+        carregados.update(resultado['carregados'])
+    return statistics.median(tempos), sorted(carregados)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--fator', type=float, default=1.0, help="Multiplica os orçamentos (máquinas lentas/CI)")
+    args = parser.parse_args()
+
+    falhas = 0
+    for modulo, (proibidos, orcamento) in ORCAMENTOS.items():
+        segundos, carregados = medir(modulo, proibidos, args.repeticoes)
+        limite = orcamento * args.fator
+        ok = not carregados and segundos <= limite
+        falhas += not ok
+        print(f"{'✅' if ok else '❌'} {modulo:<10} {segundos * 1000:7.1f} ms (orçamento {limite * 1000:.0f} ms)"
+              + (f"  carregou: {', '.join(carregados)}" if carregados else ""))
+
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
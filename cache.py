@@ -0,0 +1,154 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, NamedTuple, Optional
+
+
+CAMINHO_PADRAO = os.path.join('.cache', 'jsearch.sqlite')
+# Leituras acumuladas antes de gravar os acessos num único executemany
+LOTE_ACESSOS = 64
+# Fração acima de max_entradas tolerada antes de despejar
+FOLGA_DESPEJO = 0.1
+
+
+def normalizar_consulta(texto: Optional[str]) -> str:
+    """Keyword/localização como entram na chave: minúsculas e espaços simples"""
+    return ' '.join((texto or '').lower().split())
+
+
+class EntradaCache(NamedTuple):
+    payload: Dict
+    etag: Optional[str]
+    last_modified: Optional[str]
+    salvo_em: float
+    expirada: bool
+
+
+class RespostaCache:
+    """Cache persistente (SQLite) de respostas do JSearch com TTL e despejo LRU
+
+    Os horários de acesso das leituras ficam em memória e são gravados em lote
+    (a ordem LRU é aproximada); o despejo só roda quando a tabela passa de
+    max_entradas mais a folga, e volta a max_entradas de uma vez.
+    """
+
+    def __init__(self, caminho: Optional[str] = None, ttl: float = 6 * 3600, max_entradas: int = 5000):
+        self.caminho = caminho or os.getenv('VAGAS_CACHE_PATH', CAMINHO_PADRAO)
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._lock = threading.Lock()
+        self._acessos: Dict[str, float] = {}
+        self._leituras = 0
+
+        if self.caminho != ':memory:':
+            os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+
+        self._conn = sqlite3.connect(self.caminho, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS respostas (
+                chave TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                salvo_em REAL NOT NULL,
+                acessado_em REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_respostas_acesso ON respostas (acessado_em)')
+        self._conn.commit()
+        self._total = self._conn.execute('SELECT COUNT(*) FROM respostas').fetchone()[0]
+        atexit.register(self.sincronizar)
+
+    @staticmethod
+    def chave(query: str, pagina: int = 1, localizacao: str = '') -> str:
+        """Chave normalizada para (query, página, localização)"""
+        return f'{normalizar_consulta(query)}|{int(pagina)}|{normalizar_consulta(localizacao)}'
+
+    def obter(self, chave: str) -> Optional[EntradaCache]:
+        """Retorna a entrada (mesmo expirada, para revalidação) ou None"""
+        with self._lock:
+            linha = self._conn.execute(
+                'SELECT payload, etag, last_modified, salvo_em FROM respostas WHERE chave = ?', (chave,)
+            ).fetchone()
+            if linha is None:
+                return None
+            self._acessos[chave] = time.time()
+            self._leituras += 1
+            if self._leituras >= LOTE_ACESSOS:
+                self._gravar_acessos()
+                self._conn.commit()
+
+        payload, etag, last_modified, salvo_em = linha
+        return EntradaCache(
+            payload=json.loads(zlib.decompress(payload)),
+            etag=etag,
+            last_modified=last_modified,
+            salvo_em=salvo_em,
+            expirada=time.time() - salvo_em > self.ttl
+        )
+
+    def salvar(self, chave: str, payload: Dict, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Grava uma resposta e despeja as entradas menos usadas além do limite"""
+        agora = time.time()
+        blob = zlib.compress(json.dumps(payload).encode('utf-8'))
+        with self._lock:
+            self._acessos.pop(chave, None)
+            nova = self._conn.execute('SELECT 1 FROM respostas WHERE chave = ?', (chave,)).fetchone() is None
+            self._conn.execute(
+                'INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?, ?)',
+                (chave, blob, etag, last_modified, agora, agora)
+            )
+            self._total += nova
+            if self._total > self.max_entradas * (1 + FOLGA_DESPEJO):
+                self._despejar()
+            self._conn.commit()
+
+    def _gravar_acessos(self):
+        """Grava os acessos pendentes (chamar com o lock; o commit fica com quem chama)"""
+        if self._acessos:
+            self._conn.executemany('UPDATE respostas SET acessado_em = ? WHERE chave = ?',
+                                   [(t, c) for c, t in self._acessos.items()])
+            self._acessos.clear()
+        self._leituras = 0
+
+    def _despejar(self):
+        """Mantém só as max_entradas acessadas mais recentemente"""
+        self._gravar_acessos()
+        self._conn.execute('''
+            DELETE FROM respostas WHERE chave NOT IN (
+                SELECT chave FROM respostas ORDER BY acessado_em DESC LIMIT ?
+            )
+        ''', (self.max_entradas,))
+        self._total = self._conn.execute('SELECT COUNT(*) FROM respostas').fetchone()[0]
+
+    def sincronizar(self):
+        """Grava os acessos ainda pendentes em memória"""
+        with self._lock:
+            self._gravar_acessos()
+            self._conn.commit()
+
+    def renovar(self, chave: str):
+        """Marca uma entrada revalidada (HTTP 304) como fresca novamente"""
+        agora = time.time()
+        with self._lock:
+            self._acessos.pop(chave, None)
+            self._conn.execute('UPDATE respostas SET salvo_em = ?, acessado_em = ? WHERE chave = ?', (agora, agora, chave))
+            self._conn.commit()
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        with self._lock:
+            self._acessos.clear()
+            self._leituras = 0
+            self._conn.execute('DELETE FROM respostas')
+            self._conn.commit()
+            self._total = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM respostas').fetchone()[0]
@@ -0,0 +1,371 @@
+"""
+Linha de comando para coletar e analisar vagas sem o Streamlit
+
+    python cli.py coletar --config consultas.json --store .cache/vagas.sqlite
+    python cli.py coletar -k python -k react -l "São Paulo" --parquet vagas.parquet
+    python cli.py relatorio --store .cache/vagas.sqlite --saida relatorio.json
+    python cli.py agendador --intervalo 900 --consultas 20
+    python cli.py buscar "python django OR skill:react" --top 10
+    python cli.py backfill --arquivo --store .cache/vagas.sqlite --skills skills.json
+
+Os módulos pesados (scraper, pandas...) só são importados dentro dos
+comandos, então `--help` e erros de argumento respondem na hora.
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+def _carregar_config(caminho: Optional[str]) -> Dict:
+    """
+    Lê o arquivo de configuração (JSON)
+
+    Exemplo:
+        {
+          "consultas": [{"keyword": "python", "localizacao": "São Paulo"}, ["react", ""]],
+          "paginas": 2,
+          "fontes": ["jsearch"],
+          "max_workers": 4
+        }
+    """
+    if not caminho:
+        return {}
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def _consultas(config: Dict, args) -> List[Tuple[str, str]]:
+    consultas = []
+    for consulta in config.get('consultas', []):
+        if isinstance(consulta, dict):
+            consultas.append((consulta['keyword'], consulta.get('localizacao', '')))
+        elif isinstance(consulta, str):
+            consultas.append((consulta, ''))
+        else:
+            keyword, localizacao = (list(consulta) + [''])[:2]
+            consultas.append((keyword, localizacao))
+
+    consultas.extend((keyword, args.localizacao) for keyword in args.keyword or [])
+    return consultas
+
+
+def _data_iso(texto: str) -> float:
+    """Data/hora ISO (ex.: 2025-01-31 ou 2025-01-31T12:00) como timestamp, o formato do store"""
+    try:
+        return datetime.fromisoformat(texto).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida (use o formato ISO, ex.: 2025-01-31): {texto!r}")
+
+
+def _escrever_json(dados, saida: Optional[str]):
+    texto = json.dumps(dados, ensure_ascii=False, indent=2, default=str)
+    if saida:
+        with open(saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto + '\n')
+    else:
+        print(texto)
+
+
+def comando_coletar(args) -> int:
+    """Roda as buscas em lote e grava as vagas no store e/ou em Parquet"""
+    config = _carregar_config(args.config)
+    consultas = _consultas(config, args)
+    if not consultas:
+        print("❌ Nenhuma consulta: use --config ou --keyword", file=sys.stderr)
+        return 2
+
+    paginas = args.paginas or config.get('paginas', 1)
+    caminho_store = args.store or config.get('store')
+    caminho_parquet = args.parquet or config.get('parquet')
+
+    inicio = time.perf_counter()
+    # Logs vão para o stderr; o stdout fica só com o resumo em JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        from arquivo import ArquivoRespostas
+        from cache import RespostaCache
+        from scraper import VagasScraper
+
+        scraper = VagasScraper(
+            max_workers=config.get('max_workers', 4),
+            cache=None if args.sem_cache else RespostaCache(config.get('cache')),
+            deduplicacao_aproximada=config.get('deduplicacao_aproximada', True),
+            fontes=config.get('fontes'),
+            arquivo=None if args.sem_arquivo else ArquivoRespostas(config.get('arquivo')),
+        )
+
+        servidor = None
+        if args.metricas_porta:
+            from instrumentacao import servir_metricas
+            servidor = servir_metricas(scraper.metricas, args.metricas_porta)
+
+        store = None
+        if caminho_store or not caminho_parquet:
+            from store import VagasStore
+            store = VagasStore(caminho_store)
+            if scraper.deduplicacao_aproximada:
+                from dedup import DeduplicadorVagas
+                scraper.base_dedup = DeduplicadorVagas.from_store(store)
+
+        vagas = []
+        novas = 0
+        por_consulta = {}
+        erros = []
+        for (keyword, localizacao), bloco in scraper.iterar_vagas_lote(consultas, paginas, args.max_workers):
+            por_consulta[f"{keyword}|{localizacao}"] = len(bloco)
+            erros.extend({**erro, 'consulta': f"{keyword}|{localizacao}"} for erro in bloco.erros)
+            vagas.extend(bloco)
+            if store is not None:
+                novas += len(store.upsert(bloco))
+
+        if caminho_parquet and vagas:
+            from analyzer import VagasAnalyzer
+            with scraper.metricas.cronometro('parquet'):
+                VagasAnalyzer(vagas).exportar_parquet(caminho_parquet)
+
+        if servidor is not None:
+            servidor.shutdown()
+
+    _escrever_json({
+        'consultas': por_consulta,
+        'total_vagas': len(vagas),
+        'novas_no_store': novas if store is not None else None,
+        'store': store.caminho if store is not None else None,
+        'parquet': caminho_parquet if vagas else None,
+        'erros': erros,
+        'segundos': round(time.perf_counter() - inicio, 3),
+        'metricas': scraper.metricas.resumo(),
+    }, args.saida)
+    # Código 3: coleta parcial (algumas páginas ou fontes falharam)
+    return 3 if erros else 0
+
+
+def _relatorio(analyzer, top_n: int) -> Dict:
+    """Agregados do VagasAnalyzer em estruturas serializáveis"""
+    def registros(df):
+        return df.to_dict(orient='records')
+
+    coocorrencia = analyzer.get_coocorrencia_skills(top_n)
+    return {
+        'estatisticas': analyzer.get_estatisticas(),
+        'top_skills': registros(analyzer.get_top_skills(top_n)),
+        'vagas_por_local': registros(analyzer.get_vagas_por_local()),
+        'vagas_por_empresa': registros(analyzer.get_vagas_por_empresa(top_n)),
+        'skills_por_local': registros(analyzer.get_skills_por_local()),
+        'coocorrencia_skills': {
+            linha: {coluna: int(valor) for coluna, valor in valores.items()}
+            for linha, valores in coocorrencia.to_dict(orient='index').items()
+        },
+    }
+
+
+def comando_relatorio(args) -> int:
+    """Gera o relatório JSON do histórico salvo (ou de um arquivo Parquet)"""
+    with contextlib.redirect_stdout(sys.stderr):
+        from analyzer import VagasAnalyzer
+
+        if args.parquet:
+            import pandas as pd
+            vagas = pd.read_parquet(args.parquet).to_dict(orient='records')
+            analyzer = VagasAnalyzer([{**vaga, 'skills': list(vaga['skills'])} for vaga in vagas])
+        else:
+            from store import VagasStore
+            filtros = {chave: valor for chave, valor in (
+                ('empresa', args.empresa), ('local', args.local), ('fonte', args.fonte), ('desde', args.desde)
+            ) if valor is not None}
+            analyzer = VagasAnalyzer.from_store(VagasStore(args.store), **filtros)
+
+    _escrever_json(_relatorio(analyzer, args.top), args.saida)
+    return 0
+
+
+def comando_buscar(args) -> int:
+    """Busca no histórico salvo pelo índice invertido (BM25), sem chamar a API"""
+    with contextlib.redirect_stdout(sys.stderr):
+        from indice import IndiceVagas
+        from store import VagasStore
+
+        inicio = time.perf_counter()
+        indice = IndiceVagas.from_store(VagasStore(args.store))
+        indexacao = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        vagas = indice.buscar(args.consulta, args.top)
+        total = indice.contar(args.consulta)
+        busca = time.perf_counter() - inicio
+
+    _escrever_json({
+        'consulta': args.consulta,
+        'total': total,
+        'indexadas': len(indice),
+        'indexacao_s': round(indexacao, 3),
+        'busca_ms': round(busca * 1000, 3),
+        'vagas': vagas,
+    }, args.saida)
+    return 0
+
+
+def comando_agendador(args) -> int:
+    """Worker que mantém as consultas mais buscadas atualizadas no store (até Ctrl+C)"""
+    from agendador import criar_agendador
+    from arquivo import ArquivoRespostas
+    from store import VagasStore
+
+    store = VagasStore(args.store)
+    for keyword in args.keyword or []:
+        store.registrar_busca(keyword, args.localizacao)
+
+    agendador = criar_agendador(
+        store,
+        arquivo=ArquivoRespostas(),
+        intervalo=args.intervalo,
+        max_consultas=args.consultas,
+        requisicoes_por_minuto=args.requisicoes_por_minuto,
+    )
+
+    servidor = None
+    if args.metricas_porta:
+        from instrumentacao import servir_metricas
+        servidor = servir_metricas(agendador.scraper.metricas, args.metricas_porta)
+
+    try:
+        agendador.executar()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if servidor is not None:
+            servidor.shutdown()
+    return 0
+
+
+def comando_backfill(args) -> int:
+    """Reprocessa respostas brutas (arquivo, cache ou JSON Lines) em vários processos, sem chamar a API"""
+    if args.arquivo is None and not args.cache and not args.jsonl:
+        print("❌ Nenhuma entrada: use --arquivo, --cache e/ou --jsonl", file=sys.stderr)
+        return 2
+
+    with contextlib.redirect_stdout(sys.stderr):
+        from backfill import backfill, registros_arquivo, registros_cache, registros_jsonl
+
+        skills = None
+        if args.skills:
+            with open(args.skills, encoding='utf-8') as arquivo:
+                skills = json.load(arquivo)
+
+        fontes = []
+        if args.arquivo is not None:
+            fontes.append(registros_arquivo(args.arquivo or None, args.desde))
+        if args.cache:
+            fontes.append(registros_cache(args.cache_caminho))
+        for caminho in args.jsonl or []:
+            fontes.append(registros_jsonl(caminho))
+        registros = (registro for fonte in fontes for registro in fonte)
+
+        store = None
+        if args.store or not args.parquet:
+            from store import VagasStore
+            store = VagasStore(args.store)
+
+        consumidores = []
+        if args.parquet:
+            from analyzer import VagasAnalyzer
+            analyzer = VagasAnalyzer([])
+            consumidores.append(analyzer)
+
+        resumo = backfill(registros, store, args.processos, args.lote, skills,
+                          deduplicacao_aproximada=args.dedup_aproximada, consumidores=consumidores)
+
+        if args.parquet and resumo['unicas']:
+            analyzer.exportar_parquet(args.parquet)
+
+    _escrever_json({
+        **resumo,
+        'store': store.caminho if store is not None else None,
+        'parquet': args.parquet if resumo['unicas'] else None,
+    }, args.saida)
+    return 0
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='vagas-tech', description="Coleta e análise de vagas tech")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Logs detalhados (DEBUG)")
+    parser.add_argument('--log-json', action='store_true', help="Logs em JSON, um evento por linha")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    coletar = subparsers.add_parser('coletar', help="Busca vagas em lote e grava os resultados")
+    coletar.add_argument('--config', help="Arquivo JSON com as consultas e opções")
+    coletar.add_argument('-k', '--keyword', action='append', help="Palavra-chave (pode repetir)")
+    coletar.add_argument('-l', '--localizacao', default='', help="Localização das palavras-chave do -k")
+    coletar.add_argument('-p', '--paginas', type=int, help="Páginas por consulta")
+    coletar.add_argument('--max-workers', type=int, help="Consultas em paralelo")
+    coletar.add_argument('--store', help="SQLite do histórico (padrão: .cache/vagas.sqlite)")
+    coletar.add_argument('--parquet', help="Também grava as vagas coletadas neste arquivo Parquet")
+    coletar.add_argument('--sem-cache', action='store_true', help="Ignora o cache de respostas")
+    coletar.add_argument('--sem-arquivo', action='store_true', help="Não guarda as respostas brutas no arquivo")
+    coletar.add_argument('-o', '--saida', help="Grava o resumo JSON neste arquivo em vez do stdout")
+    coletar.add_argument('--metricas-porta', type=int, help="Expõe GET /metrics (JSON) nesta porta durante a coleta")
+    coletar.set_defaults(func=comando_coletar)
+
+    relatorio = subparsers.add_parser('relatorio', help="Relatório JSON das vagas salvas")
+    relatorio.add_argument('--store', help="SQLite do histórico (padrão: .cache/vagas.sqlite)")
+    relatorio.add_argument('--parquet', help="Analisa um arquivo Parquet em vez do store")
+    relatorio.add_argument('--empresa', help="Filtra por empresa")
+    relatorio.add_argument('--local', help="Filtra por localização")
+    relatorio.add_argument('--fonte', help="Filtra por fonte")
+    relatorio.add_argument('--desde', type=_data_iso, help="Só vagas vistas pela primeira vez a partir desta data (ISO)")
+    relatorio.add_argument('--top', type=int, default=15, help="Tamanho dos rankings")
+    relatorio.add_argument('-o', '--saida', help="Grava o relatório neste arquivo em vez do stdout")
+    relatorio.set_defaults(func=comando_relatorio)
+
+    buscar = subparsers.add_parser('buscar', help="Busca no histórico salvo (AND/OR, prefixo*, skill:, -exclusão)")
+    buscar.add_argument('consulta', help='Ex: "python django", "react OR vue", "desenvolv* -estagio", "skill:aws"')
+    buscar.add_argument('--store', help="SQLite do histórico (padrão: .cache/vagas.sqlite)")
+    buscar.add_argument('--top', type=int, default=20, help="Quantas vagas retornar")
+    buscar.add_argument('-o', '--saida', help="Grava o resultado neste arquivo em vez do stdout")
+    buscar.set_defaults(func=comando_buscar)
+
+    agendador = subparsers.add_parser('agendador', help="Atualiza as consultas mais buscadas em segundo plano")
+    agendador.add_argument('--store', help="SQLite do histórico (padrão: .cache/vagas.sqlite)")
+    agendador.add_argument('--intervalo', type=float, default=900, help="Idade máxima de um resultado, em segundos")
+    agendador.add_argument('--consultas', type=int, default=20, help="Quantas consultas populares manter atualizadas")
+    agendador.add_argument('--requisicoes-por-minuto', type=float, default=30, help="Orçamento de requisições do agendador")
+    agendador.add_argument('-k', '--keyword', action='append', help="Já conta esta consulta como buscada (pode repetir)")
+    agendador.add_argument('-l', '--localizacao', default='', help="Localização das palavras-chave do -k")
+    agendador.add_argument('--metricas-porta', type=int, help="Expõe GET /metrics (JSON) nesta porta")
+    agendador.set_defaults(func=comando_agendador)
+
+    backfill = subparsers.add_parser('backfill', help="Reprocessa respostas brutas em vários processos")
+    backfill.add_argument('--arquivo', nargs='?', const='',
+                          help="Lê as respostas do arquivo bruto (padrão: .cache/arquivo)")
+    backfill.add_argument('--desde', type=_data_iso, help="Só respostas arquivadas a partir desta data (ISO)")
+    backfill.add_argument('--cache', action='store_true', help="Lê as respostas do JSearch guardadas no cache")
+    backfill.add_argument('--cache-caminho', help="SQLite do cache (padrão: .cache/jsearch.sqlite)")
+    backfill.add_argument('--jsonl', action='append', help="Arquivo com uma vaga do JSearch por linha (pode repetir)")
+    backfill.add_argument('--store', help="SQLite do histórico (padrão: .cache/vagas.sqlite)")
+    backfill.add_argument('--parquet', help="Também grava as vagas únicas neste arquivo Parquet")
+    backfill.add_argument('--processos', type=int, help="Processos de extração (padrão: um por CPU)")
+    backfill.add_argument('--lote', type=int, default=500, help="Registros por lote enviado a cada processo")
+    backfill.add_argument('--skills', help="JSON {skill: [aliases]} que substitui o dicionário padrão")
+    backfill.add_argument('--dedup-aproximada', action='store_true', help="Deduplicação aproximada (MinHash)")
+    backfill.add_argument('-o', '--saida', help="Grava o resumo JSON neste arquivo em vez do stdout")
+    backfill.set_defaults(func=comando_backfill)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = criar_parser().parse_args(argv)
+
+    from importacao import carregar_env
+    from instrumentacao import configurar_logs
+    configurar_logs('DEBUG' if args.verbose else 'INFO', formato_json=args.log_json, stream=sys.stderr)
+    carregar_env()
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
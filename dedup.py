@@ -0,0 +1,157 @@
+import re
+import threading
+import unicodedata
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from store import chave_vaga
+
+
+_PRIMO = (1 << 31) - 1
+_PALAVRA = re.compile(r'[0-9a-z+#]+')
+
+# Vagas guardadas por balde do LSH: trechos comuns (texto padrão das
+# descrições) colocariam quase todas as vagas nos mesmos baldes
+TAMANHO_MAXIMO_BALDE = 64
+
+
+def _normalizar(texto: str) -> str:
+    texto = (texto or '').lower()
+    if not texto.isascii():
+        texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(_PALAVRA.findall(texto))
+
+
+class DeduplicadorVagas:
+    """
+    Detecta vagas quase duplicadas com MinHash + LSH
+
+    Cada vaga vira um conjunto de shingles (4-gramas de caracteres de
+    título + empresa e 3-gramas de palavras da descrição, se houver). As
+    assinaturas MinHash são divididas em bandas; só vagas que colidem em
+    alguma banda são comparadas, todas de uma vez contra a matriz de
+    assinaturas. Cada balde guarda no máximo TAMANHO_MAXIMO_BALDE vagas (as
+    primeiras), então o custo por vaga é constante.
+
+    `base` é um deduplicador das vagas já guardadas (ver `from_store`): uma
+    vaga quase igual a uma vaga guardada com outra chave (a mesma vaga
+    sindicada em outro site) é descartada; a própria vaga guardada, quando
+    volta numa busca, passa para ser atualizada.
+    """
+
+    def __init__(self, limiar: float = 0.8, num_perm: int = 64, bandas: int = 16, semente: int = 42,
+                 usar_descricao: bool = True, base: Optional['DeduplicadorVagas'] = None):
+        if num_perm % bandas:
+            raise ValueError("num_perm deve ser múltiplo de bandas")
+
+        self.limiar = limiar
+        self.bandas = bandas
+        self.linhas = num_perm // bandas
+        self.usar_descricao = usar_descricao
+        self.base = base
+
+        rng = np.random.default_rng(semente)
+        self._a = rng.integers(1, _PRIMO, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIMO, size=num_perm, dtype=np.uint64)
+
+        # (título, empresa) normalizados → chave da vaga indexada
+        self._exatas: Dict[Tuple[str, str], Optional[str]] = {}
+        # Assinaturas empilhadas (linha = vaga), com capacidade dobrada quando enche
+        self._assinaturas = np.empty((1024, num_perm), dtype=np.uint64)
+        self._chaves: List[Optional[str]] = []
+        self._baldes: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+        # A base é compartilhada entre as threads do app e do agendador
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_store(cls, store, **opcoes) -> 'DeduplicadorVagas':
+        """Base com as vagas do VagasStore (só título + empresa: o store não guarda a descrição)"""
+        base = cls(usar_descricao=False, **opcoes)
+        for bloco in store.iterar():
+            base.carregar(bloco)
+        return base
+
+    def _shingles(self, vaga: Dict) -> Set[int]:
+        base = f"{_normalizar(vaga.get('titulo', ''))} | {_normalizar(vaga.get('empresa', ''))}"
+        shingles = {base[i:i + 4] for i in range(max(1, len(base) - 3))}
+
+        palavras = _normalizar(vaga.get('descricao', '')).split() if self.usar_descricao else []
+        shingles.update(' '.join(palavras[i:i + 3]) for i in range(len(palavras) - 2))
+
+        return {zlib.crc32(s.encode('utf-8')) for s in shingles}
+
+    def assinatura(self, vaga: Dict) -> np.ndarray:
+        """Assinatura MinHash (uint64) da vaga"""
+        hashes = np.fromiter(self._shingles(vaga), dtype=np.uint64)
+        return ((hashes[:, None] * self._a + self._b) % _PRIMO).min(axis=0)
+
+    def _bandas(self, assinatura: np.ndarray):
+        for banda in range(self.bandas):
+            yield banda, assinatura[banda * self.linhas:(banda + 1) * self.linhas].tobytes()
+
+    def _semelhante(self, vaga: Dict, assinatura: np.ndarray) -> Tuple[bool, Optional[str]]:
+        """(se há vaga indexada igual ou parecida, chave dessa vaga)"""
+        exata = (_normalizar(vaga.get('titulo', '')), _normalizar(vaga.get('empresa', '')))
+        if exata in self._exatas:
+            return True, self._exatas[exata]
+
+        candidatos = set()
+        for banda in self._bandas(assinatura):
+            candidatos.update(self._baldes.get(banda, ()))
+        if not candidatos:
+            return False, None
+
+        ids = np.fromiter(candidatos, dtype=np.intp, count=len(candidatos))
+        semelhantes = ids[(self._assinaturas[ids] == assinatura).mean(axis=1) >= self.limiar]
+        if not len(semelhantes):
+            return False, None
+        return True, self._chaves[semelhantes.min()]
+
+    def eh_duplicata(self, vaga: Dict, assinatura: np.ndarray = None) -> bool:
+        """Verifica se a vaga já foi vista (exata ou aproximadamente), aqui ou na base"""
+        if assinatura is None:
+            assinatura = self.assinatura(vaga)
+
+        with self._lock:
+            if self._semelhante(vaga, assinatura)[0]:
+                return True
+        return self.base is not None and self.base.eh_de_outra_vaga(vaga)
+
+    def eh_de_outra_vaga(self, vaga: Dict) -> bool:
+        """Se a vaga é quase igual a uma vaga indexada com outra chave"""
+        with self._lock:
+            semelhante, chave = self._semelhante(vaga, self.assinatura(vaga))
+        return semelhante and chave != (vaga.get('chave') or chave_vaga(vaga))
+
+    def adicionar(self, vaga: Dict) -> bool:
+        """Indexa a vaga; retorna True se ela é nova (não duplicada)"""
+        assinatura = self.assinatura(vaga)
+        with self._lock:
+            if self.eh_duplicata(vaga, assinatura):
+                return False
+
+            chave = vaga.get('chave') or chave_vaga(vaga)
+            indice = len(self._chaves)
+            if indice == len(self._assinaturas):
+                self._assinaturas = np.concatenate([self._assinaturas, np.empty_like(self._assinaturas)])
+            self._assinaturas[indice] = assinatura
+            self._chaves.append(chave)
+            self._exatas.setdefault((_normalizar(vaga.get('titulo', '')), _normalizar(vaga.get('empresa', ''))), chave)
+            for banda in self._bandas(assinatura):
+                balde = self._baldes[banda]
+                if len(balde) < TAMANHO_MAXIMO_BALDE:
+                    balde.append(indice)
+        return True
+
+    def filtrar(self, vagas: Iterable[Dict]) -> List[Dict]:
+        """Retorna só as vagas novas, indexando-as"""
+        return [vaga for vaga in vagas if self.adicionar(vaga)]
+
+    def carregar(self, vagas: Iterable[Dict]) -> 'DeduplicadorVagas':
+        """Indexa vagas já conhecidas (ex.: blocos do VagasStore) sem retorná-las"""
+        for vaga in vagas:
+            self.adicionar(vaga)
+        return self
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import importlib.util
+import io
+from typing import Iterator, Optional
+
+from importacao import importar_preguicoso
+
+np = importar_preguicoso('numpy')
+pd = importar_preguicoso('pandas')
+
+
+# pyarrow é opcional: só é necessário para Parquet/Feather
+ARROW_DISPONIVEL = importlib.util.find_spec('pyarrow') is not None
+
+TAMANHO_BLOCO = 10_000
+
+# Colunas de um arquivo vazio quando o analisador não tem dados (nem colunas)
+COLUNAS_PADRAO = ['titulo', 'empresa', 'local', 'skills', 'link', 'fonte']
+
+
+def _blocos(analyzer, mascara: Optional[np.ndarray] = None, tamanho_bloco: int = TAMANHO_BLOCO,
+            juntar_skills: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Gera o DataFrame filtrado em blocos, já com a coluna `skills` decodificada
+
+    Só um bloco por vez é materializado, então a exportação nunca segura
+    uma segunda cópia completa dos dados.
+    """
+    df = analyzer.df
+    if df.empty:
+        return
+
+    posicoes = np.flatnonzero(mascara) if mascara is not None else np.arange(len(df))
+    for inicio in range(0, len(posicoes), tamanho_bloco):
+        bloco = df.iloc[posicoes[inicio:inicio + tamanho_bloco]]
+        skills = analyzer._decodificar_mascaras(bloco['skills_mask'], juntar_skills)
+        bloco = bloco.drop(columns='skills_mask')
+        bloco.insert(df.columns.get_loc('skills_mask'), 'skills', skills)
+        yield bloco
+
+
+def iterar_csv(analyzer, mascara: Optional[np.ndarray] = None, tamanho_bloco: int = TAMANHO_BLOCO) -> Iterator[bytes]:
+    """Gera o CSV (UTF-8 com BOM, skills separadas por vírgula) em pedaços de bytes"""
+    for i, bloco in enumerate(_blocos(analyzer, mascara, tamanho_bloco, juntar_skills=', ')):
+        texto = bloco.to_csv(index=False, header=(i == 0))
+        yield texto.encode('utf-8-sig' if i == 0 else 'utf-8')
+
+
+def exportar_csv(analyzer, destino, mascara: Optional[np.ndarray] = None, tamanho_bloco: int = TAMANHO_BLOCO) -> int:
+    """Escreve o CSV em `destino` (caminho ou arquivo binário) e retorna os bytes escritos"""
+    escritos = 0
+    arquivo = open(destino, 'wb') if isinstance(destino, str) else destino
+    try:
+        for pedaco in iterar_csv(analyzer, mascara, tamanho_bloco):
+            arquivo.write(pedaco)
+            escritos += len(pedaco)
+    finally:
+        if isinstance(destino, str):
+            arquivo.close()
+    return escritos
+
+
+def csv_em_bytes(analyzer, mascara: Optional[np.ndarray] = None) -> bytes:
+    """CSV em memória, para botões de download"""
+    buffer = io.BytesIO()
+    exportar_csv(analyzer, buffer, mascara)
+    return buffer.getvalue()
+
+
+def _bloco_vazio(analyzer) -> pd.DataFrame:
+    """Bloco sem linhas com as colunas da exportação, para gravar só o esquema"""
+    df = analyzer.df
+    if 'skills_mask' not in df.columns:
+        return pd.DataFrame({coluna: pd.Series(dtype=object if coluna == 'skills' else 'string')
+                             for coluna in COLUNAS_PADRAO})
+
+    bloco = df.iloc[0:0].drop(columns='skills_mask')
+    for coluna in bloco.select_dtypes(['object', 'category']).columns:
+        bloco[coluna] = bloco[coluna].astype('string')
+    bloco.insert(df.columns.get_loc('skills_mask'), 'skills', pd.Series(dtype=object))
+    return bloco
+
+
+def _escrever_arrow(analyzer, destino, formato: str, mascara: Optional[np.ndarray], tamanho_bloco: int):
+    if not ARROW_DISPONIVEL:
+        raise ImportError("Exportar para Parquet/Feather requer o pacote 'pyarrow' (pip install pyarrow)")
+
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+
+    def blocos():
+        vazio = True
+        for bloco in _blocos(analyzer, mascara, tamanho_bloco):
+            vazio = False
+            yield bloco
+        # Sem linhas, o arquivo ainda sai válido, só com o esquema
+        if vazio:
+            yield _bloco_vazio(analyzer)
+
+    escritor = None
+    esquema = None
+    try:
+        for bloco in blocos():
+            # Categóricas viram texto para o esquema ser o mesmo em todos os blocos
+            for coluna in bloco.select_dtypes('category').columns:
+                bloco[coluna] = bloco[coluna].astype('string')
+            if esquema is None:
+                esquema = pa.Schema.from_pandas(bloco, preserve_index=False)
+                esquema = esquema.set(esquema.get_field_index('skills'), pa.field('skills', pa.list_(pa.string())))
+            tabela = pa.Table.from_pandas(bloco, schema=esquema, preserve_index=False)
+            if escritor is None:
+                if formato == 'parquet':
+                    escritor = pq.ParquetWriter(destino, esquema)
+                else:
+                    escritor = pa.ipc.new_file(destino, esquema)
+            escritor.write_table(tabela)
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+
+def exportar_parquet(analyzer, destino, mascara: Optional[np.ndarray] = None, tamanho_bloco: int = TAMANHO_BLOCO):
+    """Escreve Parquet com `skills` como coluna de listas, bloco a bloco"""
+    _escrever_arrow(analyzer, destino, 'parquet', mascara, tamanho_bloco)
+
+
+def exportar_feather(analyzer, destino, mascara: Optional[np.ndarray] = None, tamanho_bloco: int = TAMANHO_BLOCO):
+    """Escreve Feather (Arrow IPC) com `skills` como coluna de listas, bloco a bloco"""
+    _escrever_arrow(analyzer, destino, 'feather', mascara, tamanho_bloco)
+
+
+def parquet_em_bytes(analyzer, mascara: Optional[np.ndarray] = None) -> bytes:
+    """Parquet em memória, para botões de download"""
+    buffer = io.BytesIO()
+    exportar_parquet(analyzer, buffer, mascara)
+    return buffer.getvalue()
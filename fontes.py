@@ -0,0 +1,206 @@
+import importlib.util
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Type
+
+from http_client import Disjuntor, TokenBucket, get_com_retentativas
+from instrumentacao import get_logger
+
+logger = get_logger('fontes')
+
+# BeautifulSoup/soupsieve só são importados quando uma fonte HTML parseia algo
+PARSER_HTML = 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+
+
+@lru_cache(maxsize=None)
+def seletores_programathor() -> Dict:
+    """Seletores CSS pré-compilados dos cards do Programathor"""
+    import soupsieve as sv
+
+    return {
+        'titulo': sv.compile('h2, h3, a.job-title'),
+        'empresa': sv.compile('span.company, div.company-name'),
+        'local': sv.compile('span.location, div.job-location'),
+        'link': sv.compile('a[href]'),
+    }
+
+
+@lru_cache(maxsize=None)
+def filtros_cards_programathor() -> List:
+    """
+    Só os cards de vaga entram na árvore; o resto da página é descartado durante o parse.
+    A classe chega como string bruta ao SoupStrainer, daí a regex.
+    """
+    from bs4 import SoupStrainer
+
+    return [
+        SoupStrainer('div', class_=re.compile(r'(^|\s)job-item(\s|$)')),
+        SoupStrainer('article'),
+    ]
+
+
+class FalhaPagina(Exception):
+    """
+    Página que falhou mesmo após as retentativas
+
+    As fontes a geram (yield) no lugar do bloco da página, em vez de
+    levantar, para que as demais páginas continuem e o resultado parcial
+    saia com os erros explícitos.
+    """
+
+    def __init__(self, fonte: str, pagina: Optional[int], causa: BaseException):
+        super().__init__(f"{fonte} (página {pagina}): {causa}")
+        self.fonte = fonte
+        self.pagina = pagina
+        self.causa = causa
+
+    def como_dict(self) -> Dict:
+        resposta = getattr(self.causa, 'response', None)
+        return {
+            'fonte': self.fonte,
+            'pagina': self.pagina,
+            'erro': type(self.causa).__name__,
+            'mensagem': str(self.causa),
+            'status': resposta.status_code if resposta is not None else None,
+        }
+
+
+class FonteVagas:
+    """
+    Interface de uma fonte de vagas (plugin)
+
+    Cada fonte implementa `buscar` (fetch + parse) e declara seu próprio
+    limite de requisições e timeout. Recursos compartilhados (sessão HTTP,
+    cache, matcher de skills) vêm do scraper. Cada fonte tem seu disjuntor
+    (circuit breaker); `iterar` pode gerar FalhaPagina no lugar de um bloco.
+    """
+
+    nome: str = ''
+    requisicoes_por_segundo: float = 1.0
+    timeout: float = 30.0
+
+    def __init__(self, scraper, requisicoes_por_segundo: Optional[float] = None):
+        self.scraper = scraper
+        if requisicoes_por_segundo is not None:
+            self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.limitador = TokenBucket(self.requisicoes_por_segundo)
+        self.disjuntor = Disjuntor()
+
+    def buscar(self, keyword: str, localizacao: str = "", paginas: int = 1) -> List[Dict]:
+        """Busca e extrai as vagas da fonte"""
+        raise NotImplementedError
+
+    def _juntar(self, keyword: str, localizacao: str, paginas: int) -> List[Dict]:
+        """Junta os blocos de `iterar`, ignorando as páginas que falharam"""
+        vagas = []
+        for bloco in self.iterar(keyword, localizacao, paginas):
+            if not isinstance(bloco, FalhaPagina):
+                vagas.extend(bloco)
+        return vagas
+
+    def iterar(self, keyword: str, localizacao: str = "", paginas: int = 1) -> Iterator[List[Dict]]:
+        """Gera as vagas em blocos à medida que chegam (padrão: um bloco com tudo)"""
+        yield self.buscar(keyword, localizacao, paginas)
+
+
+class JSearchFonte(FonteVagas):
+    """JSearch API (LinkedIn, Indeed, Glassdoor, etc)"""
+
+    nome = 'JSearch'
+    requisicoes_por_segundo = 2.0
+    timeout = 60.0
+
+    def buscar(self, keyword: str, localizacao: str = "", paginas: int = 1) -> List[Dict]:
+        return self.scraper.buscar_jsearch(keyword, localizacao, paginas)
+
+    def iterar(self, keyword: str, localizacao: str = "", paginas: int = 1) -> Iterator[List[Dict]]:
+        return self.scraper.iterar_jsearch(keyword, localizacao, paginas)
+
+
+class ProgramathorFonte(FonteVagas):
+    """Listagem de vagas do Programathor (HTML)"""
+
+    nome = 'Programathor'
+    requisicoes_por_segundo = 1.0
+    timeout = 20.0
+    url = "https://programathor.com.br/jobs"
+
+    def buscar(self, keyword: str, localizacao: str = "", paginas: int = 1) -> List[Dict]:
+        return self._juntar(keyword, localizacao, paginas)
+
+    def iterar(self, keyword: str, localizacao: str = "", paginas: int = 1) -> Iterator[List[Dict]]:
+        metricas = self.scraper.metricas
+        for pagina in range(1, max(1, paginas) + 1):
+            params = {'q': keyword}
+            if pagina > 1:
+                params['page'] = pagina
+
+            try:
+                response = get_com_retentativas(
+                    self.scraper.session, self.url, self.nome, self.limitador, self.disjuntor,
+                    metricas=metricas, params=params, headers=self.scraper.headers, timeout=10
+                )
+                response.raise_for_status()
+            except Exception as e:
+                metricas.registrar_erro(self.nome)
+                yield FalhaPagina(self.nome, pagina, e)
+                # Sem a listagem não dá para saber se há mais páginas
+                break
+
+            with metricas.cronometro('parse_html'):
+                vagas_pagina = self.parsear(response.content, localizacao)
+            if not vagas_pagina:
+                break
+            yield vagas_pagina
+
+    def _cards(self, conteudo):
+        """Parseia apenas os cards de vaga (div.job-item, senão article)"""
+        from bs4 import BeautifulSoup
+
+        for filtro in filtros_cards_programathor():
+            soup = BeautifulSoup(conteudo, PARSER_HTML, parse_only=filtro)
+            cards = soup.find_all(recursive=False)
+            if cards:
+                return cards
+        return []
+
+    def parsear(self, conteudo, localizacao: str = "") -> List[Dict]:
+        """Extrai as vagas de uma página de listagem (bytes ou str)"""
+        vagas = []
+
+        for card in self._cards(conteudo)[:20]:  # Limita a 20 vagas
+            try:
+                vaga = self.scraper._extrair_dados_programathor(card)
+
+                # Filtro de localização se especificado
+                if localizacao and localizacao.lower() not in vaga['local'].lower():
+                    continue
+
+                vagas.append(vaga)
+
+            except Exception as e:
+                logger.warning("Erro ao processar vaga: %s", e, extra={'fonte': self.nome})
+                continue
+
+        return vagas
+
+    def parsear_paginas(self, conteudos: Iterable, localizacao: str = "") -> List[Dict]:
+        """Extrai vagas de várias páginas salvas de uma vez"""
+        vagas = []
+        for conteudo in conteudos:
+            vagas.extend(self.parsear(conteudo, localizacao))
+        return vagas
+
+
+FONTES: Dict[str, Type[FonteVagas]] = {
+    'jsearch': JSearchFonte,
+    'programathor': ProgramathorFonte,
+}
+
+
+def registrar_fonte(chave: str):
+    """Decorador para registrar uma nova fonte em FONTES"""
+    def decorador(cls: Type[FonteVagas]) -> Type[FonteVagas]:
+        FONTES[chave] = cls
+        return cls
+    return decorador
@@ -0,0 +1,221 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentacao import get_logger
+
+logger = get_logger('http')
+
+
+class TokenBucket:
+    """Limitador de taxa (token bucket) compartilhável entre threads"""
+
+    def __init__(self, taxa: float = 2.0, capacidade: Optional[float] = None):
+        self.taxa = taxa
+        self.capacidade = capacidade if capacidade is not None else max(1.0, taxa)
+        self._tokens = self.capacidade
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reabastecer(self):
+        agora = time.monotonic()
+        self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+        self._ultimo = agora
+
+    def adquirir(self, tokens: float = 1.0):
+        """Bloqueia até haver tokens disponíveis"""
+        while True:
+            with self._lock:
+                self._reabastecer()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                espera = (tokens - self._tokens) / self.taxa
+            time.sleep(espera)
+
+    def pausar(self, segundos: float):
+        """Esvazia o balde por `segundos` (ex.: Retry-After de um 429), atrasando todas as threads"""
+        with self._lock:
+            self._reabastecer()
+            self._tokens = min(self._tokens, 0.0) - segundos * self.taxa
+
+
+def criar_sessao(headers: Optional[Dict] = None, pool_maxsize: int = 10) -> requests.Session:
+    """Cria uma Session com pool de conexões keep-alive"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class CircuitoAberto(Exception):
+    """A fonte falhou demais em sequência e está em pausa"""
+
+
+class Disjuntor:
+    """
+    Circuit breaker por fonte
+
+    Depois de `falhas_para_abrir` falhas seguidas, abre e recusa chamadas
+    por `tempo_aberto` segundos; passado esse tempo, deixa uma chamada de
+    teste passar (meio-aberto) e fecha de novo se ela der certo.
+    """
+
+    def __init__(self, falhas_para_abrir: int = 5, tempo_aberto: float = 30.0):
+        self.falhas_para_abrir = falhas_para_abrir
+        self.tempo_aberto = tempo_aberto
+        self.falhas = 0
+        self._aberto_ate: Optional[float] = None
+        self._testando = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self) -> str:
+        with self._lock:
+            if self._aberto_ate is None:
+                return 'fechado'
+            return 'aberto' if time.monotonic() < self._aberto_ate else 'meio_aberto'
+
+    def permitir(self):
+        """Levanta CircuitoAberto se a chamada não deve ser feita agora"""
+        with self._lock:
+            if self._aberto_ate is None:
+                return
+            restante = self._aberto_ate - time.monotonic()
+            if restante > 0 or self._testando:
+                raise CircuitoAberto(f"circuito aberto por mais {max(0.0, restante):.0f}s")
+            self._testando = True
+
+    def registrar_sucesso(self):
+        with self._lock:
+            self.falhas = 0
+            self._aberto_ate = None
+            self._testando = False
+
+    def liberar(self):
+        """Encerra a chamada de teste sem contar sucesso nem falha (ex.: 429)"""
+        with self._lock:
+            self._testando = False
+
+    def registrar_falha(self):
+        with self._lock:
+            self.falhas += 1
+            if self._testando or self.falhas >= self.falhas_para_abrir:
+                self._aberto_ate = time.monotonic() + self.tempo_aberto
+            self._testando = False
+
+
+class PoliticaRetentativa:
+    """Backoff exponencial com jitter ('full jitter'), respeitando o Retry-After"""
+
+    def __init__(self, tentativas: int = 4, base: float = 0.5, maximo: float = 30.0,
+                 status: Iterable[int] = (429, 500, 502, 503, 504)):
+        self.tentativas = tentativas
+        self.base = base
+        self.maximo = maximo
+        self.status = frozenset(status)
+
+    def espera(self, tentativa: int, response: Optional[requests.Response] = None) -> float:
+        """Segundos antes da próxima tentativa (`tentativa` começa em 0)"""
+        retry_after = retry_after_segundos(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.maximo) + random.uniform(0, self.base)
+        return random.uniform(0, min(self.maximo, self.base * 2 ** tentativa))
+
+
+def retry_after_segundos(response: requests.Response) -> Optional[float]:
+    """Valor do Retry-After (segundos ou data HTTP) ou None"""
+    valor = response.headers.get('Retry-After')
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, data.timestamp() - time.time())
+
+
+def get_com_retentativas(session: requests.Session, url: str, fonte: str = '',
+                         limitador: Optional[TokenBucket] = None, disjuntor: Optional[Disjuntor] = None,
+                         politica: Optional[PoliticaRetentativa] = None, metricas=None,
+                         **kwargs) -> requests.Response:
+    """
+    GET resiliente: limitador → disjuntor → requisição, com retentativas
+
+    Erros de conexão, timeouts e os status da política são tentados de novo
+    com backoff. Um 429 pausa o limitador da fonte inteira pelo Retry-After,
+    então todas as threads desaceleram juntas em vez de insistir; ele não
+    conta como falha no disjuntor. Retorna a última resposta (o chamador
+    decide sobre `raise_for_status`) ou levanta a última exceção; levanta
+    CircuitoAberto sem tentar se o disjuntor estiver aberto. Outras
+    exceções sobem na hora, registradas como falha.
+    """
+    politica = politica or PoliticaRetentativa()
+    for tentativa in range(politica.tentativas):
+        if disjuntor is not None:
+            disjuntor.permitir()
+        if limitador is not None:
+            if metricas is not None:
+                with metricas.cronometro('limitador'):
+                    limitador.adquirir()
+            else:
+                limitador.adquirir()
+
+        inicio = time.perf_counter()
+        response, erro = None, None
+        try:
+            response = session.get(url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            erro = e
+        except Exception:
+            # Outros erros não são tentados de novo, mas contam como falha
+            # (senão a chamada de teste do meio-aberto nunca termina)
+            if disjuntor is not None:
+                disjuntor.registrar_falha()
+            raise
+        finally:
+            if metricas is not None:
+                metricas.registrar_tempo('http', time.perf_counter() - inicio)
+                metricas.registrar_requisicao(fonte, time.perf_counter() - inicio)
+
+        if erro is None and response.status_code not in politica.status:
+            if disjuntor is not None:
+                disjuntor.registrar_sucesso()
+            return response
+
+        if disjuntor is not None:
+            # 429 é limite de taxa, não falha da fonte: quem desacelera é o limitador
+            if response is not None and response.status_code == 429:
+                disjuntor.liberar()
+            else:
+                disjuntor.registrar_falha()
+        if tentativa == politica.tentativas - 1:
+            break
+
+        espera = politica.espera(tentativa, response)
+        if metricas is not None:
+            metricas.registrar_retentativa(fonte)
+        logger.info("%s: %s; nova tentativa em %.1fs", fonte or url,
+                    erro or f"HTTP {response.status_code}", espera,
+                    extra={'fonte': fonte, 'tentativa': tentativa + 1, 'espera_s': round(espera, 3),
+                           'status': response.status_code if response is not None else None})
+        if response is not None and response.status_code == 429 and limitador is not None:
+            limitador.pausar(espera)
+        else:
+            time.sleep(espera)
+
+    if erro is not None:
+        raise erro
+    return response
@@ -0,0 +1,34 @@
+import importlib
+from types import ModuleType
+
+
+class ModuloPreguicoso(ModuleType):
+    """
+    Módulo que só é importado de fato no primeiro acesso a um atributo
+
+    Permite escrever `pd = importar_preguicoso('pandas')` no topo de um
+    módulo sem pagar a importação enquanto nenhuma função usar `pd`.
+    """
+
+    def __getattr__(self, atributo: str):
+        modulo = importlib.import_module(self.__name__)
+        # Copia os atributos para os próximos acessos não passarem por aqui
+        self.__dict__.update(vars(modulo))
+        return getattr(modulo, atributo)
+
+
+def importar_preguicoso(nome: str) -> ModuleType:
+    """Retorna um ModuloPreguicoso para `nome` (ex.: 'pandas', 'numpy')"""
+    return ModuloPreguicoso(nome)
+
+
+_env_carregado = False
+
+
+def carregar_env():
+    """Carrega o .env uma única vez (chamado pelos pontos de entrada, não na importação)"""
+    global _env_carregado
+    if not _env_carregado:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_carregado = True
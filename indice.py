@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import bisect
+import pickle
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from importacao import importar_preguicoso
+from registro import CodificadorSkills
+from store import chave_vaga
+
+np = importar_preguicoso('numpy')
+
+# Peso de cada campo na frequência do termo (título e skills contam mais que a descrição)
+PESOS_CAMPOS = {'titulo': 3, 'empresa': 2, 'local': 1, 'descricao': 1}
+PESO_SKILL = 2
+# Campos que entram no índice: se não mudaram, a vaga não é reindexada
+CAMPOS_INDEXADOS = ('titulo', 'empresa', 'local', 'skills')
+# Folga da sincronização, para não perder gravações de outro processo no mesmo instante
+MARGEM_SINCRONIZACAO = 5.0
+
+STOPWORDS = frozenset('''
+    a o as os um uma uns umas de da do das dos em na no nas nos por para com sem e ou que se ao aos
+    the an and or of to in on for with at by is are be as we you our your will
+'''.split())
+
+_TOKEN = re.compile(r'[a-z0-9]+(?:\.[a-z0-9]+)*[+#]*')
+
+
+def _normalizar(texto: str) -> str:
+    texto = (texto or '').lower()
+    if texto.isascii():
+        return texto
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Termos do texto: minúsculas, sem acentos e sem stopwords (mantém c++, c#, node.js)"""
+    return [token for token in _TOKEN.findall(_normalizar(texto)) if token not in STOPWORDS]
+
+
+def _contar(texto: str) -> Counter:
+    contagem = Counter(_TOKEN.findall(_normalizar(texto)))
+    for stopword in STOPWORDS & contagem.keys():
+        del contagem[stopword]
+    return contagem
+
+
+class IndiceVagas:
+    """
+    Índice invertido em memória sobre título, empresa, local, descrição e skills
+
+    Cada termo guarda a lista de documentos (array de uint32, em ordem de
+    inserção) e a frequência ponderada pelo campo. Skills entram como o
+    código do CodificadorSkills do índice (termo 'skill:<código>'); por
+    padrão um codificador próprio, para não mexer no compartilhado.
+
+    Consultas (`buscar`):
+        python django          → as duas palavras (AND implícito)
+        react OR vue           → qualquer uma das cláusulas
+        python -estagio        → exclui (também: NOT estagio)
+        desenvolv*             → prefixo
+        skill:python skill:aws → skill extraída da vaga (aceita prefixo: skill:py*)
+
+    Parênteses e frases não são suportados; a consulta é uma disjunção de
+    cláusulas AND. Os resultados são ordenados por BM25.
+
+    Vagas com a mesma chave substituem a anterior: o documento antigo vira
+    lápide e é descartado em `compactar()`, chamado automaticamente quando
+    as lápides passam de um quarto do índice. Uma versão sem 'descricao'
+    (ex.: lida do store) mantém a descrição indexada antes para a chave.
+    """
+
+    def __init__(self, codificador: Optional[CodificadorSkills] = None, k1: float = 1.2, b: float = 0.75):
+        self.codificador = codificador or CodificadorSkills()
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._limpar()
+
+    def _limpar(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._chaves: List[str] = []
+        self._vagas: List[Optional[Dict]] = []
+        self._tamanhos = array('I')
+        self._vivos = bytearray()
+        self._ids: Dict[str, int] = {}
+        # Descrições indexadas (zlib), para reindexar a vaga quando ela volta sem a descrição
+        self._descricoes: Dict[str, bytes] = {}
+        self._total_tamanhos = 0
+        self._vocabulario: Optional[List[str]] = None
+        self._sincronizado_em: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @classmethod
+    def from_store(cls, store, tamanho_bloco: int = 5000) -> 'IndiceVagas':
+        """Indexa as vagas de um VagasStore (sem descrição, que o store não guarda)"""
+        indice = cls()
+        indice.sincronizar(store, tamanho_bloco)
+        return indice
+
+    def sincronizar(self, store, tamanho_bloco: int = 5000) -> int:
+        """
+        Indexa as vagas gravadas no store desde a última sincronização
+
+        Útil quando outro processo (ex.: `cli.py agendador`) grava no store:
+        vagas novas entram e vagas alteradas substituem a versão indexada
+        (mantendo a descrição já indexada, que o store não guarda).
+        """
+        inicio = time.time() - MARGEM_SINCRONIZACAO
+        total = 0
+        for bloco in store.iterar(atualizadas_desde=self._sincronizado_em, tamanho_bloco=tamanho_bloco):
+            total += self.adicionar(bloco)
+        self._sincronizado_em = inicio
+        return total
+
+    def _termos(self, vaga: Dict) -> Dict[str, int]:
+        frequencias = Counter()
+        for campo, peso in PESOS_CAMPOS.items():
+            contagem = _contar(vaga.get(campo))
+            if peso != 1:
+                contagem = {token: n * peso for token, n in contagem.items()}
+            frequencias.update(contagem)
+
+        indices = self.codificador.indice
+        for skill in vaga.get('skills') or []:
+            if skill not in indices:
+                self.codificador.codificar([skill])
+            termo = f'skill:{indices[skill]}'
+            frequencias[termo] = frequencias.get(termo, 0) + PESO_SKILL
+        return frequencias
+
+    def adicionar(self, vagas: Iterable[Dict]) -> int:
+        """
+        Indexa vagas novas ou alteradas (chave: 'chave' da vaga ou `chave_vaga`)
+
+        A 'descricao', quando presente, é indexada mas não guardada.
+        Retorna quantas vagas foram indexadas.
+        """
+        total = 0
+        with self._lock:
+            for vaga in vagas:
+                chave = vaga.get('chave') or chave_vaga(vaga)
+                descricao = vaga.get('descricao')
+                anterior = self._ids.get(chave)
+                if anterior is not None:
+                    indexada = self._vagas[anterior]
+                    # Mesmos campos indexados e nenhuma descrição nova: só atualiza a vaga guardada
+                    if not descricao and all(indexada.get(campo) == vaga.get(campo) for campo in CAMPOS_INDEXADOS):
+                        self._vagas[anterior] = {**indexada, **vaga}
+                        continue
+                    self._apagar(anterior)
+
+                if descricao:
+                    self._descricoes[chave] = zlib.compress(descricao.encode('utf-8'), 1)
+                elif chave in self._descricoes:
+                    vaga = {**vaga, 'descricao': zlib.decompress(self._descricoes[chave]).decode('utf-8')}
+
+                doc = len(self._chaves)
+                frequencias = self._termos(vaga)
+                for termo, frequencia in frequencias.items():
+                    posting = self._postings.get(termo)
+                    if posting is None:
+                        posting = self._postings[termo] = (array('I'), array('H'))
+                        self._vocabulario = None
+                    posting[0].append(doc)
+                    posting[1].append(frequencia if frequencia < 0xFFFF else 0xFFFF)
+
+                tamanho = sum(frequencias.values())
+                self._chaves.append(chave)
+                self._vagas.append({campo: valor for campo, valor in vaga.items() if campo != 'descricao'})
+                self._tamanhos.append(tamanho)
+                self._vivos.append(1)
+                self._ids[chave] = doc
+                self._total_tamanhos += tamanho
+                total += 1
+
+            if len(self._chaves) > 1000 and len(self._ids) < 0.75 * len(self._chaves):
+                self.compactar()
+        return total
+
+    def _apagar(self, doc: int):
+        self._vivos[doc] = 0
+        self._vagas[doc] = None
+        self._total_tamanhos -= self._tamanhos[doc]
+        del self._ids[self._chaves[doc]]
+
+    def remover(self, chaves: Iterable[str]) -> int:
+        """Remove vagas pela chave; retorna quantas estavam no índice"""
+        removidas = 0
+        with self._lock:
+            for chave in chaves:
+                doc = self._ids.get(chave)
+                if doc is not None:
+                    self._apagar(doc)
+                    self._descricoes.pop(chave, None)
+                    removidas += 1
+        return removidas
+
+    def compactar(self):
+        """Renumera os documentos vivos, descartando as lápides das postings"""
+        with self._lock:
+            vivos = np.frombuffer(bytes(self._vivos), dtype=np.uint8).astype(bool)
+            novos_ids = np.cumsum(vivos, dtype=np.int64) - 1
+
+            postings = {}
+            for termo, (docs, frequencias) in self._postings.items():
+                docs_np = np.frombuffer(docs, dtype=np.uint32)
+                manter = vivos[docs_np]
+                if manter.any():
+                    postings[termo] = (
+                        array('I', novos_ids[docs_np[manter]].astype(np.uint32).tobytes()),
+                        array('H', np.frombuffer(frequencias, dtype=np.uint16)[manter].tobytes()),
+                    )
+
+            self._postings = postings
+            self._vocabulario = None
+            self._chaves = [chave for chave, vivo in zip(self._chaves, self._vivos) if vivo]
+            self._vagas = [vaga for vaga in self._vagas if vaga is not None]
+            self._tamanhos = array('I', (t for t, vivo in zip(self._tamanhos, self._vivos) if vivo))
+            self._vivos = bytearray([1]) * len(self._chaves)
+            self._ids = {chave: doc for doc, chave in enumerate(self._chaves)}
+
+    def _expandir(self, termo: str) -> List[str]:
+        """Termos do índice que casam com um termo de consulta (com '*' = prefixo)"""
+        if termo.startswith('skill:'):
+            nome = termo[6:]
+            prefixo = nome.endswith('*')
+            nome = nome.rstrip('*').lower()
+            return [
+                f'skill:{i}' for skill, i in list(self.codificador.indice.items())
+                if (skill.lower().startswith(nome) if prefixo else skill.lower() == nome)
+            ]
+
+        if not termo.endswith('*'):
+            return [termo]
+
+        if self._vocabulario is None:
+            self._vocabulario = sorted(self._postings)
+        prefixo = termo.rstrip('*')
+        inicio = bisect.bisect_left(self._vocabulario, prefixo)
+        fim = bisect.bisect_left(self._vocabulario, prefixo + '\uffff')
+        return self._vocabulario[inicio:fim]
+
+    @staticmethod
+    def _analisar(consulta: str) -> List[Tuple[List[str], List[str]]]:
+        """Consulta → cláusulas OR de (termos exigidos, termos excluídos)"""
+        clausulas = []
+        exigidos, excluidos = [], []
+        negar = False
+        for palavra in consulta.split():
+            if palavra in ('OR', '|'):
+                clausulas.append((exigidos, excluidos))
+                exigidos, excluidos = [], []
+                continue
+            if palavra == 'AND':
+                continue
+            if palavra == 'NOT':
+                negar = True
+                continue
+
+            if palavra.startswith('-') and len(palavra) > 1:
+                negar, palavra = True, palavra[1:]
+            if palavra.lower().startswith('skill:'):
+                termos = ['skill:' + palavra[6:]]
+            else:
+                termos = tokenizar(palavra)
+                if palavra.endswith('*') and termos:
+                    termos[-1] += '*'
+            (excluidos if negar else exigidos).extend(termos)
+            negar = False
+
+        clausulas.append((exigidos, excluidos))
+        return [(exigidos, excluidos) for exigidos, excluidos in clausulas if exigidos or excluidos]
+
+    def _docs(self, termos: List[str]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        postings = []
+        for termo in termos:
+            posting = self._postings.get(termo)
+            if posting is not None:
+                postings.append((np.frombuffer(posting[0], dtype=np.uint32), np.frombuffer(posting[1], dtype=np.uint16)))
+        return postings
+
+    def _casamentos(self, termo: str, n: int) -> np.ndarray:
+        casa = np.zeros(n, dtype=bool)
+        for docs, _ in self._docs(self._expandir(termo)):
+            casa[docs] = True
+        return casa
+
+    def _avaliar(self, consulta: str) -> Tuple[np.ndarray, Set[str]]:
+        """Máscara dos documentos que casam e termos (expandidos) usados na pontuação"""
+        n = len(self._chaves)
+        vivos = np.frombuffer(bytes(self._vivos), dtype=np.uint8).astype(bool)
+        resultado = np.zeros(n, dtype=bool)
+        pontuados: Set[str] = set()
+
+        for exigidos, excluidos in self._analisar(consulta):
+            clausula = vivos.copy()
+            for termo in exigidos:
+                clausula &= self._casamentos(termo, n)
+                pontuados.update(self._expandir(termo))
+            for termo in excluidos:
+                clausula &= ~self._casamentos(termo, n)
+            resultado |= clausula
+        return resultado, pontuados
+
+    def _bm25(self, termos: Set[str], casam: np.ndarray) -> np.ndarray:
+        n = len(self._chaves)
+        vivos = max(1, len(self._ids))
+        media = self._total_tamanhos / vivos or 1.0
+        normalizacao = self.k1 * (1 - self.b + self.b * np.frombuffer(self._tamanhos, dtype=np.uint32) / media)
+
+        pontuacoes = np.zeros(n, dtype=np.float64)
+        for docs, frequencias in self._docs(sorted(termos)):
+            idf = np.log(1 + (vivos - len(docs) + 0.5) / (len(docs) + 0.5))
+            tf = frequencias.astype(np.float64)
+            pontuacoes[docs] += idf * tf * (self.k1 + 1) / (tf + normalizacao[docs])
+        pontuacoes[~casam] = -np.inf
+        return pontuacoes
+
+    def buscar(self, consulta: str, limite: Optional[int] = 20) -> List[Dict]:
+        """Vagas que casam com a consulta, ordenadas por BM25 (cada uma com 'pontuacao')"""
+        with self._lock:
+            if not self._chaves:
+                return []
+            casam, termos = self._avaliar(consulta)
+            encontrados = np.flatnonzero(casam)
+            if not len(encontrados):
+                return []
+
+            pontuacoes = self._bm25(termos, casam)
+            if limite is not None and limite < len(encontrados):
+                encontrados = encontrados[np.argpartition(-pontuacoes[encontrados], limite - 1)[:limite]]
+            encontrados = encontrados[np.argsort(-pontuacoes[encontrados], kind='stable')]
+
+            return [{**self._vagas[doc], 'pontuacao': round(float(pontuacoes[doc]), 4)} for doc in encontrados]
+
+    def contar(self, consulta: str) -> int:
+        """Quantas vagas casam com a consulta"""
+        with self._lock:
+            if not self._chaves:
+                return 0
+            return int(self._avaliar(consulta)[0].sum())
+
+    def chaves(self, consulta: str) -> Set[str]:
+        """Chaves de todas as vagas que casam com a consulta (sem ordenar)"""
+        with self._lock:
+            if not self._chaves:
+                return set()
+            casam, _ = self._avaliar(consulta)
+            return {self._chaves[doc] for doc in np.flatnonzero(casam)}
+
+    def salvar(self, caminho: str):
+        """Grava o índice em disco (pickle comprimido), já compactado"""
+        with self._lock:
+            self.compactar()
+            estado = (self._postings, self._chaves, self._vagas, self._tamanhos, self._total_tamanhos,
+                      self.codificador.skills, self._descricoes)
+            dados = zlib.compress(pickle.dumps(estado, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(dados)
+
+    @classmethod
+    def carregar(cls, caminho: str, codificador: Optional[CodificadorSkills] = None) -> 'IndiceVagas':
+        """Lê um índice gravado por `salvar` (só abra arquivos confiáveis: é um pickle)"""
+        with open(caminho, 'rb') as arquivo:
+            estado = pickle.loads(zlib.decompress(arquivo.read()))
+        # Arquivos antigos não têm as descrições
+        postings, chaves, vagas, tamanhos, total_tamanhos, skills = estado[:6]
+        descricoes = estado[6] if len(estado) > 6 else {}
+
+        indice = cls(codificador)
+        # Os termos 'skill:<código>' usam a numeração de quem salvou; realinha com o codificador atual
+        if skills != indice.codificador.skills[:len(skills)]:
+            indice.codificador.codificar(skills)
+            renumerar = {f'skill:{i}': f'skill:{indice.codificador.indice[skill]}' for i, skill in enumerate(skills)}
+            postings = {renumerar.get(termo, termo): posting for termo, posting in postings.items()}
+
+        indice._postings = postings
+        indice._chaves = chaves
+        indice._vagas = vagas
+        indice._tamanhos = tamanhos
+        indice._vivos = bytearray([1]) * len(chaves)
+        indice._ids = {chave: doc for doc, chave in enumerate(chaves)}
+        indice._total_tamanhos = total_tamanhos
+        indice._descricoes = descricoes
+        return indice
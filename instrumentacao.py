@@ -0,0 +1,172 @@
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict
+
+# Atributos padrão de LogRecord; o que sobrar veio de `extra=` e vai para o JSON
+_ATRIBUTOS_LOG = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def get_logger(nome: str) -> logging.Logger:
+    """Logger filho de 'vagas_tech' (configurado de uma vez por `configurar_logs`)"""
+    return logging.getLogger(f'vagas_tech.{nome}')
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por evento, com os campos passados em `extra=`"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        evento = {
+            'ts': round(record.created, 3),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        evento.update({k: v for k, v in vars(record).items() if k not in _ATRIBUTOS_LOG})
+        if record.exc_info:
+            evento['exc'] = self.formatException(record.exc_info)
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+def configurar_logs(nivel: str = 'INFO', formato_json: bool = False, stream=None) -> logging.Logger:
+    """Configura o logger 'vagas_tech' (texto legível ou JSON por linha)"""
+    logger = logging.getLogger('vagas_tech')
+    logger.setLevel(nivel)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(FormatadorJSON() if formato_json else logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    logger.addHandler(handler)
+    logger.propagate = False
+    return logger
+
+
+class Metricas:
+    """
+    Tempos por etapa, contadores por fonte e taxa de acerto do cache
+
+    Thread-safe: as páginas e fontes rodam em threads e registram aqui ao
+    mesmo tempo. Etapas podem se sobrepor (ex.: 'skills' roda dentro de
+    'extracao'), então os tempos não somam o total.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.zerar()
+
+    def zerar(self):
+        with self._lock:
+            self.inicio = time.time()
+            self._etapas: Dict[str, list] = defaultdict(lambda: [0, 0.0, 0.0])  # contagem, total, máximo
+            self._fontes: Dict[str, Dict[str, float]] = defaultdict(
+                lambda: {'requisicoes': 0, 'retentativas': 0, 'erros': 0, 'vagas': 0, 'latencia_total': 0.0}
+            )
+            self._cache = {'acertos': 0, 'revalidadas': 0, 'faltas': 0}
+
+    @contextmanager
+    def cronometro(self, etapa: str):
+        """Mede o bloco e acumula na etapa"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_tempo(etapa, time.perf_counter() - inicio)
+
+    def registrar_tempo(self, etapa: str, segundos: float):
+        with self._lock:
+            acumulado = self._etapas[etapa]
+            acumulado[0] += 1
+            acumulado[1] += segundos
+            acumulado[2] = max(acumulado[2], segundos)
+
+    def registrar_requisicao(self, fonte: str, segundos: float):
+        with self._lock:
+            contadores = self._fontes[fonte]
+            contadores['requisicoes'] += 1
+            contadores['latencia_total'] += segundos
+
+    def registrar_retentativa(self, fonte: str):
+        with self._lock:
+            self._fontes[fonte]['retentativas'] += 1
+
+    def registrar_erro(self, fonte: str):
+        with self._lock:
+            self._fontes[fonte]['erros'] += 1
+
+    def registrar_vagas(self, fonte: str, quantidade: int):
+        with self._lock:
+            self._fontes[fonte]['vagas'] += quantidade
+
+    def registrar_cache(self, resultado: str):
+        """`resultado`: 'acertos', 'revalidadas' (304) ou 'faltas'"""
+        with self._lock:
+            self._cache[resultado] += 1
+
+    def resumo(self) -> Dict:
+        """Snapshot serializável das métricas"""
+        with self._lock:
+            etapas = {
+                etapa: {
+                    'contagem': contagem,
+                    'total_s': round(total, 6),
+                    'media_ms': round(total / contagem * 1000, 3) if contagem else 0.0,
+                    'max_ms': round(maximo * 1000, 3),
+                }
+                for etapa, (contagem, total, maximo) in self._etapas.items()
+            }
+            fontes = {
+                fonte: {
+                    'requisicoes': c['requisicoes'],
+                    'retentativas': c['retentativas'],
+                    'erros': c['erros'],
+                    'vagas': c['vagas'],
+                    'latencia_media_ms': round(c['latencia_total'] / c['requisicoes'] * 1000, 3) if c['requisicoes'] else 0.0,
+                }
+                for fonte, c in self._fontes.items()
+            }
+            cache = dict(self._cache)
+
+        consultas = sum(cache.values())
+        cache['taxa_acerto'] = round((cache['acertos'] + cache['revalidadas']) / consultas, 4) if consultas else None
+        return {
+            'desde': round(self.inicio, 3),
+            'etapas': etapas,
+            'fontes': fontes,
+            'cache': cache,
+        }
+
+    def json(self) -> str:
+        return json.dumps(self.resumo(), ensure_ascii=False)
+
+
+def servir_metricas(metricas: Metricas, porta: int = 9108, host: str = '127.0.0.1'):
+    """
+    Sobe um endpoint HTTP (GET /metrics → JSON do resumo) numa thread daemon
+
+    Retorna o servidor; use `servidor.shutdown()` para parar.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') != '/metrics':
+                self.send_error(404)
+                return
+            corpo = metricas.json().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            get_logger('metricas').debug(formato % args)
+
+    servidor = ThreadingHTTPServer((host, porta), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
@@ -0,0 +1,151 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+# (cidade, UF, aliases)
+CIDADES: List[Tuple[str, str, List[str]]] = [
+    ('Rio Branco', 'AC', []),
+    ('Maceió', 'AL', []),
+    ('Macapá', 'AP', []),
+    ('Manaus', 'AM', []),
+    ('Salvador', 'BA', []),
+    ('Fortaleza', 'CE', []),
+    ('Brasília', 'DF', ['distrito federal']),
+    ('Vitória', 'ES', []),
+    ('Goiânia', 'GO', []),
+    ('São Luís', 'MA', []),
+    ('Cuiabá', 'MT', []),
+    ('Campo Grande', 'MS', []),
+    ('Belo Horizonte', 'MG', ['bh', 'bhz']),
+    ('Belém', 'PA', []),
+    ('João Pessoa', 'PB', []),
+    ('Curitiba', 'PR', []),
+    ('Recife', 'PE', []),
+    ('Teresina', 'PI', []),
+    ('Rio de Janeiro', 'RJ', []),
+    ('Natal', 'RN', []),
+    ('Porto Alegre', 'RS', ['poa']),
+    ('Porto Velho', 'RO', []),
+    ('Boa Vista', 'RR', []),
+    ('Florianópolis', 'SC', ['floripa']),
+    ('São Paulo', 'SP', ['sampa']),
+    ('Aracaju', 'SE', []),
+    ('Palmas', 'TO', []),
+    # Outros polos de tecnologia
+    ('Campinas', 'SP', []),
+    ('São José dos Campos', 'SP', ['sjc']),
+    ('Ribeirão Preto', 'SP', []),
+    ('São Carlos', 'SP', []),
+    ('Sorocaba', 'SP', []),
+    ('Santos', 'SP', []),
+    ('Jundiaí', 'SP', []),
+    ('Barueri', 'SP', ['alphaville']),
+    ('Osasco', 'SP', []),
+    ('Guarulhos', 'SP', []),
+    ('Santo André', 'SP', []),
+    ('São Bernardo do Campo', 'SP', []),
+    ('Niterói', 'RJ', []),
+    ('Uberlândia', 'MG', []),
+    ('Juiz de Fora', 'MG', []),
+    ('Contagem', 'MG', []),
+    ('Joinville', 'SC', []),
+    ('Blumenau', 'SC', []),
+    ('Itajaí', 'SC', []),
+    ('Londrina', 'PR', []),
+    ('Maringá', 'PR', []),
+    ('Caxias do Sul', 'RS', []),
+    ('Pelotas', 'RS', []),
+    ('Feira de Santana', 'BA', []),
+]
+
+# UF -> nome do estado. Para SP e RJ o nome coincide com a capital,
+# mantendo o agrupamento que o dashboard já usava.
+ESTADOS: Dict[str, str] = {
+    'AC': 'Acre', 'AL': 'Alagoas', 'AP': 'Amapá', 'AM': 'Amazonas', 'BA': 'Bahia',
+    'CE': 'Ceará', 'DF': 'Brasília', 'ES': 'Espírito Santo', 'GO': 'Goiás',
+    'MA': 'Maranhão', 'MT': 'Mato Grosso', 'MS': 'Mato Grosso do Sul',
+    'MG': 'Minas Gerais', 'PA': 'Pará', 'PB': 'Paraíba', 'PR': 'Paraná',
+    'PE': 'Pernambuco', 'PI': 'Piauí', 'RJ': 'Rio de Janeiro', 'RN': 'Rio Grande do Norte',
+    'RS': 'Rio Grande do Sul', 'RO': 'Rondônia', 'RR': 'Roraima', 'SC': 'Santa Catarina',
+    'SP': 'São Paulo', 'SE': 'Sergipe', 'TO': 'Tocantins',
+}
+
+REMOTO = ['remoto', 'remota', 'remote', 'home office', 'anywhere', 'teletrabalho']
+
+_MAX_NGRAMA = 4
+
+
+def _sem_acentos(texto: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+
+def _tokens(texto: str) -> List[str]:
+    return re.findall(r'[0-9a-z]+', _sem_acentos(texto).lower())
+
+
+def _tokens_acentuados(texto: str) -> List[str]:
+    return re.findall(r'[^\W_]+', unicodedata.normalize('NFC', texto).lower())
+
+
+def _montar_tabela() -> Dict[Tuple[str, ...], str]:
+    """Tabela n-grama de tokens -> nome normalizado das cidades"""
+    tabela = {}
+    for nome, _, aliases in CIDADES:
+        for termo in [nome] + aliases:
+            tabela[tuple(_tokens(termo))] = nome
+    return tabela
+
+
+_TABELA = _montar_tabela()
+# Estados com acento ('pará'): sem acento, 'para' é preposição
+_ESTADOS_ACENTUADOS = {tuple(_tokens_acentuados(estado)): estado for estado in ESTADOS.values()}
+# Estados sem acento, aceitos só quando ocupam um trecho inteiro ('Belém, Para', 'Remoto - Parana')
+_ESTADOS_SEM_ACENTO = {tuple(_tokens(estado)): estado for estado in ESTADOS.values()}
+_REMOTO = {tuple(_tokens(termo)) for termo in REMOTO}
+
+
+def _primeiro(tokens: List[str], tabela: Dict[Tuple[str, ...], str]) -> Optional[str]:
+    """Nome do n-grama mais à esquerda (e mais longo) que está na tabela"""
+    for i in range(len(tokens)):
+        for n in range(min(_MAX_NGRAMA, len(tokens) - i), 0, -1):
+            nome = tabela.get(tuple(tokens[i:i + n]))
+            if nome:
+                return nome
+    return None
+
+
+@lru_cache(maxsize=65536)
+def normalizar_local(local: str) -> str:
+    """
+    Normaliza uma localização para cidade, estado ou 'Remoto'
+
+    Compara por tokens (nunca por substring) contra o gazetteer. Cidades
+    vêm antes de estados (a primeira cidade que aparece vence); nomes de
+    estado valem com acento ou, sem acento, quando ocupam um trecho inteiro
+    entre vírgulas/hífens ('Vaga para Curitiba' é Curitiba, não Pará). Siglas
+    de UF só valem em maiúsculas ('SP', não 'sp' dentro de 'Wisp'). Sem
+    correspondência, devolve o texto em title case.
+    """
+    if not local:
+        return 'Não Informado'
+
+    tokens = _tokens(local)
+    if _REMOTO & (set(zip(tokens)) | set(zip(tokens, tokens[1:]))):
+        return 'Remoto'
+
+    nome = _primeiro(tokens, _TABELA) or _primeiro(_tokens_acentuados(local), _ESTADOS_ACENTUADOS)
+    if nome:
+        return nome
+
+    for trecho in re.split(r'[,;/|()\-–—]', local):
+        nome = _ESTADOS_SEM_ACENTO.get(tuple(_tokens(trecho)))
+        if nome:
+            return nome
+
+    for sigla in re.findall(r'\b[A-Z]{2}\b', _sem_acentos(local)):
+        if sigla in ESTADOS:
+            return ESTADOS[sigla]
+
+    return local.lower().title()
@@ -0,0 +1,34 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+def gravar(blocos: Iterable[List[Dict]], store) -> Iterator[List[Dict]]:
+    """Grava cada bloco no VagasStore e repassa só as vagas novas ou alteradas"""
+    for bloco in blocos:
+        novas = store.upsert(bloco)
+        if novas:
+            yield novas
+
+
+def alimentar(blocos: Iterable[List[Dict]], *consumidores) -> Iterator[List[Dict]]:
+    """Repassa cada bloco a objetos com `adicionar` (VagasAnalyzer, SkillAnalytics...)"""
+    for bloco in blocos:
+        for consumidor in consumidores:
+            consumidor.adicionar(bloco)
+        yield bloco
+
+
+def coletar(scraper, keyword: str, localizacao: str = "", paginas: int = 1, store=None,
+            consumidores: Optional[List] = None) -> Iterator[List[Dict]]:
+    """
+    Pipeline em streaming: fetch → extração/skills → deduplicação → store → consumidores
+
+    Gera blocos pequenos (uma página por vez), então a memória não depende
+    do total de vagas coletadas. Com `store`, só as vagas novas ou
+    alteradas seguem adiante.
+    """
+    blocos = scraper.iterar_vagas(keyword, localizacao, paginas)
+    if store is not None:
+        blocos = gravar(blocos, store)
+    if consumidores:
+        blocos = alimentar(blocos, *consumidores)
+    return blocos
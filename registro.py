@@ -0,0 +1,106 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from skills import get_skill_matcher
+
+
+class CodificadorSkills:
+    """
+    Converte listas de skills em bitmask (int) e vice-versa
+
+    O vocabulário começa com o dicionário do SkillMatcher e cresce quando
+    aparece uma skill desconhecida, então nenhuma skill é perdida. O
+    registro de skills novas é protegido por um lock: o codificador padrão é
+    compartilhado pelas threads do app, do agendador e do índice.
+    """
+
+    def __init__(self, skills: Optional[Iterable[str]] = None):
+        self.skills: List[str] = list(skills if skills is not None else get_skill_matcher().skills)
+        self.indice: Dict[str, int] = {skill: i for i, skill in enumerate(self.skills)}
+        self._lock = threading.Lock()
+
+    def codificar(self, skills: Iterable[str]) -> int:
+        mascara = 0
+        for skill in skills:
+            i = self.indice.get(skill)
+            if i is None:
+                i = self._registrar(skill)
+            mascara |= 1 << i
+        return mascara
+
+    def _registrar(self, skill: str) -> int:
+        """Posição de uma skill nova (outra thread pode tê-la registrado antes do lock)"""
+        with self._lock:
+            i = self.indice.get(skill)
+            if i is None:
+                # A lista cresce antes do índice: quem achar a skill no índice já pode decodificá-la
+                i = len(self.skills)
+                self.skills.append(skill)
+                self.indice[skill] = i
+            return i
+
+    def decodificar(self, mascara: int) -> List[str]:
+        mascara = int(mascara)
+        return [skill for i, skill in enumerate(self.skills) if mascara >> i & 1]
+
+    @property
+    def cabe_em_64_bits(self) -> bool:
+        return len(self.skills) <= 64
+
+
+_codificador_padrao: Optional[CodificadorSkills] = None
+_lock_padrao = threading.Lock()
+
+
+def get_codificador() -> CodificadorSkills:
+    """Codificador compartilhado pelo processo (mesma numeração para todos os registros)"""
+    global _codificador_padrao
+    if _codificador_padrao is None:
+        with _lock_padrao:
+            if _codificador_padrao is None:
+                _codificador_padrao = CodificadorSkills()
+    return _codificador_padrao
+
+
+class VagaRegistro:
+    """Registro compacto de uma vaga: slots em vez de dict e skills como bitmask"""
+
+    __slots__ = ('titulo', 'empresa', 'local', 'skills_mask', 'link', 'fonte')
+
+    def __init__(self, titulo: str, empresa: str, local: str, skills_mask: int, link: str, fonte: str):
+        self.titulo = titulo
+        self.empresa = empresa
+        self.local = local
+        self.skills_mask = skills_mask
+        self.link = link
+        self.fonte = fonte
+
+    @classmethod
+    def from_dict(cls, vaga: Dict, codificador: Optional[CodificadorSkills] = None) -> 'VagaRegistro':
+        codificador = codificador or get_codificador()
+        return cls(
+            vaga['titulo'], vaga['empresa'], vaga['local'],
+            codificador.codificar(vaga.get('skills', [])),
+            vaga.get('link', '#'), vaga.get('fonte', '')
+        )
+
+    def skills(self, codificador: Optional[CodificadorSkills] = None) -> List[str]:
+        return (codificador or get_codificador()).decodificar(self.skills_mask)
+
+    def to_dict(self, codificador: Optional[CodificadorSkills] = None) -> Dict:
+        return {
+            'titulo': self.titulo,
+            'empresa': self.empresa,
+            'local': self.local,
+            'skills': self.skills(codificador),
+            'link': self.link,
+            'fonte': self.fonte
+        }
+
+    def __repr__(self) -> str:
+        return f"VagaRegistro({self.titulo!r}, {self.empresa!r}, {self.local!r})"
+
+
+def para_registros(vagas: Iterable[Dict], codificador: Optional[CodificadorSkills] = None) -> List[VagaRegistro]:
+    """Converte dicts de vaga em registros compactos"""
+    return [VagaRegistro.from_dict(vaga, codificador) for vaga in vagas]
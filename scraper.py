@@ -1,18 +1,50 @@
-import requests
 import os  
-from bs4 import BeautifulSoup
 import time
-import re
-from typing import List, Dict
-from dotenv import load_dotenv
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Tuple
+from cache import RespostaCache, normalizar_consulta
+from fontes import FONTES, FalhaPagina, FonteVagas, seletores_programathor
+from http_client import CircuitoAberto, Disjuntor, TokenBucket, criar_sessao, get_com_retentativas
+from importacao import carregar_env
+from instrumentacao import Metricas, get_logger
+from skills import SkillMatcher, get_skill_matcher
 
+logger = get_logger('scraper')
+
+# Blocos em espera entre as threads das fontes e o consumidor: uma fonte mais
+# rápida que o consumidor espera em vez de acumular páginas na memória
+BLOCOS_NA_FILA = 8
+
+
+class ResultadoBusca(list):
+    """
+    Lista de vagas que também carrega os erros da coleta
+    
+    `erros` tem um dict por página ou fonte que falhou (ver
+    FalhaPagina.como_dict); com erros, as vagas são um resultado parcial.
+    """
+    
+    def __init__(self, vagas: Iterable[Dict] = (), erros: Optional[List[Dict]] = None):
+        super().__init__(vagas)
+        self.erros: List[Dict] = erros if erros is not None else []
+    
+    @property
+    def parcial(self) -> bool:
+        return bool(self.erros)
 
-load_dotenv()
 
 class VagasScraper:
-    """Scraper para vagas de tecnologia usando JSearch API"""
+    """Scraper para vagas de tecnologia em múltiplas fontes (JSearch API, Programathor...)"""
     
-    def __init__(self):
+    JSEARCH_URL = "https://jsearch.p.rapidapi.com/search"
+    
+    def __init__(self, skill_matcher: Optional[SkillMatcher] = None, max_workers: int = 4,
+                 requisicoes_por_segundo: float = 2.0, cache: Optional[RespostaCache] = None,
+                 deduplicacao_aproximada: bool = False, fontes: Optional[List[str]] = None,
+                 metricas: Optional[Metricas] = None, jsearch_url: Optional[str] = None, indice=None,
+                 arquivo=None, base_dedup=None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -22,83 +54,193 @@ class VagasScraper:
             'Upgrade-Insecure-Requests': '1'
         }
         
+        carregar_env()
         self.rapidapi_key = os.getenv("RAPIDAPI_KEY")
+        # JSEARCH_URL permite apontar para um stub local (benchmarks, testes offline)
+        self.jsearch_url = jsearch_url or os.getenv("JSEARCH_URL", self.JSEARCH_URL)
+        self.skill_matcher = skill_matcher or get_skill_matcher()
+        self.max_workers = max_workers
+        self.session = criar_sessao(pool_maxsize=max_workers)
+        self.cache = cache
+        self.deduplicacao_aproximada = deduplicacao_aproximada
+        # DeduplicadorVagas das vagas já guardadas (ver DeduplicadorVagas.from_store), só com deduplicação aproximada
+        self.base_dedup = base_dedup
+        self.metricas = metricas or Metricas()
+        # IndiceVagas opcional, atualizado com cada bloco de vagas únicas (com a descrição)
+        self.indice = indice
+        # ArquivoRespostas opcional: guarda cada resposta nova completa, para reprocessar sem a API
+        self.arquivo = arquivo
         self.vagas = []
+        
+        # Fontes habilitadas, cada uma com seu próprio limitador de taxa
+        self.fontes: List[FonteVagas] = [
+            FONTES[chave](self, requisicoes_por_segundo if chave == 'jsearch' else None)
+            for chave in (fontes if fontes is not None else list(FONTES))
+        ]
+        jsearch = next((f for f in self.fontes if f.nome == 'JSearch'), None)
+        self.limitador = jsearch.limitador if jsearch else TokenBucket(requisicoes_por_segundo)
+        self.disjuntor = jsearch.disjuntor if jsearch else Disjuntor()
     
-    def buscar_jsearch(self, keyword: str = "python", localizacao: str = "Brazil") -> List[Dict]:
+    def buscar_jsearch(self, keyword: str = "python", localizacao: str = "Brazil", paginas: int = 1) -> ResultadoBusca:
         """
         Busca vagas usando JSearch API (LinkedIn, Indeed, Glassdoor, etc)
+        
+        As páginas são buscadas em paralelo, respeitando o limitador de taxa,
+        e processadas na ordem em que chegam. Páginas que falharam ficam em
+        `erros` do resultado. As vagas vêm sem a descrição.
         """
-        vagas = []
+        vagas = ResultadoBusca()
+        for bloco in self.iterar_jsearch(keyword, localizacao, paginas):
+            if isinstance(bloco, FalhaPagina):
+                vagas.erros.append(bloco.como_dict())
+            else:
+                vagas.extend(bloco)
+        for vaga in vagas:
+            vaga.pop('descricao', None)
+        return vagas
+    
+    def iterar_jsearch(self, keyword: str = "python", localizacao: str = "", paginas: int = 1) -> Iterator[List[Dict]]:
+        """
+        Gera as vagas extraídas de cada página do JSearch assim que ela chega
         
-        try:
-            url = "https://jsearch.p.rapidapi.com/search"
-            
-            # Monta a query - simplificada
-            query = f"{keyword}"
-            
-            querystring = {
-                "query": query,
-                "page": "1",
-                "num_pages": "1"
-                # Removido filtro de data para testar
-            }
-            
-            headers = {
-                "X-RapidAPI-Key": self.rapidapi_key,
-                "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
-            }
-            
-            print(f"🔗 Consultando API com query: '{query}'")
-            
-            response = requests.get(url, headers=headers, params=querystring, timeout=15)
-            
-            print(f"📡 Status Code: {response.status_code}")
-            
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            print(f"📦 Resposta da API: {data.get('status', 'N/A')}")
-            print(f"📋 Keys na resposta: {list(data.keys())}")
-            
-            # Debug: mostra o que tem em data
-            if 'data' in data:
-                print(f"🔍 Tipo de data: {type(data['data'])}")
-                print(f"🔍 Length de data: {len(data['data']) if data['data'] else 0}")
-                
-                # Mostra primeira vaga como exemplo
-                if data['data'] and len(data['data']) > 0:
-                    print(f"📄 Exemplo primeira vaga keys: {list(data['data'][0].keys())}")
-            
-            if 'error' in data:
-                print(f"❌ Erro da API: {data.get('error')}")
-                print(f"   Mensagem: {data.get('message', 'N/A')}")
-            
-            if data.get('status') == 'OK' and data.get('data') and len(data['data']) > 0:
-                print(f"✨ Total de vagas encontradas na API: {len(data['data'])}")
+        No máximo `max_workers` páginas ficam em voo ao mesmo tempo, então a
+        memória não cresce com o número de páginas. Depois de uma página
+        vazia, nenhuma página nova é pedida. Uma página que falha (após as
+        retentativas) gera uma FalhaPagina e as demais seguem.
+        """
+        if not self.rapidapi_key:
+            logger.debug("RAPIDAPI_KEY não configurada; JSearch ignorado", extra={'fonte': 'JSearch'})
+            return
+        
+        paginas = max(1, paginas)
+        proxima = 1
+        em_voo = {}
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, paginas)) as executor:
+            while em_voo or proxima <= paginas:
+                while proxima <= paginas and len(em_voo) < self.max_workers:
+                    em_voo[executor.submit(self._buscar_pagina_jsearch, keyword, proxima)] = proxima
+                    proxima += 1
                 
-                for job in data['data'][:30]:  # Limita a 30 vagas
+                prontos, _ = wait(em_voo, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    pagina = em_voo.pop(futuro)
                     try:
-                        vaga = self._extrair_dados_jsearch(job, localizacao)
-                        if vaga:
-                            vagas.append(vaga)
+                        jobs = futuro.result()
                     except Exception as e:
-                        print(f"Erro ao processar vaga: {e}")
+                        self.metricas.registrar_erro('JSearch')
+                        logger.error("Falha na página %d do JSearch: %s", pagina, e,
+                                     extra={'fonte': 'JSearch', 'query': keyword, 'pagina': pagina})
+                        yield FalhaPagina('JSearch', pagina, e)
+                        # Com o circuito aberto as próximas páginas falhariam na hora
+                        if isinstance(e, CircuitoAberto):
+                            proxima = paginas + 1
                         continue
-            else:
-                print(f"⚠️ Array 'data' está vazio ou não existe")
-            
-            time.sleep(1)
-            
-        except requests.exceptions.HTTPError as e:
-            print(f"❌ Erro HTTP ao buscar no JSearch: {e}")
-            if 'response' in locals():
-                print(f"   Response: {response.text[:200]}")
-        except Exception as e:
-            print(f"❌ Erro ao buscar no JSearch: {e}")
+                    
+                    # Página vazia: não há resultados depois dela
+                    if not jobs:
+                        proxima = paginas + 1
+                        continue
+                    
+                    bloco = []
+                    with self.metricas.cronometro('extracao'):
+                        for job in jobs:
+                            try:
+                                vaga = self._extrair_dados_jsearch(job, localizacao)
+                                if vaga:
+                                    bloco.append(vaga)
+                            except Exception as e:
+                                logger.warning("Erro ao processar vaga: %s", e, extra={'fonte': 'JSearch'})
+                                continue
+                    
+                    if bloco:
+                        yield bloco
+    
+    def _buscar_pagina_jsearch(self, query: str, pagina: int = 1) -> List[Dict]:
+        """Busca uma página de resultados brutos do JSearch (levanta se falhar)"""
+        data = self._obter_resposta_jsearch(query, pagina)
         
-        return vagas
+        if 'error' in data and not data.get('data'):
+            raise RuntimeError(f"Erro da API: {data.get('error')} {data.get('message') or ''}".strip())
+        
+        if data.get('status') == 'OK' and data.get('data'):
+            logger.debug("Página %d: %d vagas", pagina, len(data['data']),
+                         extra={'fonte': 'JSearch', 'query': query, 'pagina': pagina, 'vagas': len(data['data'])})
+            return data['data']
+        
+        logger.debug("Página %d sem vagas", pagina, extra={'fonte': 'JSearch', 'query': query, 'pagina': pagina})
+        return []
+    
+    def _obter_resposta_jsearch(self, query: str, pagina: int = 1) -> Dict:
+        """
+        Obtém o JSON de uma página do JSearch, passando pelo cache se houver
+        
+        Entradas frescas são servidas sem acessar a rede. Entradas expiradas
+        são revalidadas com If-None-Match/If-Modified-Since quando possível.
+        A localização é filtrada localmente, então não faz parte da chave.
+        """
+        chave = RespostaCache.chave(query, pagina)
+        entrada = self.cache.obter(chave) if self.cache is not None else None
+        
+        if entrada and not entrada.expirada:
+            self.metricas.registrar_cache('acertos')
+            logger.debug("Cache: '%s' (página %d)", query, pagina, extra={'query': query, 'pagina': pagina})
+            return entrada.payload
+        
+        querystring = {
+            "query": query,
+            "page": str(pagina),
+            "num_pages": "1"
+        }
+        
+        headers = {
+            "X-RapidAPI-Key": self.rapidapi_key,
+            "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
+        }
+        if entrada and entrada.etag:
+            headers["If-None-Match"] = entrada.etag
+        if entrada and entrada.last_modified:
+            headers["If-Modified-Since"] = entrada.last_modified
+        
+        # Retentativas com backoff, Retry-After e disjuntor da fonte
+        inicio = time.perf_counter()
+        response = get_com_retentativas(
+            self.session, self.jsearch_url, 'JSearch', self.limitador, self.disjuntor,
+            metricas=self.metricas, headers=headers, params=querystring, timeout=15
+        )
+        
+        logger.debug("GET JSearch '%s' (página %d): %d", query, pagina, response.status_code, extra={
+            'fonte': 'JSearch', 'query': query, 'pagina': pagina,
+            'status': response.status_code, 'latencia_ms': round((time.perf_counter() - inicio) * 1000, 1)
+        })
+        
+        if response.status_code == 304 and entrada:
+            self.metricas.registrar_cache('revalidadas')
+            self.cache.renovar(chave)
+            return entrada.payload
+        
+        if self.cache is not None:
+            self.metricas.registrar_cache('faltas')
+        
+        response.raise_for_status()
+        
+        with self.metricas.cronometro('json'):
+            data = response.json()
+        
+        if self.cache is not None and data.get('status') == 'OK':
+            self.cache.salvar(
+                chave, data,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+        
+        if self.arquivo is not None and data.get('status') == 'OK':
+            try:
+                self.arquivo.salvar('JSearch', query, pagina, data)
+            except OSError as e:
+                logger.warning("Falha ao arquivar resposta: %s", e, extra={'fonte': 'JSearch', 'query': query})
+        
+        return data
     
     def _extrair_dados_jsearch(self, job: Dict, filtro_local: str = "") -> Dict:
         """Extrai dados de uma vaga do JSearch"""
@@ -110,7 +252,7 @@ class VagasScraper:
         empresa = job.get('employer_name', 'Não informada')
         
         # Local
-        local = job.get('job_city', '')
+        local = job.get('job_city') or ''  # a API devolve null quando não há cidade
         if job.get('job_state'):
             local += f", {job.get('job_state')}"
         if job.get('job_country'):
@@ -120,25 +262,25 @@ class VagasScraper:
             if job.get('job_is_remote'):
                 local = 'Remoto'
             else:
-                local = job.get('job_country', 'Não informado')
+                local = job.get('job_country') or 'Não informado'
         
         # Link
         link = job.get('job_apply_link') or job.get('job_google_link', '#')
         
         # Extrai skills da descrição
-        descricao = job.get('job_description', '').lower()
+        descricao = job.get('job_description') or ''
         skills = self._extrair_skills(descricao)
         
         # Se não tem skills na descrição, tenta pegar do título
         if not skills:
-            skills = self._extrair_skills(titulo.lower())
+            skills = self._extrair_skills(titulo)
         
         # Filtro de localização
         if filtro_local and filtro_local.lower() not in local.lower():
             if not (filtro_local.lower() == 'remoto' and job.get('job_is_remote')):
                 return None
         
-        return {
+        vaga = {
             'titulo': titulo,
             'empresa': empresa,
             'local': local,
@@ -146,68 +288,31 @@ class VagasScraper:
             'link': link,
             'fonte': 'JSearch API'
         }
-    
-        """
-        Busca vagas no Programathor
-        """
-        vagas = []
-        
-        try:
-            # URL de busca do Programathor
-            url = f"https://programathor.com.br/jobs?q={keyword}"
-            
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Encontra os cards de vagas (ajustar seletores conforme necessário)
-            cards_vagas = soup.find_all('div', class_='job-item') or soup.find_all('article')
-            
-            for card in cards_vagas[:20]:  # Limita a 20 vagas
-                try:
-                    vaga = self._extrair_dados_programathor(card)
-                    
-                    # Filtro de localização se especificado
-                    if localizacao and localizacao.lower() not in vaga['local'].lower():
-                        continue
-                    
-                    vagas.append(vaga)
-                    
-                except Exception as e:
-                    print(f"Erro ao processar vaga: {e}")
-                    continue
-            
-            time.sleep(1)  # Rate limiting
-            
-        except Exception as e:
-            print(f"Erro ao buscar no Programathor: {e}")
-        
-        return vagas
+        # A descrição acompanha a vaga pela deduplicação e indexação e depois é descartada (ver _indexar)
+        vaga['descricao'] = descricao
+        return vaga
     
     def _extrair_dados_programathor(self, card) -> Dict:
         """Extrai dados de um card de vaga"""
         
-        # Título
-        titulo_elem = card.find('h2') or card.find('h3') or card.find('a', class_='job-title')
-        titulo = titulo_elem.get_text(strip=True) if titulo_elem else "Não informado"
+        seletores = seletores_programathor()
         
-        # Empresa
-        empresa_elem = card.find('span', class_='company') or card.find('div', class_='company-name')
-        empresa = empresa_elem.get_text(strip=True) if empresa_elem else "Não informada"
+        def texto(campo: str, padrao: str) -> str:
+            elem = seletores[campo].select_one(card)
+            return elem.get_text(strip=True) if elem else padrao
         
-        # Local
-        local_elem = card.find('span', class_='location') or card.find('div', class_='job-location')
-        local = local_elem.get_text(strip=True) if local_elem else "Remoto"
+        titulo = texto('titulo', "Não informado")
+        empresa = texto('empresa', "Não informada")
+        local = texto('local', "Remoto")
         
         # Link
-        link_elem = card.find('a', href=True)
+        link_elem = seletores['link'].select_one(card)
         link = link_elem['href'] if link_elem else "#"
         if link.startswith('/'):
             link = f"https://programathor.com.br{link}"
         
-        # Extrai skills do texto completo
-        texto_completo = card.get_text().lower()
+        # Extrai skills do texto completo (separador evita colar palavras de tags vizinhas)
+        texto_completo = card.get_text(' ')
         skills = self._extrair_skills(texto_completo)
         
         return {
@@ -221,52 +326,213 @@ class VagasScraper:
     
     def _extrair_skills(self, texto: str) -> List[str]:
         """Extrai skills técnicas do texto"""
-        
-        skills_conhecidas = [
-            'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
-            'node', 'django', 'flask', 'fastapi', 'spring', 'sql', 'postgresql',
-            'mysql', 'mongodb', 'redis', 'docker', 'kubernetes', 'aws', 'azure',
-            'gcp', 'git', 'api', 'rest', 'graphql', 'machine learning', 'data science',
-            'pandas', 'numpy', 'tensorflow', 'pytorch', 'spark', 'hadoop', 'airflow',
-            'ci/cd', 'devops', 'agile', 'scrum', 'html', 'css', 'bootstrap', 'tailwind'
-        ]
-        
-        skills_encontradas = []
-        for skill in skills_conhecidas:
-            if skill in texto:
-                skills_encontradas.append(skill.title())
-        
-        return list(set(skills_encontradas))  # Remove duplicatas
+        with self.metricas.cronometro('skills'):
+            return self.skill_matcher.extrair(texto)
     
-    def buscar_vagas(self, keyword: str = "python", localizacao: str = "") -> List[Dict]:
+    def buscar_vagas(self, keyword: str = "python", localizacao: str = "", paginas: int = 1,
+                     ao_receber: Optional[Callable[[List[Dict]], None]] = None) -> ResultadoBusca:
         """
         Método principal que busca em múltiplas fontes
-        """
-        print(f"🔍 Buscando vagas de '{keyword}' em '{localizacao or 'todas as localidades'}'...")
-        
-        todas_vagas = []
         
-        # JSearch API (LinkedIn, Indeed, Glassdoor)
-        try:
-            # loc_busca = localizacao if localizacao else "Brazil"
-            loc_busca = localizacao 
-            vagas_jsearch = self.buscar_jsearch(keyword, loc_busca)
-            todas_vagas.extend(vagas_jsearch)
-            print(f"✅ Encontradas {len(vagas_jsearch)} vagas no JSearch")
-        except Exception as e:
-            print(f"⚠️ JSearch indisponível: {e}")
+        `ao_receber`, se informado, é chamado com cada bloco de vagas únicas
+        assim que ele chega (útil para mostrar resultados parciais). Páginas
+        ou fontes que falharam ficam em `erros` do resultado, junto com as
+        vagas que deram certo.
+        """
+        logger.info("Buscando vagas de '%s' em '%s'", keyword, localizacao or 'todas as localidades',
+                    extra={'keyword': keyword, 'localizacao': localizacao, 'paginas': paginas})
+        
+        vagas_unicas = ResultadoBusca()
+        for bloco in self.iterar_vagas(keyword, localizacao, paginas, erros=vagas_unicas.erros):
+            vagas_unicas.extend(bloco)
+            if ao_receber:
+                ao_receber(bloco)
+        
+        # Dados de exemplo só no modo demonstração (sem chave da API); com a
+        # chave, uma falha aparece em `erros` em vez de virar vagas falsas
+        if not vagas_unicas and not self.rapidapi_key:
+            logger.info("Sem RAPIDAPI_KEY e sem vagas nas fontes; gerando vagas de exemplo para demonstração")
+            vagas_unicas.extend(self._remover_duplicatas(self._gerar_vagas_exemplo(keyword, localizacao)))
+        
+        if vagas_unicas.parcial:
+            logger.warning("Resultado parcial: %d falhas na coleta", len(vagas_unicas.erros),
+                           extra={'keyword': keyword, 'erros': vagas_unicas.erros})
+        logger.info("Total: %d vagas únicas encontradas", len(vagas_unicas),
+                    extra={'keyword': keyword, 'vagas': len(vagas_unicas)})
         
-        # Se não encontrou nada na API, usa dados de exemplo
-        if not todas_vagas:
-            print("ℹ️ Gerando vagas de exemplo para demonstração...")
-            todas_vagas = self._gerar_vagas_exemplo(keyword, localizacao)
+        return vagas_unicas
+    
+    def iterar_vagas(self, keyword: str = "python", localizacao: str = "", paginas: int = 1,
+                     vistas=None, erros: Optional[List[Dict]] = None) -> Iterator[List[Dict]]:
+        """
+        Gera blocos de vagas únicas à medida que as fontes respondem
         
-        # Remove duplicatas baseado no título e empresa
-        vagas_unicas = self._remover_duplicatas(todas_vagas)
+        Pipeline: fetch → extração (com skills) → deduplicação → índice (se
+        houver). `vistas` (ver `_criar_vistas`) permite deduplicar contra
+        blocos anteriores; as falhas de página/fonte são anexadas a `erros`.
+        """
+        if vistas is None:
+            vistas = self._criar_vistas()
         
-        print(f"📊 Total: {len(vagas_unicas)} vagas únicas encontradas")
+        for bloco in self._iterar_fontes(keyword, localizacao, paginas, erros):
+            unicas = self._indexar(self._remover_duplicatas(bloco, vistas), bloco)
+            if unicas:
+                yield unicas
+    
+    def _indexar(self, unicas: List[Dict], bloco: List[Dict]) -> List[Dict]:
+        """Indexa as vagas únicas (índice de busca e base de deduplicação) e descarta as descrições do bloco"""
+        if self.indice is not None:
+            with self.metricas.cronometro('indice'):
+                self.indice.adicionar(unicas)
+        if self.base_dedup is not None and self.deduplicacao_aproximada:
+            with self.metricas.cronometro('dedup'):
+                self.base_dedup.carregar(unicas)
+        for vaga in bloco:
+            vaga.pop('descricao', None)
+        return unicas
+    
+    def _buscar_fontes(self, keyword: str, localizacao: str, paginas: int = 1) -> ResultadoBusca:
+        """Busca uma consulta em todas as fontes, sem fallback nem deduplicação"""
+        todas_vagas = ResultadoBusca()
+        for bloco in self._iterar_fontes(keyword, localizacao, paginas, todas_vagas.erros):
+            todas_vagas.extend(bloco)
+        return todas_vagas
+    
+    def _iterar_fontes(self, keyword: str, localizacao: str, paginas: int = 1,
+                       erros: Optional[List[Dict]] = None) -> Iterator[List[Dict]]:
+        """
+        Busca uma consulta em todas as fontes habilitadas, em paralelo
+        
+        Cada fonte roda em sua thread e entrega blocos numa fila limitada
+        (BLOCOS_NA_FILA), que são repassados assim que chegam. Cada fonte tem
+        seu próprio timeout: uma fonte lenta é abandonada sem atrasar as
+        demais e para no próximo bloco, assim como todas as fontes quando o
+        consumidor deixa de ler. Falhas (páginas, fontes que quebraram ou
+        excederam o timeout) vão para `erros`.
+        """
+        if erros is None:
+            erros = []
+        fila = queue.Queue(maxsize=BLOCOS_NA_FILA)
+        fim = object()
+        parar = {fonte: threading.Event() for fonte in self.fontes}
+        
+        def entregar(fonte: FonteVagas, item) -> bool:
+            """Põe o item na fila, esperando vaga enquanto a fonte não foi parada"""
+            while not parar[fonte].is_set():
+                try:
+                    fila.put((fonte, item), timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def produzir(fonte: FonteVagas):
+            blocos = fonte.iterar(keyword, localizacao, paginas)
+            try:
+                for bloco in blocos:
+                    if not entregar(fonte, bloco):
+                        return
+            except Exception as e:
+                entregar(fonte, e)
+            finally:
+                blocos.close()
+                entregar(fonte, fim)
+        
+        inicio = time.monotonic()
+        prazos = {}
+        contagem = {}
+        for fonte in self.fontes:
+            prazos[fonte] = inicio + fonte.timeout
+            contagem[fonte] = 0
+            threading.Thread(target=produzir, args=(fonte,), daemon=True).start()
         
-        return vagas_unicas
+        try:
+            while prazos:
+                espera = max(0.0, min(prazos.values()) - time.monotonic())
+                try:
+                    fonte, item = fila.get(timeout=espera)
+                except queue.Empty:
+                    agora = time.monotonic()
+                    for fonte in [f for f, prazo in prazos.items() if prazo <= agora]:
+                        self.metricas.registrar_erro(fonte.nome)
+                        logger.warning("%s excedeu %.0fs e foi ignorado", fonte.nome, fonte.timeout,
+                                       extra={'fonte': fonte.nome, 'timeout': fonte.timeout})
+                        erros.append(FalhaPagina(fonte.nome, None, TimeoutError(f"excedeu {fonte.timeout:.0f}s")).como_dict())
+                        parar[fonte].set()
+                        del prazos[fonte]
+                    continue
+            
+                if fonte not in prazos:
+                    continue
+                if item is fim:
+                    logger.info("Encontradas %d vagas no %s", contagem[fonte], fonte.nome, extra={
+                        'fonte': fonte.nome, 'vagas': contagem[fonte],
+                        'duracao_ms': round((time.monotonic() - inicio) * 1000, 1)
+                    })
+                    del prazos[fonte]
+                elif isinstance(item, FalhaPagina):
+                    # Já contada e registrada por quem gerou; as demais páginas seguem
+                    erros.append(item.como_dict())
+                elif isinstance(item, Exception):
+                    self.metricas.registrar_erro(fonte.nome)
+                    logger.warning("%s indisponível: %s", fonte.nome, item, extra={'fonte': fonte.nome})
+                    erros.append(FalhaPagina(fonte.nome, None, item).como_dict())
+                else:
+                    contagem[fonte] += len(item)
+                    self.metricas.registrar_vagas(fonte.nome, len(item))
+                    yield item
+        finally:
+            # Fim normal, erro ou consumidor que parou de ler: nenhuma fonte segue produzindo
+            for evento in parar.values():
+                evento.set()
+    
+    def iterar_vagas_lote(self, consultas: List[Tuple[str, str]], paginas: int = 1,
+                          max_workers: Optional[int] = None) -> Iterator[Tuple[Tuple[str, str], List[Dict]]]:
+        """
+        Busca várias consultas (keyword, localizacao) em paralelo
+        
+        Gera (consulta, vagas) à medida que cada consulta termina; `vagas` é
+        um ResultadoBusca com os erros da consulta. As vagas já vistas em
+        consultas anteriores do lote são descartadas. Todas as consultas
+        compartilham o limitador de taxa, o disjuntor e a sessão do scraper.
+        Consultas que só diferem em maiúsculas/espaços (como na chave do
+        cache) são buscadas uma vez, com a grafia da primeira.
+        """
+        vistas = self._criar_vistas()
+        distintas = {}
+        for keyword, localizacao in consultas:
+            distintas.setdefault((normalizar_consulta(keyword), normalizar_consulta(localizacao)),
+                                 (keyword, localizacao or ""))
+        consultas = list(distintas.values())
+        
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            futuros = {
+                executor.submit(self._buscar_fontes, keyword, localizacao, paginas): (keyword, localizacao)
+                for keyword, localizacao in consultas
+            }
+            
+            for futuro in as_completed(futuros):
+                consulta = futuros[futuro]
+                try:
+                    vagas = futuro.result()
+                except Exception as e:
+                    logger.warning("Falha na consulta %s: %s", consulta, e, extra={'consulta': consulta})
+                    vagas = ResultadoBusca(erros=[FalhaPagina('', None, e).como_dict()])
+                
+                unicas = self._indexar(self._remover_duplicatas(vagas, vistas), vagas)
+                yield consulta, ResultadoBusca(unicas, vagas.erros)
+    
+    def buscar_vagas_lote(self, consultas: List[Tuple[str, str]], paginas: int = 1,
+                          max_workers: Optional[int] = None) -> ResultadoBusca:
+        """Busca várias consultas em paralelo e retorna as vagas únicas mescladas (e os erros de cada consulta)"""
+        todas_vagas = ResultadoBusca()
+        for consulta, vagas in self.iterar_vagas_lote(consultas, paginas, max_workers):
+            logger.info("%s: %d vagas novas", consulta, len(vagas), extra={'consulta': consulta, 'vagas': len(vagas)})
+            todas_vagas.extend(vagas)
+            todas_vagas.erros.extend({**erro, 'consulta': list(consulta)} for erro in vagas.erros)
+        
+        logger.info("Total do lote: %d vagas únicas encontradas", len(todas_vagas), extra={'vagas': len(todas_vagas)})
+        return todas_vagas
     
     def _gerar_vagas_exemplo(self, keyword: str, localizacao: str) -> List[Dict]:
         """Gera vagas de exemplo para demonstração do projeto"""
@@ -320,22 +586,50 @@ class VagasScraper:
         
         return vagas
     
-    def _remover_duplicatas(self, vagas: List[Dict]) -> List[Dict]:
-        """Remove vagas duplicadas"""
-        vistas = set()
-        unicas = []
+    def _remover_duplicatas(self, vagas: List[Dict], vistas=None) -> List[Dict]:
+        """
+        Remove vagas duplicadas
         
-        for vaga in vagas:
-            chave = (vaga['titulo'].lower(), vaga['empresa'].lower())
-            if chave not in vistas:
-                vistas.add(chave)
-                unicas.append(vaga)
+        Se `vistas` for informado (ver `_criar_vistas`), ele é atualizado com
+        as vagas novas, permitindo deduplicar entre chamadas sucessivas.
+        """
+        if vistas is None:
+            vistas = self._criar_vistas()
         
-        return unicas
+        with self.metricas.cronometro('dedup'):
+            # Deduplicação aproximada (MinHash/LSH) para vagas sindicadas com títulos levemente diferentes
+            if not isinstance(vistas, set):
+                return vistas.filtrar(vagas)
+            
+            unicas = []
+            
+            for vaga in vagas:
+                chave = self._chave_vaga(vaga)
+                if chave not in vistas:
+                    vistas.add(chave)
+                    unicas.append(vaga)
+            
+            return unicas
+    
+    def _criar_vistas(self):
+        """Estado de deduplicação: conjunto de chaves exatas ou índice aproximado"""
+        if not self.deduplicacao_aproximada:
+            return set()
+        
+        from dedup import DeduplicadorVagas
+        return DeduplicadorVagas(base=self.base_dedup)
+    
+    @staticmethod
+    def _chave_vaga(vaga: Dict) -> Tuple[str, str]:
+        """Chave de deduplicação baseada no título e empresa"""
+        return (vaga['titulo'].lower(), vaga['empresa'].lower())
 
 
 # Teste rápido
 if __name__ == "__main__":
+    from instrumentacao import configurar_logs
+    configurar_logs()
+    
     scraper = VagasScraper()
     vagas = scraper.buscar_vagas("python", "")
 
@@ -0,0 +1,183 @@
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+
+
+# Skill canônica -> aliases reconhecidos no texto (comparação sem diferenciar maiúsculas)
+SKILLS_PADRAO: Dict[str, List[str]] = {
+    'Python': ['python'],
+    'Java': ['java'],
+    'JavaScript': ['javascript', 'js'],
+    'TypeScript': ['typescript'],
+    'React': ['react', 'react.js', 'reactjs'],
+    'Angular': ['angular', 'angularjs'],
+    'Vue': ['vue', 'vue.js', 'vuejs'],
+    'Node': ['node', 'node.js', 'nodejs'],
+    'Django': ['django'],
+    'Flask': ['flask'],
+    'FastAPI': ['fastapi'],
+    'Spring': ['spring', 'spring boot'],
+    'SQL': ['sql'],
+    'PostgreSQL': ['postgresql', 'postgres'],
+    'MySQL': ['mysql'],
+    'MongoDB': ['mongodb', 'mongo'],
+    'Redis': ['redis'],
+    'Docker': ['docker'],
+    'Kubernetes': ['kubernetes', 'k8s'],
+    'AWS': ['aws', 'amazon web services'],
+    'Azure': ['azure'],
+    'GCP': ['gcp', 'google cloud'],
+    'Git': ['git'],
+    'API': ['api', 'apis'],
+    'REST': ['rest', 'restful'],
+    'GraphQL': ['graphql'],
+    'Machine Learning': ['machine learning', 'aprendizado de máquina'],
+    'Data Science': ['data science', 'ciência de dados'],
+    'Pandas': ['pandas'],
+    'NumPy': ['numpy'],
+    'TensorFlow': ['tensorflow'],
+    'PyTorch': ['pytorch'],
+    'Spark': ['spark', 'pyspark'],
+    'Hadoop': ['hadoop'],
+    'Airflow': ['airflow'],
+    'CI/CD': ['ci/cd', 'ci cd', 'cicd'],
+    'DevOps': ['devops'],
+    'Agile': ['agile', 'ágil'],
+    'Scrum': ['scrum'],
+    'HTML': ['html', 'html5'],
+    'CSS': ['css', 'css3'],
+    'Bootstrap': ['bootstrap'],
+    'Tailwind': ['tailwind', 'tailwindcss'],
+}
+
+
+# Bytes que separam termos: pontuação ASCII e dígitos ('python3' → 'python'). Letras, '_', '+'
+# e '#' (c++, c#) e os bytes UTF-8 não ASCII ficam
+_SEPARADORES = bytes(c if c >= 0x80 or chr(c).isalpha() or chr(c) in '_+#' else 0x20 for c in range(256))
+# Pontuação fora do ASCII: U+0080–U+00BF (nbsp, «, ·) e U+2000–U+2FFF (•, –, “, …)
+_PONTUACAO_UTF8 = re.compile(rb'\xc2[\x80-\xbf]|\xe2[\x80-\xbf][\x80-\xbf]')
+_DIGITOS = b'0123456789'
+
+
+def _termos(texto: str) -> List[str]:
+    """Termos do texto já em minúsculas, como `SkillMatcher.extrair` os vê"""
+    limpo = texto.encode('utf-8').translate(_SEPARADORES)
+    if b'\xe2' in limpo or b'\xc2' in limpo:
+        limpo = _PONTUACAO_UTF8.sub(b' ', limpo)
+    return limpo.decode('utf-8').split()
+
+
+class SkillMatcher:
+    """
+    Encontra skills conhecidas em textos com uma passada de termos
+
+    O texto vai para minúsculas uma vez, a pontuação e os dígitos viram
+    espaço (`bytes.translate`) e os aliases de um termo só são achados pela
+    interseção com os termos do texto. Aliases com pontuação, dígitos ou
+    várias palavras (node.js, ci/cd, k8s, data science) usam uma regex que
+    começa pelo texto literal, e só quando o primeiro termo deles aparece.
+
+    Fronteiras como as de uma regex: '+' e '#' contam como parte do termo
+    (c++, c#) e dígitos logo depois do alias são aceitos (python3), mas não
+    antes dele ('b2c' não tem 'c'); 'js' em 'node.js' não conta como JavaScript.
+    """
+
+    # Fronteira final: '+' e '#' fazem parte do termo; dígitos depois do alias são aceitos
+    _FIM = r'(?![^\W\d]|[+#])'
+
+    def __init__(self, skills: Optional[Dict[str, List[str]]] = None):
+        self.skills = dict(skills if skills is not None else SKILLS_PADRAO)
+        self.ordem = {skill: i for i, skill in enumerate(self.skills)}
+
+        self._alias_para_skill = {}
+        for skill, aliases in self.skills.items():
+            for alias in [skill] + list(aliases):
+                self._alias_para_skill[self._normalizar(alias)] = skill
+
+        # Aliases que são um termo só, e os compostos: alias → (primeiro termo, regex)
+        self._simples = frozenset(alias for alias in self._alias_para_skill if _termos(alias) == [alias])
+        self._compostos = {}
+        # Composto → aliases simples de outra skill dentro dele ('js' em 'node.js')
+        self._sombras: Dict[str, frozenset] = {}
+        for alias, skill in self._alias_para_skill.items():
+            if alias not in self._simples:
+                termos = _termos(alias)
+                self._compostos[alias] = (termos[0] if termos else None, self._regex(alias))
+                sombras = frozenset(t for t in termos if t in self._simples and self._alias_para_skill[t] != skill)
+                if sombras:
+                    self._sombras[alias] = sombras
+
+        # Primeiros termos buscados no texto (aliases simples e início dos compostos), em UTF-8
+        chaves = self._simples | {termo for termo, _ in self._compostos.values() if termo}
+        self._chaves_utf8 = frozenset(chave.encode('utf-8') for chave in chaves)
+        self._regex_simples: Dict[str, re.Pattern] = {}
+
+    def _regex(self, alias: str) -> re.Pattern:
+        """Regex do alias (texto em minúsculas); começa pelo literal, com a fronteira inicial logo depois"""
+        palavras = [re.escape(palavra) for palavra in alias.split()]
+        padrao = f'{palavras[0]}(?<![\\w+#]{palavras[0]})' + ''.join(r'\s+' + p for p in palavras[1:])
+        return re.compile(padrao + self._FIM)
+
+    @classmethod
+    def carregar(cls, caminho: str) -> 'SkillMatcher':
+        """Carrega um dicionário de skills de um JSON {skill: [aliases]}"""
+        with open(caminho, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def _normalizar(termo: str) -> str:
+        return ' '.join(termo.lower().split())
+
+    def _confirmar(self, alias: str, texto: str) -> bool:
+        regex = self._regex_simples.get(alias)
+        if regex is None:
+            regex = self._regex_simples[alias] = self._regex(alias)
+        return regex.search(texto) is not None
+
+    def extrair(self, texto: str) -> List[str]:
+        """Retorna as skills encontradas no texto, na ordem do dicionário"""
+        if not texto:
+            return []
+
+        texto = texto.lower()
+        utf8 = texto.encode('utf-8')
+        limpo = utf8.translate(_SEPARADORES)
+        if b'\xe2' in limpo or b'\xc2' in limpo:
+            limpo = _PONTUACAO_UTF8.sub(b' ', limpo)
+        termos = {termo.decode('utf-8') for termo in self._chaves_utf8.intersection(limpo.split())}
+        if not termos:
+            return []
+
+        aliases = termos & self._simples
+        # Dígitos viraram espaço: um alias logo depois de um dígito ('b2c') não vale
+        if aliases and len(utf8.translate(None, _DIGITOS)) != len(utf8):
+            aliases = {alias for alias in aliases if self._confirmar(alias, texto)}
+
+        compostos = [alias for alias, (primeiro, regex) in self._compostos.items()
+                     if (primeiro is None or primeiro in termos) and regex.search(texto)]
+        aliases.update(compostos)
+        sombras = {sombra for alias in compostos for sombra in self._sombras.get(alias, ()) if sombra in aliases}
+        if sombras:
+            # A sombra só vale fora dos compostos encontrados
+            fora = texto
+            for alias in compostos:
+                fora = self._compostos[alias][1].sub(' ', fora)
+            aliases -= {sombra for sombra in sombras if not self._confirmar(sombra, fora)}
+
+        encontradas = {self._alias_para_skill[alias] for alias in aliases}
+        return sorted(encontradas, key=self.ordem.__getitem__)
+
+    def extrair_lote(self, textos: Iterable[str]) -> List[List[str]]:
+        """Extrai skills de vários textos de uma vez"""
+        return [self.extrair(texto) for texto in textos]
+
+
+_matcher_padrao: Optional[SkillMatcher] = None
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Retorna o matcher padrão, compilado uma única vez por processo"""
+    global _matcher_padrao
+    if _matcher_padrao is None:
+        _matcher_padrao = SkillMatcher()
+    return _matcher_padrao
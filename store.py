@@ -0,0 +1,301 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+CAMINHO_PADRAO = os.path.join('.cache', 'vagas.sqlite')
+
+COLUNAS = ['chave', 'titulo', 'empresa', 'local', 'skills', 'link', 'fonte', 'primeira_vez', 'ultima_vez']
+
+
+def chave_vaga(vaga: Dict) -> str:
+    """Chave estável de uma vaga: o link quando existe, senão título/empresa/local"""
+    link = vaga.get('link') or '#'
+    if link != '#':
+        base = f"{vaga.get('fonte', '')}|{link}"
+    else:
+        base = '|'.join(str(vaga.get(campo, '')).lower() for campo in ('fonte', 'titulo', 'empresa', 'local'))
+    return hashlib.sha1(base.encode('utf-8')).hexdigest()
+
+
+def normalizar_consulta(keyword: str, localizacao: str = '') -> Tuple[str, str]:
+    """Mesma consulta independentemente de maiúsculas e espaços extras"""
+    def normalizar(texto):
+        return ' '.join((texto or '').lower().split())
+    return normalizar(keyword), normalizar(localizacao)
+
+
+def _hash_conteudo(vaga: Dict) -> str:
+    conteudo = [vaga.get(campo) for campo in ('titulo', 'empresa', 'local', 'skills', 'link')]
+    return hashlib.sha1(json.dumps(conteudo, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class VagasStore:
+    """Base local (SQLite) de vagas coletadas, com upsert por chave estável"""
+
+    def __init__(self, caminho: Optional[str] = None):
+        self.caminho = caminho or os.getenv('VAGAS_STORE_PATH', CAMINHO_PADRAO)
+        self._lock = threading.Lock()
+
+        if self.caminho != ':memory:':
+            os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+
+        self._conn = sqlite3.connect(self.caminho, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS vagas (
+                chave TEXT PRIMARY KEY,
+                titulo TEXT NOT NULL,
+                empresa TEXT NOT NULL,
+                local TEXT NOT NULL,
+                skills TEXT NOT NULL,
+                link TEXT,
+                fonte TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                primeira_vez REAL NOT NULL,
+                ultima_vez REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_vagas_empresa ON vagas (empresa);
+            CREATE INDEX IF NOT EXISTS idx_vagas_local ON vagas (local);
+            CREATE INDEX IF NOT EXISTS idx_vagas_fonte ON vagas (fonte);
+            CREATE INDEX IF NOT EXISTS idx_vagas_primeira_vez ON vagas (primeira_vez);
+
+            -- Consultas feitas pelos usuários: popularidade e último resultado salvo
+            CREATE TABLE IF NOT EXISTS consultas (
+                keyword TEXT NOT NULL,
+                localizacao TEXT NOT NULL,
+                buscas INTEGER NOT NULL DEFAULT 0,
+                ultima_busca REAL,
+                paginas INTEGER NOT NULL DEFAULT 1,
+                atualizada_em REAL,
+                paginas_atualizadas INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (keyword, localizacao)
+            );
+            CREATE TABLE IF NOT EXISTS consulta_vagas (
+                keyword TEXT NOT NULL,
+                localizacao TEXT NOT NULL,
+                posicao INTEGER NOT NULL,
+                chave TEXT NOT NULL,
+                PRIMARY KEY (keyword, localizacao, posicao)
+            );
+        ''')
+        self._conn.commit()
+
+    def upsert(self, vagas: List[Dict]) -> List[Dict]:
+        """
+        Insere ou atualiza vagas pela chave estável
+
+        Retorna apenas as vagas novas ou alteradas (com 'chave' e
+        'primeira_vez'), para que só elas sejam reprocessadas.
+        """
+        agora = time.time()
+        por_chave = {}
+        for vaga in vagas:
+            por_chave[chave_vaga(vaga)] = vaga
+
+        with self._lock:
+            existentes = {}
+            chaves = list(por_chave)
+            for i in range(0, len(chaves), 500):
+                bloco = chaves[i:i + 500]
+                marcadores = ','.join('?' * len(bloco))
+                existentes.update(
+                    (chave, (hash_, primeira_vez)) for chave, hash_, primeira_vez in self._conn.execute(
+                        f'SELECT chave, hash, primeira_vez FROM vagas WHERE chave IN ({marcadores})', bloco
+                    )
+                )
+
+            alteradas = []
+            linhas = []
+            for chave, vaga in por_chave.items():
+                hash_ = _hash_conteudo(vaga)
+                anterior = existentes.get(chave)
+                primeira_vez = anterior[1] if anterior else agora
+                linhas.append((
+                    chave, vaga['titulo'], vaga['empresa'], vaga['local'],
+                    json.dumps(vaga.get('skills', []), ensure_ascii=False),
+                    vaga.get('link'), vaga.get('fonte', ''), hash_, primeira_vez, agora
+                ))
+                if anterior is None or anterior[0] != hash_:
+                    alteradas.append({**vaga, 'chave': chave, 'primeira_vez': primeira_vez})
+
+            self._conn.executemany('''
+                INSERT INTO vagas (chave, titulo, empresa, local, skills, link, fonte, hash, primeira_vez, ultima_vez)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(chave) DO UPDATE SET
+                    titulo = excluded.titulo,
+                    empresa = excluded.empresa,
+                    local = excluded.local,
+                    skills = excluded.skills,
+                    link = excluded.link,
+                    hash = excluded.hash,
+                    ultima_vez = excluded.ultima_vez
+            ''', linhas)
+            self._conn.commit()
+
+        return alteradas
+
+    def _filtros_sql(self, empresa=None, local=None, fonte=None, desde=None, atualizadas_desde=None):
+        condicoes, parametros = [], []
+        if empresa:
+            condicoes.append('empresa = ?')
+            parametros.append(empresa)
+        if local:
+            condicoes.append('local = ?')
+            parametros.append(local)
+        if fonte:
+            condicoes.append('fonte = ?')
+            parametros.append(fonte)
+        if desde is not None:
+            condicoes.append('primeira_vez >= ?')
+            parametros.append(desde)
+        if atualizadas_desde is not None:
+            condicoes.append('ultima_vez >= ?')
+            parametros.append(atualizadas_desde)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ''
+        return where, parametros
+
+    def iterar(self, empresa: Optional[str] = None, local: Optional[str] = None, fonte: Optional[str] = None,
+               desde: Optional[float] = None, tamanho_bloco: int = 1000,
+               atualizadas_desde: Optional[float] = None) -> Iterator[List[Dict]]:
+        """
+        Lê as vagas armazenadas em blocos, em ordem de primeira aparição
+
+        `desde` filtra pela primeira aparição; `atualizadas_desde`, pela
+        última gravação (vagas novas, alteradas ou vistas de novo).
+        """
+        where, parametros = self._filtros_sql(empresa, local, fonte, desde, atualizadas_desde)
+        posicao = (float('-inf'), '')
+
+        # Paginação por chave (keyset) para não segurar a conexão entre blocos
+        while True:
+            condicao = f"{where} {'AND' if where else 'WHERE'} (primeira_vez, chave) > (?, ?)"
+            with self._lock:
+                linhas = self._conn.execute(
+                    f"SELECT {', '.join(COLUNAS)} FROM vagas {condicao} ORDER BY primeira_vez, chave LIMIT ?",
+                    parametros + [*posicao, tamanho_bloco]
+                ).fetchall()
+
+            if not linhas:
+                return
+
+            yield [self._linha_para_vaga(linha) for linha in linhas]
+            posicao = (linhas[-1][COLUNAS.index('primeira_vez')], linhas[-1][0])
+
+    def listar(self, **filtros) -> List[Dict]:
+        """Retorna as vagas armazenadas (filtros: empresa, local, fonte, desde)"""
+        vagas = []
+        for bloco in self.iterar(**filtros):
+            vagas.extend(bloco)
+        return vagas
+
+    def contar(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM vagas').fetchone()[0]
+
+    def registrar_busca(self, keyword: str, localizacao: str = '', paginas: int = 1):
+        """Conta uma busca do usuário (base da popularidade usada pelo agendador)"""
+        keyword, localizacao = normalizar_consulta(keyword, localizacao)
+        with self._lock:
+            self._conn.execute('''
+                INSERT INTO consultas (keyword, localizacao, buscas, ultima_busca, paginas)
+                VALUES (?, ?, 1, ?, ?)
+                ON CONFLICT(keyword, localizacao) DO UPDATE SET
+                    buscas = buscas + 1,
+                    ultima_busca = excluded.ultima_busca,
+                    paginas = MAX(paginas, excluded.paginas)
+            ''', (keyword, localizacao, time.time(), paginas))
+            self._conn.commit()
+
+    def salvar_resultado(self, keyword: str, localizacao: str, vagas: List[Dict], paginas: int = 1) -> List[Dict]:
+        """
+        Grava as vagas (upsert) e guarda-as como o resultado atual da consulta
+
+        Retorna as vagas novas ou alteradas, como `upsert`.
+        """
+        alteradas = self.upsert(vagas)
+        keyword, localizacao = normalizar_consulta(keyword, localizacao)
+        chaves = list(dict.fromkeys(chave_vaga(vaga) for vaga in vagas))
+
+        with self._lock:
+            self._conn.execute('DELETE FROM consulta_vagas WHERE keyword = ? AND localizacao = ?', (keyword, localizacao))
+            self._conn.executemany(
+                'INSERT INTO consulta_vagas (keyword, localizacao, posicao, chave) VALUES (?, ?, ?, ?)',
+                [(keyword, localizacao, posicao, chave) for posicao, chave in enumerate(chaves)]
+            )
+            self._conn.execute('''
+                INSERT INTO consultas (keyword, localizacao, atualizada_em, paginas, paginas_atualizadas)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(keyword, localizacao) DO UPDATE SET
+                    atualizada_em = excluded.atualizada_em,
+                    paginas_atualizadas = excluded.paginas_atualizadas
+            ''', (keyword, localizacao, time.time(), paginas, paginas))
+            self._conn.commit()
+
+        return alteradas
+
+    def resultado(self, keyword: str, localizacao: str = '', paginas: int = 1,
+                  max_idade: Optional[float] = None) -> Optional[List[Dict]]:
+        """
+        Último resultado salvo da consulta, ou None se não houver
+
+        Também retorna None se o resultado cobre menos páginas que o pedido
+        ou tem mais de `max_idade` segundos.
+        """
+        keyword, localizacao = normalizar_consulta(keyword, localizacao)
+        with self._lock:
+            consulta = self._conn.execute(
+                'SELECT atualizada_em, paginas_atualizadas FROM consultas WHERE keyword = ? AND localizacao = ?',
+                (keyword, localizacao)
+            ).fetchone()
+            if consulta is None or consulta[0] is None or consulta[1] < paginas:
+                return None
+            if max_idade is not None and time.time() - consulta[0] > max_idade:
+                return None
+
+            linhas = self._conn.execute(f'''
+                SELECT {', '.join(f'v.{coluna}' for coluna in COLUNAS)}
+                FROM consulta_vagas c JOIN vagas v ON v.chave = c.chave
+                WHERE c.keyword = ? AND c.localizacao = ?
+                ORDER BY c.posicao
+            ''', (keyword, localizacao)).fetchall()
+
+        return [self._linha_para_vaga(linha) for linha in linhas]
+
+    def idade_resultado(self, keyword: str, localizacao: str = '') -> Optional[float]:
+        """Segundos desde a última atualização da consulta (None se nunca foi atualizada)"""
+        keyword, localizacao = normalizar_consulta(keyword, localizacao)
+        with self._lock:
+            linha = self._conn.execute(
+                'SELECT atualizada_em FROM consultas WHERE keyword = ? AND localizacao = ?', (keyword, localizacao)
+            ).fetchone()
+        return time.time() - linha[0] if linha and linha[0] is not None else None
+
+    def consultas_populares(self, limite: int = 20, janela: Optional[float] = None) -> List[Dict]:
+        """
+        Consultas mais buscadas (keyword, localizacao, buscas, paginas, atualizada_em)
+
+        Com `janela`, só conta consultas buscadas nos últimos `janela` segundos.
+        """
+        condicao, parametros = 'WHERE buscas > 0', []
+        if janela is not None:
+            condicao += ' AND ultima_busca >= ?'
+            parametros.append(time.time() - janela)
+
+        with self._lock:
+            linhas = self._conn.execute(f'''
+                SELECT keyword, localizacao, buscas, paginas, atualizada_em FROM consultas
+                {condicao} ORDER BY buscas DESC, ultima_busca DESC LIMIT ?
+            ''', parametros + [limite]).fetchall()
+
+        return [dict(zip(('keyword', 'localizacao', 'buscas', 'paginas', 'atualizada_em'), linha)) for linha in linhas]
+
+    @staticmethod
+    def _linha_para_vaga(linha) -> Dict:
+        vaga = dict(zip(COLUNAS, linha))
+        vaga['skills'] = json.loads(vaga['skills'])
+        return vaga